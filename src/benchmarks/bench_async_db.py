@@ -0,0 +1,89 @@
+"""
+Event loop latency under concurrent duel writes.
+
+Runs the same burst of `DuelOps.create` calls twice against a temporary database:
+once directly on the event loop (the old behaviour) and once through
+`AsyncScorekeeperDB`, while a probe task measures how late the loop wakes up.
+
+Usage (from `src/`):
+    python -m benchmarks.bench_async_db [--writes 2000] [--concurrency 50]
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import tempfile
+import time
+
+from db.async_db import AsyncScorekeeperDB
+from db.sqldb import ScorekeeperDB
+
+PROBE_INTERVAL = 0.005
+
+async def probe_loop_lag(stop: asyncio.Event, samples: list[float]):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(PROBE_INTERVAL)
+        samples.append(time.perf_counter() - start - PROBE_INTERVAL)
+
+def summarize(samples: list[float], elapsed: float, writes: int) -> dict:
+    ordered = sorted(samples) or [0.0]
+    pick = lambda q: ordered[min(len(ordered) - 1, int(q * (len(ordered) - 1)))] * 1000
+    return {
+        "lag_ms_p50": round(pick(0.50), 3),
+        "lag_ms_p99": round(pick(0.99), 3),
+        "lag_ms_max": round(ordered[-1] * 1000, 3),
+        "writes_per_s": round(writes / elapsed, 1),
+    }
+
+async def run_blocking(db: ScorekeeperDB, gangs: list, writes: int, concurrency: int) -> dict:
+    async def writer(count: int):
+        for _ in range(count):
+            a, d = random.sample(gangs, 2)
+            db.duel.create(a, random.randint(0, 10), d, random.randint(0, 10))
+            await asyncio.sleep(0)
+    return await _measure(writer, writes, concurrency)
+
+async def run_async(db: AsyncScorekeeperDB, gangs: list, writes: int, concurrency: int) -> dict:
+    async def writer(count: int):
+        for _ in range(count):
+            a, d = random.sample(gangs, 2)
+            await db.duel.create(a, random.randint(0, 10), d, random.randint(0, 10))
+    result = await _measure(writer, writes, concurrency)
+    result["executor"] = db.stats()
+    return result
+
+async def _measure(writer, writes: int, concurrency: int) -> dict:
+    stop = asyncio.Event()
+    samples: list[float] = []
+    probe = asyncio.create_task(probe_loop_lag(stop, samples))
+    start = time.perf_counter()
+    per_writer = writes // concurrency
+    await asyncio.gather(*(writer(per_writer) for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await probe
+    return summarize(samples, elapsed, per_writer * concurrency)
+
+async def main(writes: int, concurrency: int):
+    random.seed(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        db = ScorekeeperDB(os.path.join(tmp, "bench.sqldb"))
+        db.initialize_db()
+        gangs = [db.gang.create(1, f"Gang_{i}") for i in range(20)]
+        blocking = await run_blocking(db, gangs, writes, concurrency)
+        db.disconnect()
+
+        async_db = AsyncScorekeeperDB(db)
+        await async_db.initialize_db()
+        threaded = await run_async(async_db, gangs, writes, concurrency)
+        await async_db.close_db()
+    print(json.dumps({"blocking": blocking, "executor": threaded}, indent=4))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--writes", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.writes, args.concurrency))
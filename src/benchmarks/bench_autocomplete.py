@@ -0,0 +1,60 @@
+"""
+Gang-name autocomplete lookups against the in-memory prefix index.
+
+Fills a `GangRegistry` with N synthetic gangs and times `complete()` for random 1-3
+character prefixes, plus incremental adds and removes.
+
+Usage (from `src/`):
+    python -m benchmarks.bench_autocomplete [--names 10000] [--lookups 100000]
+"""
+import argparse
+import json
+import random
+import string
+import time
+
+from db.registry import GangRegistry
+from db.sqldb import Gang
+
+def percentile_us(samples: list[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    return round(ordered[min(len(ordered) - 1, int(fraction * (len(ordered) - 1)))] * 1e6, 2)
+
+def main(names: int, lookups: int):
+    rng = random.Random(0)
+    gangs = [Gang(id=i, name="".join(rng.choices(string.ascii_letters, k=rng.randint(4, 12))) + f"_{i}") for i in range(names)]
+    registry = GangRegistry()
+    start = time.perf_counter()
+    registry.load(gangs)
+    load_s = time.perf_counter() - start
+
+    samples = []
+    for _ in range(lookups):
+        prefix = "".join(rng.choices(string.ascii_lowercase, k=rng.randint(1, 3)))
+        start = time.perf_counter()
+        registry.complete(0, prefix, 25)
+        samples.append(time.perf_counter() - start)
+
+    extra = [Gang(id=names + i, name=f"New_{i}") for i in range(1000)]
+    start = time.perf_counter()
+    for gang in extra:
+        registry.put(gang)
+    for gang in extra:
+        registry.remove(gang)
+    mutate_s = time.perf_counter() - start
+
+    print(json.dumps({
+        "names": names,
+        "load_ms": round(load_s * 1000, 2),
+        "lookup_us_p50": percentile_us(samples, 0.50),
+        "lookup_us_p99": percentile_us(samples, 0.99),
+        "lookup_us_max": round(max(samples) * 1e6, 2),
+        "put_remove_us_avg": round(mutate_s / (2 * len(extra)) * 1e6, 2),
+    }, indent=4))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--names", type=int, default=10000)
+    parser.add_argument("--lookups", type=int, default=100000)
+    args = parser.parse_args()
+    main(args.names, args.lookups)
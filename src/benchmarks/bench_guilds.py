@@ -0,0 +1,77 @@
+"""
+Per-guild lookups as the number of guilds grows.
+
+Builds one database per guild count, every guild holding the same number of gangs and
+duels, so the tables grow with the guild count while each guild's share stays fixed.
+Times the guild-scoped hot paths against random guilds; with the (guild_id, ...)
+indexes and the partitioned registry their latency should stay flat. Also prints
+SQLite's query plan for `StandingOps.top` to show it never scans other guilds.
+
+Usage (from `src/`):
+    python -m benchmarks.bench_guilds [--guilds 1 10 100 1000] [--gangs 20] [--duels 200] [--iterations 500]
+"""
+import argparse
+import json
+import logging
+import os
+import random
+import tempfile
+
+from benchmarks.run import measure
+from db.sqldb import ScorekeeperDB, sqldb
+from devtools.database import generate_fake_data
+
+SEED = 1234
+
+class LastQuery(logging.Handler):
+    """Keeps the last statement peewee logs, so its plan can be explained."""
+    def emit(self, record: logging.LogRecord):
+        self.statement = record.msg
+
+def query_plan(run) -> list[str]:
+    """Run `run` and return SQLite's query plan for the last statement it executed."""
+    logger = logging.getLogger("peewee")
+    handler, level = LastQuery(), logger.level
+    logger.addHandler(handler)
+    logger.setLevel(logging.DEBUG)
+    try:
+        run()
+    finally:
+        logger.removeHandler(handler)
+        logger.setLevel(level)
+    sql, params = handler.statement
+    return [row[-1] for row in sqldb.execute_sql(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()]
+
+def bench_guilds(guilds: int, gangs: int, duels: int, iterations: int) -> dict:
+    rng = random.Random(SEED)
+    with tempfile.TemporaryDirectory() as tmp:
+        db = ScorekeeperDB(os.path.join(tmp, f"guilds_{guilds}.sqldb"))
+        db.initialize_db()
+        guild_ids = list(range(1, guilds + 1))
+        for guild_id in guild_ids:
+            generate_fake_data(db, guild_id, gangs, duels, SEED + guild_id)
+        names = [f"Gang_{i}" for i in range(1, gangs + 1)]
+        by_guild = {guild_id: db.gang.get_all(guild_id) for guild_id in guild_ids}
+        results = {
+            "get_by_name": measure(lambda: db.gang.get_by_name(rng.choice(guild_ids), rng.choice(names)), iterations),
+            "complete": measure(lambda: db.gang.registry.complete(rng.choice(guild_ids), "gang_1", 25), iterations),
+            "get_recent": measure(lambda: db.duel.get_recent(rng.choice(guild_ids)), iterations),
+            "standing_top": measure(lambda: db.standing.top(rng.choice(guild_ids), 10), iterations),
+            "history": measure(lambda: db.duel.history(rng.choice(by_guild[rng.choice(guild_ids)]), limit=10), iterations),
+        }
+        plan = query_plan(lambda: db.standing.top(guild_ids[0], 10))
+        db.disconnect()
+    return {"guilds": guilds, "gangs": guilds * gangs, "duels": guilds * duels, "ops": results, "standing_top_plan": plan}
+
+def main(guild_counts: list[int], gangs: int, duels: int, iterations: int):
+    report = [bench_guilds(guilds, gangs, duels, iterations) for guilds in guild_counts]
+    print(json.dumps(report, indent=4))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--guilds", type=int, nargs="+", default=[1, 10, 100, 1000])
+    parser.add_argument("--gangs", type=int, default=20, help="Gangs per guild")
+    parser.add_argument("--duels", type=int, default=200, help="Duels per guild")
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args()
+    main(args.guilds, args.gangs, args.duels, args.iterations)
@@ -0,0 +1,71 @@
+"""
+Live score increments: one `update_scores` per change vs. the write-behind accumulator.
+
+Applies the same stream of +1s, spread over a few wars, once through
+`DuelOps.update_scores` (read, re-apply aggregates, replay ratings, commit per change)
+and once through `LiveScores.add` (one duel read per change) with a single flush at the end, then checks that
+both databases end up with the same scores.
+
+Usage (from `src/`):
+    python -m benchmarks.bench_live_scores [--increments 2000] [--wars 5] [--history 1000]
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import tempfile
+import time
+
+from db.async_db import AsyncScorekeeperDB
+from db.live_scores import LiveScores
+from db.sqldb import ScorekeeperDB
+from devtools.database import generate_fake_data
+
+GUILD_ID = 1
+
+async def run(path: str, journal: str, increments: int, wars: int, history: int, write_behind: bool) -> tuple[float, list[tuple[int, int]]]:
+    db = AsyncScorekeeperDB(ScorekeeperDB(path))
+    await db.initialize_db()
+    # Earlier results make every rating replay realistic.
+    await db.run(generate_fake_data, db.sync, GUILD_ID, 20, history, 0)
+    gangs = await db.gang.get_all(GUILD_ID)
+    duels = [await db.duel.create(gangs[2 * i], 0, gangs[2 * i + 1], 0) for i in range(wars)]
+    live = LiveScores(db, journal, interval=3600)
+    await live.start()
+    rng = random.Random(0)
+    start = time.perf_counter()
+    for _ in range(increments):
+        duel = rng.choice(duels)
+        attacker = rng.random() < 0.5
+        if write_behind:
+            await live.add(GUILD_ID, duel.id, int(attacker), int(not attacker))
+        else:
+            await db.duel.update_scores(duel, duel.attacking_score + attacker, duel.defending_score + (not attacker))
+    await live.flush()
+    elapsed = time.perf_counter() - start
+    await live.stop()
+    scores = [(duel.attacking_score, duel.defending_score) for duel in [await db.duel.get_by_id(GUILD_ID, duel.id) for duel in duels]]
+    await db.close_db()
+    return elapsed, scores
+
+async def main(increments: int, wars: int, history: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        direct_s, direct = await run(os.path.join(tmp, "direct.sqldb"), os.path.join(tmp, "direct.journal"), increments, wars, history, False)
+        behind_s, behind = await run(os.path.join(tmp, "behind.sqldb"), os.path.join(tmp, "behind.journal"), increments, wars, history, True)
+    print(json.dumps({
+        "increments": increments,
+        "wars": wars,
+        "update_scores_per_s": round(increments / direct_s, 1),
+        "write_behind_per_s": round(increments / behind_s, 1),
+        "speedup": round(direct_s / behind_s, 1),
+        "same_result": direct == behind,
+    }, indent=4))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--increments", type=int, default=2000)
+    parser.add_argument("--wars", type=int, default=5)
+    parser.add_argument("--history", type=int, default=1000, help="Earlier duels to replay ratings over")
+    args = parser.parse_args()
+    asyncio.run(main(args.increments, args.wars, args.history))
@@ -0,0 +1,103 @@
+"""
+Per-command logging overhead on the calling thread (the event loop, in the bot).
+
+Each simulated command logs what a typical command does: one INFO line and a few DEBUG
+lines with arguments. Every setup writes to /dev/null, so the time is formatting and
+handler cost rather than terminal speed.
+
+- `direct_rich`: the old setup, `RichHandler` on the root logger, rendering inline.
+- `queued_rich`/`queued_json`: `logs.setup_logging`, where the caller only enqueues and
+  the listener thread renders. `drain_s` is how long the listener needed afterwards to
+  catch up with what was queued.
+- `filtered_eager`/`filtered_lazy`: DEBUG lines below the INFO level, built as f-strings
+  vs. passed as %-arguments, i.e. what a suppressed debug line still costs.
+
+Usage (from `src/`):
+    python -m benchmarks.bench_logging [--commands 2000] [--debug-lines 4]
+"""
+import argparse
+import json
+import logging
+import os
+import time
+
+from rich.console import Console
+from rich.logging import RichHandler
+
+import logs
+
+class Payload:
+    """Stands in for the models and interactions that end up in log arguments."""
+    def __init__(self, i: int):
+        self.id = i
+        self.name = f"gang-{i}"
+
+    def __repr__(self) -> str:
+        return f"<Gang id={self.id} name={self.name!r}>"
+
+def reset_root():
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+        handler.close()
+
+def run_commands(logger: logging.Logger, commands: int, debug_lines: int, eager: bool) -> float:
+    payloads = [Payload(i) for i in range(64)]
+    start = time.perf_counter()
+    for i in range(commands):
+        payload = payloads[i % 64]
+        logger.info("Command wars create by %s in %s", payload.name, payload.id)
+        for line in range(debug_lines):
+            if eager:
+                logger.debug(f"Step {line} for {payload!r}: {payloads[:4]}")
+            else:
+                logger.debug("Step %s for %r: %s", line, payload, payloads[:4])
+    return time.perf_counter() - start
+
+def bench_direct(devnull, commands: int, debug_lines: int) -> dict:
+    reset_root()
+    logger = logging.getLogger()
+    logger.addHandler(RichHandler(console=Console(file=devnull, width=120)))
+    logger.setLevel(logging.DEBUG)
+    elapsed = run_commands(logger, commands, debug_lines, eager=True)
+    reset_root()
+    return {"per_command_us": round(elapsed / commands * 1e6, 2), "drain_s": 0.0}
+
+def bench_queued(devnull, fmt: str, commands: int, debug_lines: int) -> dict:
+    reset_root()
+    handler = RichHandler(console=Console(file=devnull, width=120)) if fmt == "rich" else logs.build_handler("json", devnull)
+    listener = logs.setup_logging("DEBUG", fmt, "INFO", handler=handler)
+    elapsed = run_commands(logging.getLogger(), commands, debug_lines, eager=False)
+    start = time.perf_counter()
+    listener.stop()
+    drain = time.perf_counter() - start
+    reset_root()
+    return {"per_command_us": round(elapsed / commands * 1e6, 2), "drain_s": round(drain, 3)}
+
+def bench_filtered(devnull, commands: int, debug_lines: int, eager: bool) -> dict:
+    reset_root()
+    listener = logs.setup_logging("INFO", "json", "INFO", handler=logs.build_handler("json", devnull))
+    elapsed = run_commands(logging.getLogger(), commands, debug_lines, eager=eager)
+    listener.stop()
+    reset_root()
+    return {"per_command_us": round(elapsed / commands * 1e6, 2)}
+
+def main(commands: int, debug_lines: int):
+    with open(os.devnull, "w") as devnull:
+        report = {
+            "commands": commands,
+            "debug_lines": debug_lines,
+            "direct_rich": bench_direct(devnull, commands, debug_lines),
+            "queued_rich": bench_queued(devnull, "rich", commands, debug_lines),
+            "queued_json": bench_queued(devnull, "json", commands, debug_lines),
+            "filtered_eager": bench_filtered(devnull, commands, debug_lines, eager=True),
+            "filtered_lazy": bench_filtered(devnull, commands, debug_lines, eager=False),
+        }
+    print(json.dumps(report, indent=4))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--commands", type=int, default=2000)
+    parser.add_argument("--debug-lines", type=int, default=4)
+    args = parser.parse_args()
+    main(args.commands, args.debug_lines)
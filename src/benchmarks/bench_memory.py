@@ -0,0 +1,88 @@
+"""
+Peak memory of reading every duel: a materialized list of models vs. streaming.
+
+For each duel count, builds a database and then, in a fresh process per measurement,
+reads every duel once either as `list(Duel.select())` (what `DuelOps.get_all` used to
+do) or through `DuelOps.iter_all`. The peak RSS growth over the process's baseline
+grows with the duel count for the list. For the stream it is bounded by one chunk plus
+SQLite's page cache and mmap window (`cache_size`/`mmap_size` in the storage profile),
+which only fill up on large files.
+
+Linux/macOS only (uses `resource`).
+
+Usage (from `src/`):
+    python -m benchmarks.bench_memory [--duels 10000 100000 1000000] [--chunk 5000]
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from db.sqldb import Duel, ScorekeeperDB
+from devtools.database import generate_fake_data
+
+GUILD_ID = 1
+SEED = 1234
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS.
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def measure(path: str, mode: str, chunk: int):
+    """Runs in the child process: read every duel once and report the peak RSS growth."""
+    db = ScorekeeperDB(path)
+    db.connect()
+    Duel.select().limit(1).execute()  # Open the connection and load the schema before the baseline.
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    if mode == "list":
+        rows = list(Duel.select().where(Duel.guild_id == GUILD_ID))  # type: ignore
+        total = sum(duel.attacking_score for duel in rows)  # type: ignore
+    else:
+        total = sum(row.attacking_score for row in db.duel.iter_all(GUILD_ID, chunk_size=chunk))
+    elapsed = time.perf_counter() - start
+    db.disconnect()
+    print(json.dumps({"peak_growth_mb": round(peak_rss_mb() - baseline, 1), "seconds": round(elapsed, 3), "checksum": total}))
+
+def run_child(path: str, mode: str, chunk: int) -> dict:
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_memory", "--measure", path, mode, "--chunk", str(chunk)],
+        capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(output)
+
+def main(counts: list[int], chunk: int):
+    report = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for count in counts:
+            path = os.path.join(tmp, f"duels_{count}.sqldb")
+            db = ScorekeeperDB(path)
+            db.initialize_db()
+            generate_fake_data(db, GUILD_ID, 200, count, SEED)
+            db.disconnect()
+            listed, streamed = run_child(path, "list", chunk), run_child(path, "stream", chunk)
+            report.append({
+                "duels": count,
+                "list_peak_mb": listed["peak_growth_mb"],
+                "list_s": listed["seconds"],
+                "stream_peak_mb": streamed["peak_growth_mb"],
+                "stream_s": streamed["seconds"],
+                "same_result": listed["checksum"] == streamed["checksum"],
+            })
+    print(json.dumps({"chunk": chunk, "results": report}, indent=4))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--duels", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--chunk", type=int, default=5000)
+    parser.add_argument("--measure", nargs=2, metavar=("PATH", "MODE"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.measure:
+        measure(args.measure[0], args.measure[1], args.chunk)
+    else:
+        main(args.duels, args.chunk)
@@ -0,0 +1,72 @@
+"""
+Overhead of the command and query metrics.
+
+Times the raw `Histogram.observe()` cost, then the same mix of point reads and duel
+writes with metrics recording on and off. The difference is what instrumentation costs
+per query in production.
+
+Usage (from `src/`):
+    python -m benchmarks.bench_metrics [--queries 20000] [--observations 1000000]
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+
+import metrics
+from db.sqldb import ScorekeeperDB
+
+def time_observe(observations: int) -> float:
+    histogram = metrics.Histogram()
+    rng = random.Random(0)
+    samples = [rng.random() * 0.05 for _ in range(1000)]
+    start = time.perf_counter()
+    for i in range(observations):
+        histogram.observe(samples[i % 1000])
+    return (time.perf_counter() - start) / observations
+
+def time_queries(db: ScorekeeperDB, gangs: list, queries: int, enabled: bool) -> float:
+    metrics.registry.enabled = enabled
+    rng = random.Random(0)
+    start = time.perf_counter()
+    for i in range(queries):
+        if i % 10 == 0:
+            attacker, defender = rng.sample(gangs, 2)
+            db.duel.create(attacker, rng.randint(0, 10), defender, rng.randint(0, 10))
+        else:
+            db.standing.get(rng.choice(gangs))
+    return (time.perf_counter() - start) / queries
+
+def main(queries: int, observations: int):
+    observe_s = time_observe(observations)
+    with tempfile.TemporaryDirectory() as tmp:
+        db = ScorekeeperDB(os.path.join(tmp, "metrics.sqldb"))
+        db.initialize_db()
+        db.gang.insert_many(1, [f"Gang_{i}" for i in range(50)])
+        gangs = db.gang.get_all(1)
+        time_queries(db, gangs, queries // 10, True)  # Warm the page cache and statement paths.
+        # Alternate runs so drift in the environment hits both sides equally.
+        off, on = [], []
+        for _ in range(5):
+            off.append(time_queries(db, gangs, queries, False))
+            on.append(time_queries(db, gangs, queries, True))
+        db.disconnect()
+    metrics.registry.enabled = True
+    off_s, on_s = min(off), min(on)
+    print(json.dumps({
+        "observe_ns": round(observe_s * 1e9, 1),
+        "query_us_metrics_off": round(off_s * 1e6, 2),
+        "query_us_metrics_on": round(on_s * 1e6, 2),
+        "overhead_us_per_op": round((on_s - off_s) * 1e6, 2),
+        "overhead_pct": round((on_s - off_s) / off_s * 100, 2),
+        "query_series": metrics.registry.summary(metrics.QUERY_SECONDS),
+    }, indent=4))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--queries", type=int, default=20000)
+    parser.add_argument("--observations", type=int, default=1000000)
+    args = parser.parse_args()
+    main(args.queries, args.observations)
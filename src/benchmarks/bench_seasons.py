@@ -0,0 +1,80 @@
+"""
+Hot-path cost with a server's whole history in the live database vs. after a season rollover.
+
+Builds one guild with `--duels` of history plus `--season` duels of a season in progress
+and times the duel reads and full-table work (`RatingOps.replay`, which every war edit or
+delete runs, and `StandingOps.check`). Then closes the season, which archives every duel,
+records the same number of new-season duels and times the same operations again, along
+with a history page read from the attached archive. Also reports the close itself and the
+database file size before and after compaction.
+
+Usage (from `src/`):
+    python -m benchmarks.bench_seasons [--duels 200000] [--season 2000] [--gangs 200] [--iterations 200] [--replays 5]
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+
+from benchmarks.run import measure
+from db.sqldb import ScorekeeperDB
+from devtools.database import generate_fake_data
+
+GUILD_ID = 1
+SEED = 1234
+
+def run_ops(db: ScorekeeperDB, iterations: int, replays: int) -> dict:
+    rng = random.Random(SEED)
+    gangs = db.gang.get_all(GUILD_ID)
+    return {
+        "get_recent": measure(lambda: db.duel.get_recent(GUILD_ID), iterations),
+        "history": measure(lambda: db.duel.history(rng.choice(gangs), limit=10), iterations),
+        "rating_replay": measure(db.rating.replay, replays),
+        "standing_check": measure(db.standing.check, replays),
+    }
+
+def file_mb(db: ScorekeeperDB, path: str) -> float:
+    db.checkpoint()
+    return round(os.path.getsize(path) / 1e6, 2)
+
+def main(duels: int, season_duels: int, gangs: int, iterations: int, replays: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "seasons.sqldb")
+        db = ScorekeeperDB(path)
+        db.initialize_db()
+        generate_fake_data(db, GUILD_ID, gangs, duels, SEED)
+        generate_fake_data(db, GUILD_ID, gangs, season_duels, SEED + 1)
+        before = run_ops(db, iterations, replays)
+        size_before = file_mb(db, path)
+        start = time.perf_counter()
+        season = db.season.close(GUILD_ID, os.path.join(tmp, "archives"))
+        close_s = time.perf_counter() - start
+        generate_fake_data(db, GUILD_ID, gangs, season_duels, SEED + 2)
+        after = run_ops(db, iterations, replays)
+        rng = random.Random(SEED)
+        gang_list = db.gang.get_all(GUILD_ID)
+        after["archived_history"] = measure(lambda: db.season.history(season, rng.choice(gang_list), limit=10), iterations)
+        report = {
+            "duels": duels + season_duels,
+            "season_duels": season_duels,
+            "close_s": round(close_s, 3),
+            "file_mb_before": size_before,
+            "file_mb_after": file_mb(db, path),
+            "archive_mb": round(os.path.getsize(season.archive) / 1e6, 2),  # type: ignore
+            "before": before,
+            "after": after,
+        }
+        db.disconnect()
+    print(json.dumps(report, indent=4))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--duels", type=int, default=200000, help="Duels of earlier history")
+    parser.add_argument("--season", type=int, default=2000, help="Duels in the season in progress")
+    parser.add_argument("--gangs", type=int, default=200)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--replays", type=int, default=5, help="Iterations of the full-table operations")
+    args = parser.parse_args()
+    main(args.duels, args.season, args.gangs, args.iterations, args.replays)
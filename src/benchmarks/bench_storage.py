@@ -0,0 +1,48 @@
+"""
+Write throughput of `DuelOps.create` before and after the storage profile.
+
+"before" is SQLite's default journal settings with a connection opened implicitly per
+query, as the bot ran originally. "after" is the configured WAL profile on one
+long-lived connection.
+
+Usage (from `src/`):
+    python -m benchmarks.bench_storage [--writes 2000]
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+
+from db.sqldb import DEFAULT_PRAGMAS, ScorekeeperDB, sqldb
+
+def run(path: str, pragmas: dict, writes: int, long_lived: bool) -> dict:
+    random.seed(0)
+    db = ScorekeeperDB(path, pragmas)
+    db.initialize_db()
+    gangs = [db.gang.create(1, f"Gang_{i}") for i in range(20)]
+    if not long_lived:
+        db.disconnect()
+    start = time.perf_counter()
+    for _ in range(writes):
+        a, d = random.sample(gangs, 2)
+        db.duel.create(a, random.randint(0, 10), d, random.randint(0, 10))
+        if not long_lived:
+            db.disconnect()
+    elapsed = time.perf_counter() - start
+    db.disconnect()
+    return {"writes": writes, "seconds": round(elapsed, 3), "writes_per_s": round(writes / elapsed, 1)}
+
+def main(writes: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        before = run(os.path.join(tmp, "before.sqldb"), {}, writes, long_lived=False)
+        after = run(os.path.join(tmp, "after.sqldb"), DEFAULT_PRAGMAS, writes, long_lived=True)
+    after["speedup"] = round(after["writes_per_s"] / before["writes_per_s"], 2)
+    print(json.dumps({"before": before, "after": after, "profile": DEFAULT_PRAGMAS}, indent=4))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--writes", type=int, default=2000)
+    args = parser.parse_args()
+    main(args.writes)
@@ -0,0 +1,140 @@
+"""
+Offline stand-ins for Discord, for driving the real cogs without a connection.
+
+`InteractionFactory` builds INTERACTION_CREATE payloads, which are fed to the client's
+connection state exactly as the gateway would deliver them, so option parsing, the
+command tree, cog callbacks and completion events all run unchanged. `StubAdapter`
+replaces discord.py's webhook adapter (the HTTP layer behind `interaction.response` and
+`interaction.followup`): it answers locally after a simulated round trip and tells the
+caller when each interaction got its final response.
+"""
+import asyncio
+import itertools
+import json
+
+from collections import Counter
+from typing import Any
+
+import discord
+
+from discord.webhook.async_ import AsyncWebhookAdapter, async_context
+
+APPLICATION_ID = 100000000000000001
+# Snowflake-sized IDs, so nothing collides with the small guild and gang IDs in tests.
+ID_BASE = 200000000000000000
+# Interaction callback types that only acknowledge; the real answer follows later.
+DEFERRED_RESPONSES = {5, 6}
+
+class StubAdapter(AsyncWebhookAdapter):
+    """
+    Webhook adapter that never touches the network.
+
+    Every interaction callback and follow-up request sleeps `round_trip` seconds and then
+    succeeds. The first response for an interaction that is not a deferral completes the
+    future returned by `expect`.
+
+    Attributes:
+        requests (Counter): Requests served, by route.
+    """
+    def __init__(self, round_trip: float = 0.0):
+        super().__init__()
+        self.round_trip = round_trip
+        self.requests: Counter = Counter()
+        self._waiting: dict[str, asyncio.Future] = {}
+
+    def install(self):
+        """Use this adapter for every interaction response made from the current context on."""
+        async_context.set(self)
+
+    def expect(self, token: str) -> asyncio.Future:
+        """A future resolved with the response type once the interaction with `token` is answered."""
+        future = asyncio.get_running_loop().create_future()
+        self._waiting[token] = future
+        return future
+
+    def _answered(self, token: str | None, kind: int):
+        future = self._waiting.pop(token, None) if token is not None else None
+        if future is not None and not future.done():
+            future.set_result(kind)
+
+    async def request(self, route, session, *, payload: dict | None = None, multipart: list | None = None, **kwargs) -> Any:
+        self.requests[f"{route.method} {route.path}"] += 1
+        if self.round_trip:
+            await asyncio.sleep(self.round_trip)
+        if route.path.endswith("/callback"):
+            if payload is None and multipart:
+                payload = json.loads(next(part["value"] for part in multipart if part["name"] == "payload_json"))
+            kind = (payload or {}).get("type", 4)
+            if kind not in DEFERRED_RESPONSES:
+                self._answered(route.webhook_token, kind)
+            return {"interaction": {"id": str(route.webhook_id), "type": 2}}
+        # Follow-up messages and edits.
+        self._answered(route.webhook_token, 0)
+        return None
+
+def log_in(client: discord.Client, application_id: int = APPLICATION_ID):
+    """Give the client the bot user and application ID that the gateway's READY event would."""
+    state = client._connection
+    state.user = discord.ClientUser(state=state, data={"id": application_id, "username": "scorekeeper", "discriminator": "0", "avatar": None, "bot": True})
+    state.application_id = application_id
+
+def _option(name: str, value) -> dict:
+    if isinstance(value, bool):
+        kind = 5
+    elif isinstance(value, int):
+        kind = 4
+    elif isinstance(value, float):
+        kind = 10
+    else:
+        kind = 3
+    return {"name": name, "type": kind, "value": value}
+
+class InteractionFactory:
+    """Builds gateway payloads for slash command and autocomplete interactions in a guild."""
+    def __init__(self, application_id: int = APPLICATION_ID):
+        self.application_id = application_id
+        self._ids = itertools.count(1)
+
+    def _payload(self, kind: int, guild_id: int, user_id: int, group: str, subcommand: str, options: list[dict]) -> dict:
+        n = next(self._ids)
+        return {
+            "id": str(ID_BASE + n),
+            "application_id": str(self.application_id),
+            "type": kind,
+            "token": f"interaction-{n}",
+            "version": 1,
+            "guild_id": str(guild_id),
+            "locale": "en-US",
+            "guild_locale": "en-US",
+            "app_permissions": "0",
+            "entitlements": [],
+            "authorizing_integration_owners": {},
+            "context": 0,
+            "member": {
+                "user": {"id": str(user_id), "username": f"user{user_id}", "discriminator": "0", "avatar": None, "global_name": None},
+                "roles": [],
+                "joined_at": "2024-01-01T00:00:00+00:00",
+                "deaf": False,
+                "mute": False,
+                "flags": 0,
+                "permissions": "0",
+            },
+            "data": {
+                "id": str(ID_BASE),
+                "name": group,
+                "type": 1,
+                "options": [{"name": subcommand, "type": 1, "options": options}],
+            },
+        }
+
+    def command(self, guild_id: int, user_id: int, group: str, subcommand: str, **options) -> dict:
+        """A `/group subcommand` invocation with the given option values."""
+        return self._payload(2, guild_id, user_id, group, subcommand, [_option(name, value) for name, value in options.items()])
+
+    def autocomplete(self, guild_id: int, user_id: int, group: str, subcommand: str, focused: str, **options) -> dict:
+        """An autocomplete request for the option `focused`, whose value is what the user typed so far."""
+        entries = [_option(name, value) for name, value in options.items()]
+        for entry in entries:
+            if entry["name"] == focused:
+                entry["focused"] = True
+        return self._payload(4, guild_id, user_id, group, subcommand, entries)
@@ -0,0 +1,231 @@
+"""
+End-to-end load test of the bot's slash commands, fully offline.
+
+Builds a real `bot.client` with the gangs and wars cogs on a temporary database, then
+keeps `--concurrency` simulated users busy until `--commands` interactions were served.
+Each interaction is a gateway payload from `benchmarks.fake_discord`, dispatched through
+the client's connection state and command tree; responses go to the stub webhook adapter,
+which waits `--rtt` milliseconds per request like a round trip to Discord would. Nothing
+else is mocked, so the numbers cover option parsing, the cogs, the database executor,
+live scores and metrics.
+
+The mix (see `MIX`) is mostly `/wars create` and lookups, plus a few `/gangs create` and
+name autocompletes. Reported per command and overall:
+
+- latency from dispatch to the final response (p50/p90/p99/max, ms) and timeouts,
+- throughput, event loop lag while under load, the database executor's stats,
+- the server side command histogram and the Discord requests that were made.
+
+Usage (from `src/`):
+    python -m benchmarks.load_test [--commands 5000] [--concurrency 200] [--guilds 10] [--gangs 30] [--history 2000] [--rtt 0] [--config config.json]
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import tempfile
+import time
+
+from collections import defaultdict
+from collections.abc import Callable
+
+from rich.console import Console
+from rich.logging import RichHandler
+
+import bot
+import logs
+import metrics
+from benchmarks.bench_async_db import probe_loop_lag, summarize
+from benchmarks.fake_discord import InteractionFactory, StubAdapter, log_in
+from devtools.database import generate_fake_data
+
+SEED = 1234
+GUILD_BASE = 300000000000000000
+USERS_PER_GUILD = 50
+TIMEOUT = 30.0
+
+class Workload:
+    """Picks the next interaction for a simulated user; one method per entry in `MIX`."""
+    def __init__(self, factory: InteractionFactory, guilds: list[int], gangs: int, rng: random.Random):
+        self.factory = factory
+        self.guilds = guilds
+        self.names = {guild_id: [f"Gang_{i}" for i in range(1, gangs + 1)] for guild_id in guilds}
+        self.rng = rng
+        self._created = 0
+
+    def _pick(self) -> tuple[int, int, list[str]]:
+        guild_id = self.rng.choice(self.guilds)
+        return guild_id, guild_id + self.rng.randrange(1, USERS_PER_GUILD + 1), self.names[guild_id]
+
+    def gangs_create(self) -> dict:
+        guild_id, user_id, names = self._pick()
+        self._created += 1
+        name = f"New_{self._created}"
+        names.append(name)
+        return self.factory.command(guild_id, user_id, "gangs", "create", name=name)
+
+    def wars_create(self) -> dict:
+        guild_id, user_id, names = self._pick()
+        attacker, defender = self.rng.sample(names, 2)
+        return self.factory.command(guild_id, user_id, "wars", "create",
+            attacking_gang=attacker, attacking_score=self.rng.randint(0, 10),
+            defending_gang=defender, defending_score=self.rng.randint(0, 10))
+
+    def wars_history(self) -> dict:
+        guild_id, user_id, names = self._pick()
+        return self.factory.command(guild_id, user_id, "wars", "history", gang=self.rng.choice(names))
+
+    def wars_rivalry(self) -> dict:
+        guild_id, user_id, names = self._pick()
+        gang_a, gang_b = self.rng.sample(names, 2)
+        return self.factory.command(guild_id, user_id, "wars", "rivalry", gang_a=gang_a, gang_b=gang_b)
+
+    def gangs_leaderboard(self) -> dict:
+        guild_id, user_id, _ = self._pick()
+        return self.factory.command(guild_id, user_id, "gangs", "leaderboard", top=10)
+
+    def gangs_rating(self) -> dict:
+        guild_id, user_id, names = self._pick()
+        return self.factory.command(guild_id, user_id, "gangs", "rating", gang=self.rng.choice(names))
+
+    def autocomplete(self) -> dict:
+        guild_id, user_id, names = self._pick()
+        typed = self.rng.choice(names)[:self.rng.randint(1, 6)]
+        return self.factory.autocomplete(guild_id, user_id, "wars", "create", "attacking_gang", attacking_gang=typed)
+
+MIX: dict[str, int] = {
+    "gangs_create": 2,
+    "wars_create": 40,
+    "wars_history": 15,
+    "wars_rivalry": 10,
+    "gangs_leaderboard": 10,
+    "gangs_rating": 13,
+    "autocomplete": 10,
+}
+
+def percentiles(samples: list[float]) -> dict:
+    ordered = sorted(samples) or [0.0]
+    pick = lambda q: ordered[min(len(ordered) - 1, int(q * (len(ordered) - 1)))] * 1000
+    return {
+        "count": len(samples),
+        "p50_ms": round(pick(0.50), 3),
+        "p90_ms": round(pick(0.90), 3),
+        "p99_ms": round(pick(0.99), 3),
+        "max_ms": round(ordered[-1] * 1000, 3),
+    }
+
+def build_config(tmp: str, config_file: str | None) -> bot.Config:
+    """The bot's configuration with every file it writes moved into `tmp` and the background posters off."""
+    config = bot.Config()
+    if config_file:
+        config.load_from_file(config_file)
+    else:
+        config.import_from_dict({})
+    config.default_cogs = ["commands.gangs", "commands.wars"]
+    config.debug.enabled = False
+    config.war.updates = False
+    config.scoreboard.channel_ids = []
+    config.metrics.enabled = True
+    config.metrics.http_port = 0
+    config.storage.path = os.path.join(tmp, "load.sqldb")
+    config.storage.backup_dir = os.path.join(tmp, "backups")
+    config.storage.archive_dir = os.path.join(tmp, "archives")
+    config.war.score_journal = os.path.join(tmp, "load.scores.journal")
+    config.sync.state_file = os.path.join(tmp, "sync.json")
+    return config
+
+async def offline(route, *args, **kwargs):
+    raise RuntimeError(f"The load test is offline, but a command called {route.method} {route.path}")
+
+async def drive(client: bot.client, adapter: StubAdapter, workload: Workload, commands: int, concurrency: int) -> tuple[dict[str, list[float]], dict[str, int], float]:
+    rng = workload.rng
+    kinds = list(MIX)
+    weights = [MIX[kind] for kind in kinds]
+    latencies: dict[str, list[float]] = defaultdict(list)
+    timeouts: dict[str, int] = defaultdict(int)
+    remaining = commands
+
+    async def user():
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            kind = rng.choices(kinds, weights)[0]
+            make: Callable[[], dict] = getattr(workload, kind)
+            payload = make()
+            answered = adapter.expect(payload["token"])
+            start = time.perf_counter()
+            client._connection.parse_interaction_create(payload)
+            try:
+                await asyncio.wait_for(answered, TIMEOUT)
+            except asyncio.TimeoutError:
+                timeouts[kind] += 1
+                continue
+            latencies[kind].append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(user() for _ in range(concurrency)))
+    return latencies, timeouts, time.perf_counter() - start
+
+async def main(args: argparse.Namespace):
+    with tempfile.TemporaryDirectory() as tmp:
+        client = bot.client(build_config(tmp, args.config))
+        client.http.request = offline  # type: ignore | Anything outside the interaction webhooks would hit the network.
+        adapter = StubAdapter(args.rtt / 1000)
+        adapter.install()
+        async with client:
+            # Without an application ID the setup skips the command sync, which would go to Discord.
+            await client.setup_hook()
+            log_in(client)
+            guilds = [GUILD_BASE + i * 1000 for i in range(args.guilds)]
+            for i, guild_id in enumerate(guilds):
+                await client.db.run(generate_fake_data, client.db.sync, guild_id, args.gangs, args.history, SEED + i)
+            metrics.registry.reset()
+            workload = Workload(InteractionFactory(), guilds, args.gangs, random.Random(SEED))
+
+            stop = asyncio.Event()
+            lag: list[float] = []
+            probe = asyncio.create_task(probe_loop_lag(stop, lag))
+            latencies, timeouts, elapsed = await drive(client, adapter, workload, args.commands, args.concurrency)
+            stop.set()
+            await probe
+            # Give the completion events that trail each response a chance to be recorded.
+            await asyncio.sleep(0.1)
+
+            served = sum(len(samples) for samples in latencies.values())
+            loop_lag = summarize(lag, elapsed, served)
+            del loop_lag["writes_per_s"]
+            report = {
+                "commands": args.commands,
+                "concurrency": args.concurrency,
+                "guilds": args.guilds,
+                "rtt_ms": args.rtt,
+                "elapsed_s": round(elapsed, 3),
+                "commands_per_s": round(served / elapsed, 1),
+                "timeouts": dict(timeouts),
+                "latency": {"all": percentiles([s for samples in latencies.values() for s in samples])}
+                    | {kind: percentiles(latencies[kind]) for kind in MIX if kind in latencies},
+                "loop_lag": loop_lag,
+                "db_executor": client.db.stats(),
+                "server_side": metrics.registry.summary(metrics.COMMAND_SECONDS),
+                "discord_requests": dict(adapter.requests),
+            }
+    print(json.dumps(report, indent=4, default=str))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--commands", type=int, default=5000, help="Interactions to serve in total")
+    parser.add_argument("--concurrency", type=int, default=200, help="Simulated users with one interaction in flight each")
+    parser.add_argument("--guilds", type=int, default=10)
+    parser.add_argument("--gangs", type=int, default=30, help="Gangs seeded per guild")
+    parser.add_argument("--history", type=int, default=2000, help="Duels seeded per guild")
+    parser.add_argument("--rtt", type=float, default=0.0, help="Simulated round trip per Discord request, in ms")
+    parser.add_argument("--config", help="Take storage settings (workers, pragmas...) from this config file")
+    parser.add_argument("--log-level", default="WARNING")
+    args = parser.parse_args()
+    # Log to stderr, so stdout is only the report.
+    listener = logs.setup_logging(args.log_level, "rich", args.log_level, handler=RichHandler(console=Console(stderr=True)))
+    try:
+        asyncio.run(main(args))
+    finally:
+        listener.stop()
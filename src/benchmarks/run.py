@@ -0,0 +1,156 @@
+"""
+Benchmark suite for the scorekeeper data layer.
+
+Builds a temporary SQLite database per scale with the seeded fake data generator,
+times the hot `GangOps`/`DuelOps` paths and prints p50/p99 latency and ops/s as JSON.
+The seed and operation mix are fixed, so results are comparable across commits.
+
+Usage (from `src/`):
+    python -m benchmarks.run [--scales small medium] [--iterations 200]
+                             [--output results.json] [--check] [--compare old.json]
+
+With `--check`, results are compared against `benchmarks/thresholds.json` and the
+process exits with status 1 if any p99 latency is over its limit.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+
+from typing import Callable
+
+from db.sqldb import Duel, ScorekeeperDB
+from devtools.database import generate_fake_data
+
+SCALES = {
+    "small": {"gangs": 20, "duels": 1000},
+    "medium": {"gangs": 200, "duels": 100000},
+    "large": {"gangs": 1000, "duels": 1000000},
+}
+SEED = 1234
+GUILD_ID = 1
+THRESHOLDS_FILE = os.path.join(os.path.dirname(__file__), "thresholds.json")
+
+def measure(op: Callable[[], object], iterations: int) -> dict:
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        op()
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    total = sum(samples)
+    pick = lambda q: samples[min(len(samples) - 1, int(q * (len(samples) - 1)))] * 1000
+    return {
+        "iterations": iterations,
+        "p50_ms": round(pick(0.50), 4),
+        "p99_ms": round(pick(0.99), 4),
+        "ops_per_s": round(iterations / total, 1) if total else None,
+    }
+
+def bench_scale(name: str, gangs: int, duels: int, iterations: int) -> dict:
+    rng = random.Random(SEED)
+    with tempfile.TemporaryDirectory() as tmp:
+        db = ScorekeeperDB(os.path.join(tmp, f"{name}.sqldb"))
+        db.initialize_db()
+        build_start = time.perf_counter()
+        generate_fake_data(db, GUILD_ID, gangs, duels, SEED)
+        build_s = time.perf_counter() - build_start
+        all_gangs = db.gang.get_all(GUILD_ID)
+        names = [gang.name for gang in all_gangs]  # type: ignore
+        created: list[Duel] = []
+
+        def create():
+            attacker, defender = rng.sample(all_gangs, 2)
+            created.append(db.duel.create(attacker, rng.randint(0, 10), defender, rng.randint(0, 10)))
+
+        def update_scores():
+            db.duel.update_scores(rng.choice(created), rng.randint(0, 10), rng.randint(0, 10))
+
+        def delete():
+            db.duel.delete(created.pop())
+
+        results = {
+            "create": measure(create, iterations),
+            "get_by_name": measure(lambda: db.gang.get_by_name(GUILD_ID, rng.choice(names)), iterations),
+            "get_by_gang": measure(lambda: db.duel.get_by_gang(rng.choice(all_gangs)), max(1, iterations // 10)),
+            "get_recent": measure(lambda: db.duel.get_recent(GUILD_ID), iterations),
+            "update_scores": measure(update_scores, iterations),
+            "delete": measure(delete, iterations),
+        }
+        db.disconnect()
+    return {"gangs": gangs, "duels": duels, "build_s": round(build_s, 3), "ops": results}
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def check(report: dict, thresholds: dict) -> list[str]:
+    """Return a message for every operation whose p99 exceeds its threshold."""
+    failures = []
+    for scale, limits in thresholds.items():
+        if scale not in report["scales"]:
+            continue
+        for op, limit in limits.items():
+            p99 = report["scales"][scale]["ops"][op]["p99_ms"]
+            if p99 > limit:
+                failures.append(f"{scale}.{op}: p99 {p99:.3f}ms > {limit}ms")
+    return failures
+
+def compare(report: dict, baseline: dict) -> dict:
+    """Return the p99 ratio (new / baseline) per scale and operation present in both."""
+    ratios = {}
+    for scale, result in report["scales"].items():
+        old = baseline.get("scales", {}).get(scale)
+        if old is None:
+            continue
+        ratios[scale] = {
+            op: round(stats["p99_ms"] / old["ops"][op]["p99_ms"], 3)
+            for op, stats in result["ops"].items()
+            if op in old["ops"] and old["ops"][op]["p99_ms"]
+        }
+    return ratios
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", nargs="+", choices=SCALES, default=["small", "medium"])
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--output", help="Also write the JSON report to this file")
+    parser.add_argument("--check", action="store_true", help="Fail if a p99 latency exceeds thresholds.json")
+    parser.add_argument("--compare", help="A previous JSON report to compare p99 latencies against")
+    args = parser.parse_args()
+
+    report = {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "seed": SEED,
+        "scales": {},
+    }
+    for name in args.scales:
+        report["scales"][name] = bench_scale(name, iterations=args.iterations, **SCALES[name])
+    if args.compare:
+        with open(args.compare) as f:
+            report["p99_ratio_vs_baseline"] = compare(report, json.load(f))
+    failures = []
+    if args.check:
+        with open(THRESHOLDS_FILE) as f:
+            failures = check(report, json.load(f))
+        report["threshold_failures"] = failures
+    output = json.dumps(report, indent=4)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    if failures:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
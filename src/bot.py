@@ -1,11 +1,19 @@
 import discord
+from discord import app_commands
 from discord.ext import commands
 
 import logging
 
-import db.sqldb as database
+import db.async_db as database
+import metrics
+from live.scoreboard import Scoreboard
+from live.war_feed import WarFeed
+from db.live_scores import LiveScores
+from db.sqldb import ScorekeeperDB
 
+import hashlib
 import json
+import time
 
 class Config:
     """
@@ -46,11 +54,108 @@ class Config:
         Configuration for war-related settings.
         
         Attributes:
-            max_wars (int): The maximum number of wars allowed.
-            max_wars_per_gang (int): The maximum number of wars a gang can be involved in.
+            updates (bool): Whether duel results are posted to the update channel.
+            update_channel_id (int): The channel war updates are posted to.
+            update_window (float): Seconds to gather results before publishing them as one embed.
+            score_flush_interval (float): Seconds between writes of live score changes (`/wars score`) to the database.
+            score_journal (str): The append-only file live score changes are logged to until written.
         """
         updates: bool = False
         update_channel_id: int = 0
+        update_window: float = 5.0
+        score_flush_interval: float = 2.0
+        score_journal: str = "scorekeeper.scores.journal"
+    class scoreboard:
+        """
+        Configuration for the live scoreboard.
+        
+        Attributes:
+            channel_ids (list[int]): Channels that each keep one always-current scoreboard message.
+            interval (float): Minimum seconds between edits of a scoreboard message.
+            size (int): How many gangs the scoreboard lists.
+        """
+        channel_ids: list[int] = []
+        interval: float = 10.0
+        size: int = 10
+    class sync:
+        """
+        Configuration for application command syncing.
+        
+        Attributes:
+            state_file (str): Where the hash of the last synced command tree is kept.
+            dev_guild_id (int): In debug mode, sync to this guild only (instant updates). 0 syncs globally.
+        """
+        state_file: str = ".command_sync.json"
+        dev_guild_id: int = 0
+    class metrics:
+        """
+        Configuration for command and query metrics.
+        
+        Attributes:
+            enabled (bool): Whether command and query latencies are recorded.
+            http_port (int): Serve Prometheus text format on this local port at /metrics. 0 disables it.
+            http_host (str): The address the metrics endpoint binds to.
+        """
+        enabled: bool = True
+        http_port: int = 0
+        http_host: str = "127.0.0.1"
+    class log:
+        """
+        Configuration for logging.
+        
+        Attributes:
+            level (str): The bot's log level, e.g. "DEBUG" or "INFO".
+            format (str): "rich" for colored console output, "json" for one JSON object per line on stdout.
+            library_level (str): The log level for discord.py and peewee (which logs every query at DEBUG).
+        """
+        level: str = "DEBUG"
+        format: str = "rich"
+        library_level: str = "INFO"
+    class storage:
+        """
+        Configuration for the SQLite storage profile.
+        
+        Attributes:
+            path (str): The path to the SQLite database file.
+            journal_mode (str): The SQLite journal mode, e.g. "wal" or "delete".
+            synchronous (str): The SQLite synchronous level, e.g. "normal" or "full".
+            cache_size (int): The page cache size (negative values are KiB).
+            mmap_size (int): The maximum number of bytes to memory-map.
+            temp_store (str): Where temporary tables live, "memory" or "file".
+            busy_timeout (int): Milliseconds to wait on a locked database before failing.
+            workers (int): The number of database worker threads (one connection each). Reads run in parallel, writes one at a time.
+            max_queue (int): The maximum number of queued database jobs.
+            backup_dir (str): The directory `/database backup` writes online backups to.
+            archive_dir (str): The directory `/seasons close` writes closed seasons' duels to.
+        """
+        path: str = "scorekeeper.sqldb"
+        journal_mode: str = "wal"
+        synchronous: str = "normal"
+        cache_size: int = -16000
+        mmap_size: int = 67108864
+        temp_store: str = "memory"
+        busy_timeout: int = 5000
+        workers: int = 1
+        max_queue: int = 256
+        backup_dir: str = "backups"
+        archive_dir: str = "archives"
+
+        @classmethod
+        def pragmas(cls) -> dict:
+            """
+            Build the PRAGMA profile for new database connections.
+            
+            Returns:
+                dict: PRAGMA name to value.
+            """
+            return {
+                "journal_mode": cls.journal_mode,
+                "synchronous": cls.synchronous,
+                "cache_size": cls.cache_size,
+                "mmap_size": cls.mmap_size,
+                "temp_store": cls.temp_store,
+                "busy_timeout": cls.busy_timeout,
+            }
 
     def json_to_dict(self, json_str: str):
         """
@@ -97,6 +202,36 @@ class Config:
         war_config = config_dict.get("war", {})
         self.war.updates = war_config.get("updates", False)
         self.war.update_channel_id = war_config.get("update_channel_id", 0)
+        self.war.update_window = war_config.get("update_window", 5.0)
+        self.war.score_flush_interval = war_config.get("score_flush_interval", 2.0)
+        self.war.score_journal = war_config.get("score_journal", "scorekeeper.scores.journal")
+        scoreboard_config = config_dict.get("scoreboard", {})
+        self.scoreboard.channel_ids = scoreboard_config.get("channel_ids", [])
+        self.scoreboard.interval = scoreboard_config.get("interval", 10.0)
+        self.scoreboard.size = scoreboard_config.get("size", 10)
+        sync_config = config_dict.get("sync", {})
+        self.sync.state_file = sync_config.get("state_file", ".command_sync.json")
+        self.sync.dev_guild_id = sync_config.get("dev_guild_id", 0)
+        metrics_config = config_dict.get("metrics", {})
+        self.metrics.enabled = metrics_config.get("enabled", True)
+        self.metrics.http_port = metrics_config.get("http_port", 0)
+        self.metrics.http_host = metrics_config.get("http_host", "127.0.0.1")
+        log_config = config_dict.get("log", {})
+        self.log.level = log_config.get("level", "DEBUG")
+        self.log.format = log_config.get("format", "rich")
+        self.log.library_level = log_config.get("library_level", "INFO")
+        storage_config = config_dict.get("storage", {})
+        self.storage.path = storage_config.get("path", "scorekeeper.sqldb")
+        self.storage.journal_mode = storage_config.get("journal_mode", "wal")
+        self.storage.synchronous = storage_config.get("synchronous", "normal")
+        self.storage.cache_size = storage_config.get("cache_size", -16000)
+        self.storage.mmap_size = storage_config.get("mmap_size", 67108864)
+        self.storage.temp_store = storage_config.get("temp_store", "memory")
+        self.storage.busy_timeout = storage_config.get("busy_timeout", 5000)
+        self.storage.workers = storage_config.get("workers", 1)
+        self.storage.max_queue = storage_config.get("max_queue", 256)
+        self.storage.backup_dir = storage_config.get("backup_dir", "backups")
+        self.storage.archive_dir = storage_config.get("archive_dir", "archives")
             
     def export_to_dict(self) -> dict:
         """
@@ -118,7 +253,42 @@ class Config:
             },
             "war": {
                 "updates": self.war.updates,
-                "update_channel_id": self.war.update_channel_id
+                "update_channel_id": self.war.update_channel_id,
+                "update_window": self.war.update_window,
+                "score_flush_interval": self.war.score_flush_interval,
+                "score_journal": self.war.score_journal
+            },
+            "scoreboard": {
+                "channel_ids": self.scoreboard.channel_ids,
+                "interval": self.scoreboard.interval,
+                "size": self.scoreboard.size
+            },
+            "sync": {
+                "state_file": self.sync.state_file,
+                "dev_guild_id": self.sync.dev_guild_id
+            },
+            "metrics": {
+                "enabled": self.metrics.enabled,
+                "http_port": self.metrics.http_port,
+                "http_host": self.metrics.http_host
+            },
+            "log": {
+                "level": self.log.level,
+                "format": self.log.format,
+                "library_level": self.log.library_level
+            },
+            "storage": {
+                "path": self.storage.path,
+                "journal_mode": self.storage.journal_mode,
+                "synchronous": self.storage.synchronous,
+                "cache_size": self.storage.cache_size,
+                "mmap_size": self.storage.mmap_size,
+                "temp_store": self.storage.temp_store,
+                "busy_timeout": self.storage.busy_timeout,
+                "workers": self.storage.workers,
+                "max_queue": self.storage.max_queue,
+                "backup_dir": self.storage.backup_dir,
+                "archive_dir": self.storage.archive_dir
             }
         }
                 
@@ -149,17 +319,59 @@ class Config:
             config_dict = json.load(f)
             self.import_from_dict(config_dict)
 
-class client(commands.Bot):
+class MetricsCommandTree(app_commands.CommandTree):
+    """CommandTree that stamps every interaction with its start time for the command latency histogram."""
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        interaction.extras["started_at"] = time.perf_counter()
+        return True
+
+    async def on_error(self, interaction: discord.Interaction, error: app_commands.AppCommandError):
+        self.client.record_command_latency(interaction, "error")  # type: ignore
+        await super().on_error(interaction, error)
+
+class client(commands.AutoShardedBot):
     def __init__(self, config: Config):
         self.config = config
         self.logger = logging.getLogger()
-        self.db : database.ScorekeeperDB = database.ScorekeeperDB()
+        self.db : database.AsyncScorekeeperDB = database.AsyncScorekeeperDB(
+            ScorekeeperDB(config.storage.path, config.storage.pragmas()),
+            workers=config.storage.workers,
+            max_queue=config.storage.max_queue,
+        )
         intents = discord.Intents.default()
         intents.members = True  # Server Members intent (privileged)
         intents.moderation = True  # Moderation events (ban, kick, etc.)
         intents.bans = True
-        super().__init__(command_prefix="f!", intents=intents, help_command=None)
-        
+        super().__init__(command_prefix="f!", intents=intents, help_command=None, tree_cls=MetricsCommandTree)
+        metrics.registry.enabled = config.metrics.enabled
+        self.metrics_server = metrics.MetricsServer(metrics.registry, config.metrics.http_host, config.metrics.http_port) if config.metrics.http_port else None
+        self.war_feed = WarFeed(self, config.war.update_channel_id, config.war.update_window) if config.war.updates and config.war.update_channel_id else None
+        self.scoreboard = Scoreboard(self, config.scoreboard.channel_ids, config.scoreboard.interval, config.scoreboard.size) if config.scoreboard.channel_ids else None
+        self.live_scores = LiveScores(self.db, config.war.score_journal, config.war.score_flush_interval)
+        self.cog_timings: dict[str, dict] = {}
+        self.startup_timings: dict[str, float] = {}
+        self._setup_complete = False
+
+    async def load_extension(self, name: str, *, package: str | None = None) -> None:
+        """Load an extension like `commands.Bot` does and record how long it took in `cog_timings`."""
+        start = time.perf_counter()
+        ok = False
+        try:
+            await super().load_extension(name, package=package)
+            ok = True
+        finally:
+            self.cog_timings[name] = {"seconds": time.perf_counter() - start, "ok": ok}
+
+    async def reload_extension(self, name: str, *, package: str | None = None) -> None:
+        """Reload an extension like `commands.Bot` does and record how long it took (unload included) in `cog_timings`."""
+        start = time.perf_counter()
+        ok = False
+        try:
+            await super().reload_extension(name, package=package)
+            ok = True
+        finally:
+            self.cog_timings[name] = {"seconds": time.perf_counter() - start, "ok": ok}
+
     async def cog_enable(self, cog : str):
         """
         Enable a cog by its path (Python module path).
@@ -177,20 +389,20 @@ class client(commands.Bot):
             None        
         """
         try:
-            self.logger.debug(f"Attempting to load {cog}...")
+            self.logger.debug("Attempting to load %s...", cog)
             await self.load_extension(cog)
-            self.logger.info(f"Loaded {cog} successfully.")
-            self.logger.debug(f"Syncing application commands for {cog}...")
-            await self.tree.sync()
-            self.logger.info(f"Synced application commands for {cog}.")
+            self.logger.info("Loaded %s successfully.", cog)
+            self.logger.debug("Syncing application commands for %s...", cog)
+            await self.sync_commands()
+            self.logger.info("Synced application commands for %s.", cog)
         except commands.ExtensionAlreadyLoaded:
-            self.logger.warning(f"{cog} is already loaded.")
+            self.logger.warning("%s is already loaded.", cog)
         except commands.ExtensionNotFound:
-            self.logger.error(f"{cog} not found.")
+            self.logger.error("%s not found.", cog)
         except Exception as e:
-            self.logger.error(f"Failed to load {cog}: {e}")
+            self.logger.error("Failed to load %s: %s", cog, e)
             
-    async def batch_cog_enable(self, cogs : list[str]):
+    async def batch_cog_enable(self, cogs : list[str], sync: bool = True):
         """
         Enable multiple cogs by their paths (Python module paths).
         Example: ["cogs.example_cog", "cogs.another_cog"]
@@ -200,6 +412,7 @@ class client(commands.Bot):
         
         Args:
             cogs (list): A list of paths to the cogs to be loaded.
+            sync (bool): Sync application commands once every cog is loaded.
         Raises:
             commands.ExtensionAlreadyLoaded: If any cog is already loaded.
             commands.ExtensionNotFound: If any cog is not found.
@@ -207,24 +420,33 @@ class client(commands.Bot):
         Returns:
             None
         """
-        self.logger.debug(f"Attempting to load {len(cogs)} cogs...")
-        self.logger.debug(f"Cog list: {cogs}")
+        self.logger.debug("Attempting to load %s cogs...", len(cogs))
+        self.logger.debug("Cog list: %s", cogs)
         self.logger.debug("Loading cogs...")
+        # One after another: a module body runs on the event loop and cannot overlap with
+        # another, so gathering the loads would only interleave their setup() awaits.
+        loaded = 0
+        start = time.perf_counter()
         for cog in cogs:
+            # Each extension loads independently; one failing does not affect the others.
             try:
-                self.logger.debug(f"Loading {cog}...")
+                self.logger.debug("Loading %s...", cog)
                 await self.load_extension(cog)
-                self.logger.info(f"Loaded {cog} successfully.")
+                self.logger.info("Loaded %s successfully.", cog)
+                loaded += 1
             except commands.ExtensionAlreadyLoaded:
-                self.logger.warning(f"{cog} is already loaded.")
+                self.logger.warning("%s is already loaded.", cog)
             except commands.ExtensionNotFound:
-                self.logger.error(f"{cog} not found.")
+                self.logger.error("%s not found.", cog)
             except Exception as e:
-                self.logger.error(f"Failed to load {cog}: {e}")
-        self.logger.info(f"Batch loaded {len(cogs)} cogs successfully.")
-        self.logger.debug("Syncing application commands...")
-        await self.tree.sync()
-        self.logger.debug("Synced application commands.")
+                self.logger.error("Failed to load %s: %s", cog, e)
+        self.logger.info("Batch loaded %s/%s cogs in %.3fs.", loaded, len(cogs), time.perf_counter() - start)
+        slowest = sorted(((self.cog_timings[cog]["seconds"], cog) for cog in cogs if cog in self.cog_timings), reverse=True)[:3]
+        self.logger.debug("Slowest cogs: %s", ", ".join(f"{cog} {seconds * 1000:.1f}ms" for seconds, cog in slowest))
+        if sync:
+            self.logger.debug("Syncing application commands...")
+            await self.sync_commands()
+            self.logger.debug("Synced application commands.")
             
     async def cog_disable(self, cog : str):
         """
@@ -242,20 +464,20 @@ class client(commands.Bot):
         Returns:
             None
         """
-        self.logger.debug(f"Attempting to unload {cog}...")
+        self.logger.debug("Attempting to unload %s...", cog)
         try:
-            self.logger.debug(f"Unloading {cog}...")
+            self.logger.debug("Unloading %s...", cog)
             await self.unload_extension(cog)
-            self.logger.info(f"Unloaded {cog} successfully.")
-            self.logger.debug(f"Syncing application commands after unloading {cog}...")
-            await self.tree.sync()
-            self.logger.info(f"Synced application commands after unloading {cog}.")
+            self.logger.info("Unloaded %s successfully.", cog)
+            self.logger.debug("Syncing application commands after unloading %s...", cog)
+            await self.sync_commands()
+            self.logger.info("Synced application commands after unloading %s.", cog)
         except commands.ExtensionNotLoaded:
-            self.logger.warning(f"{cog} is not loaded.")
+            self.logger.warning("%s is not loaded.", cog)
         except commands.ExtensionNotFound:
-            self.logger.error(f"{cog} not found.")
+            self.logger.error("%s not found.", cog)
         except Exception as e:
-            self.logger.error(f"Failed to unload {cog}: {e}")
+            self.logger.error("Failed to unload %s: %s", cog, e)
             
     async def batch_cog_disable(self, cogs : list[str]):
         """
@@ -274,23 +496,23 @@ class client(commands.Bot):
         Returns:
             None
         """
-        self.logger.debug(f"Attempting to unload {len(cogs)} cogs...")
-        self.logger.debug(f"Cog list: {cogs}")
+        self.logger.debug("Attempting to unload %s cogs...", len(cogs))
+        self.logger.debug("Cog list: %s", cogs)
         self.logger.debug("Unloading cogs...")
         for cog in cogs:
             try:
-                self.logger.debug(f"Unloading {cog}...")
+                self.logger.debug("Unloading %s...", cog)
                 await self.unload_extension(cog)
-                self.logger.info(f"Unloaded {cog} successfully.")
+                self.logger.info("Unloaded %s successfully.", cog)
             except commands.ExtensionNotLoaded:
-                self.logger.warning(f"{cog} is not loaded.")
+                self.logger.warning("%s is not loaded.", cog)
             except commands.ExtensionNotFound:
-                self.logger.error(f"{cog} not found.")
+                self.logger.error("%s not found.", cog)
             except Exception as e:
-                self.logger.error(f"Failed to unload {cog}: {e}")
-        self.logger.info(f"Batch unloaded {len(cogs)} cogs successfully.")
+                self.logger.error("Failed to unload %s: %s", cog, e)
+        self.logger.info("Batch unloaded %s cogs successfully.", len(cogs))
         self.logger.debug("Syncing application commands...")
-        await self.tree.sync()
+        await self.sync_commands()
         self.logger.debug("Synced application commands.")
         
     async def cog_reload(self, cog : str ):
@@ -311,14 +533,14 @@ class client(commands.Bot):
         """
         try:
             await self.reload_extension(cog)
-            self.logger.info(f"Reloaded {cog} successfully.")
-            await self.tree.sync()
+            self.logger.info("Reloaded %s successfully.", cog)
+            await self.sync_commands()
         except commands.ExtensionNotLoaded:
-            self.logger.warning(f"{cog} is not loaded.")
+            self.logger.warning("%s is not loaded.", cog)
         except commands.ExtensionNotFound:
-            self.logger.error(f"{cog} not found.")
+            self.logger.error("%s not found.", cog)
         except Exception as e:
-            self.logger.error(f"Failed to reload {cog}: {e}")
+            self.logger.error("Failed to reload %s: %s", cog, e)
             
     async def batch_cog_reload(self, cogs : list[str]):
         """
@@ -340,28 +562,171 @@ class client(commands.Bot):
         for cog in cogs:
             try:
                 await self.reload_extension(cog)
-                self.logger.info(f"Reloaded {cog} successfully.")
+                self.logger.info("Reloaded %s successfully.", cog)
             except commands.ExtensionNotLoaded:
-                self.logger.warning(f"{cog} is not loaded.")
+                self.logger.warning("%s is not loaded.", cog)
             except commands.ExtensionNotFound:
-                self.logger.error(f"{cog} not found.")
+                self.logger.error("%s not found.", cog)
             except Exception as e:
-                self.logger.error(f"Failed to reload {cog}: {e}")
-        self.logger.info(f"Batch reloaded {len(cogs)} cogs successfully.")
-        await self.tree.sync()
+                self.logger.error("Failed to reload %s: %s", cog, e)
+        self.logger.info("Batch reloaded %s cogs successfully.", len(cogs))
+        await self.sync_commands()
         
+    def _sync_target(self) -> discord.Object | None:
+        """The guild to sync application commands to, or None for a global sync."""
+        if self.config.debug.enabled and self.config.sync.dev_guild_id:
+            return discord.Object(id=self.config.sync.dev_guild_id)
+        return None
+
+    def command_tree_hash(self, guild: discord.abc.Snowflake | None = None) -> str:
+        """
+        Hash the serialized application command tree, exactly as it would be sent to Discord.
+        
+        Args:
+            guild (Snowflake | None): Hash the commands for this guild instead of the global ones.
+        Returns:
+            str: A SHA-256 hex digest.
+        """
+        payload = [command.to_dict(self.tree) for command in self.tree.get_commands(guild=guild)]
+        payload.sort(key=lambda command: (command.get("type", 1), command["name"]))
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, separators=(",", ":")).encode()).hexdigest()
+
+    def _load_sync_state(self) -> dict:
+        try:
+            with open(self.config.sync.state_file, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _store_sync_state(self, state: dict):
+        try:
+            with open(self.config.sync.state_file, 'w') as f:
+                json.dump(state, f, indent=4)
+        except OSError as e:
+            self.logger.warning("Could not store command sync state: %s", e)
+
+    async def sync_commands(self, force: bool = False) -> bool:
+        """
+        Sync application commands, but only if the command tree changed since the last sync.
+        
+        The hash of the last synced tree is kept on disk (`Config.sync.state_file`) per
+        application and target, so restarts and hot reloads that change no commands skip
+        the rate-limited HTTP call. In debug mode with `Config.sync.dev_guild_id` set,
+        commands are synced to that guild only.
+        
+        Args:
+            force (bool): Sync even if the tree looks unchanged.
+        Returns:
+            bool: Whether a sync was sent.
+        """
+        guild = self._sync_target()
+        if guild is not None:
+            self.tree.copy_global_to(guild=guild)
+        key = f"{self.application_id}:{guild.id if guild is not None else 'global'}"
+        digest = self.command_tree_hash(guild)
+        state = self._load_sync_state()
+        previous = state.get(key, {})
+        if not force and previous.get("hash") == digest:
+            self.logger.info("Command tree unchanged (%s), skipped sync; saved ~%.2fs.", key, previous.get("seconds", 0.0))
+            return False
+        start = time.perf_counter()
+        await self.tree.sync(guild=guild)
+        elapsed = time.perf_counter() - start
+        state[key] = {"hash": digest, "seconds": round(elapsed, 3)}
+        self._store_sync_state(state)
+        self.logger.info("Synced application commands (%s) in %.2fs.", key, elapsed)
+        return True
+
+    def record_command_latency(self, interaction: discord.Interaction, status: str):
+        """
+        Record how long an application command took, from the tree's interaction check until now.
+        
+        Args:
+            interaction (discord.Interaction): The command's interaction.
+            status (str): "ok" or "error".
+        Returns:
+            None
+        """
+        started = interaction.extras.get("started_at")
+        if started is None or interaction.command is None:
+            return
+        metrics.registry.observe(metrics.COMMAND_SECONDS, (interaction.command.qualified_name, status), time.perf_counter() - started)
+
+    async def on_app_command_completion(self, interaction: discord.Interaction, command: app_commands.Command | app_commands.ContextMenu):
+        self.record_command_latency(interaction, "ok")
+
+    async def close(self):
+        try:
+            await super().close()
+        except AttributeError:
+            # AutoShardedClient.close() signals a shard event queue that only exists once
+            # connect() ran. Without shards (e.g. --profile-startup) there is nothing left to close.
+            if self.shards:
+                raise
+        if self.scoreboard is not None:
+            await self.scoreboard.stop()
+        if self.war_feed is not None:
+            await self.war_feed.stop()
+        if self.metrics_server is not None:
+            await self.metrics_server.stop()
+        try:
+            await self.live_scores.stop()
+        except Exception as e:
+            self.logger.error("Could not write live scores on shutdown, they stay in %s: %s", self.live_scores.journal_path, e)
+        await self.db.close_db()
+
+    async def _timed_startup_step(self, step: str, coro):
+        start = time.perf_counter()
+        try:
+            return await coro
+        finally:
+            self.startup_timings[step] = time.perf_counter() - start
+            self.logger.debug("Startup step %s took %.3fs.", step, self.startup_timings[step])
+
+    async def setup_hook(self):
+        """
+        One-time startup work: open the database, load the configured cogs and sync commands.
+        
+        Runs once from `login()`, before the gateway connects, so reconnects (which fire
+        `on_ready` again) repeat none of it. Calling it again is a no-op. Each step's
+        duration is recorded in `startup_timings`. The sync is skipped if the application
+        ID is not known yet, i.e. when called without logging in.
+        
+        Returns:
+            None
+        """
+        if self._setup_complete:
+            self.logger.debug("Setup already complete, skipping.")
+            return
+        await self._timed_startup_step("db_init", self.db.initialize_db())
+        await self._timed_startup_step("live_scores", self.live_scores.start())
+        if self.war_feed is not None:
+            self.war_feed.start()
+        if self.scoreboard is not None:
+            self.scoreboard.start()
+        cogs = self.config.default_cogs + (self.config.debug.debug_cogs if self.config.debug.enabled else [])
+        await self._timed_startup_step("cog_load", self.batch_cog_enable(cogs, sync=False))
+        if self.application_id is not None:
+            await self._timed_startup_step("sync", self.sync_commands())
+        if self.metrics_server is not None:
+            await self.metrics_server.start()
+            self.logger.info("Serving metrics on http://%s:%s/metrics", self.metrics_server.host, self.metrics_server.port)
+        self._setup_complete = True
+        self.logger.info("Setup complete in %.3fs.", sum(self.startup_timings.values()))
+
     async def on_ready(self):
-        self.db.initialize_db()
-        self.logger.info(f"Logged in as {self.user.name} - {self.user.id}") # type: ignore | self.user is not None unless called manually.
+        self.logger.info("Logged in as %s - %s", self.user.name, self.user.id) # type: ignore | self.user is not None unless called manually.
         self.logger.info("Latency: %s", self.latency)
         self.logger.info("Active Commands: %s", len(self.tree.get_commands()))
         self.logger.info("Active Guilds: %s", len(self.guilds))
+        self.logger.info("Shards: %s", self.shard_count)
         self.logger.info("Active Users: %s", len(self.users))
-        self.logger.debug("Guilds: %s", [guild.name for guild in self.guilds])
-        self.logger.debug("Cogs: %s", [cog for cog in self.cogs])
-        self.logger.debug("Commands: %s", [command.name for command in self.tree.get_commands()])
+        if self.logger.isEnabledFor(logging.DEBUG):
+            # Building these lists walks every guild; skip it unless it will be logged.
+            self.logger.debug("Guilds: %s", [guild.name for guild in self.guilds])
+            self.logger.debug("Cogs: %s", list(self.cogs))
+            self.logger.debug("Commands: %s", [command.name for command in self.tree.get_commands()])
         self.logger.info("------")
         await self.change_presence(activity=discord.Game(name="f!help"), status=discord.Status.dnd)
         self.logger.debug("Presence set to 'Playing f!help' with DND status.")
-        self.logger.info("Bot is ready.")
-        await self.batch_cog_enable(self.config.default_cogs + (self.config.debug.debug_cogs if self.config.debug.enabled else []))
\ No newline at end of file
+        self.logger.info("Bot is ready.")
\ No newline at end of file
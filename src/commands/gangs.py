@@ -2,8 +2,28 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 
+from datetime import datetime, timedelta
+from typing import Literal
+
 import bot
+from db.sqldb import utcnow
+from live.scoreboard import format_standing
+
+TimeWindow = Literal["day", "week", "month", "all"]
+TIME_WINDOWS = {"day": timedelta(days=1), "week": timedelta(days=7), "month": timedelta(days=30)}
+SEASON_DESCRIPTION = "A closed season's number (see /seasons list); leave empty for the current season"
+
+def window_start(window: str) -> datetime | None:
+    """The UTC start of a named time window, or None for all time."""
+    span = TIME_WINDOWS.get(window)
+    return utcnow() - span if span is not None else None
+
+async def gang_name_autocomplete(interaction: discord.Interaction, current: str) -> list[app_commands.Choice[str]]:
+    """Suggest the server's gang names starting with what the user has typed, served from the in-memory prefix index."""
+    names = interaction.client.db.sync.gang.registry.complete(interaction.guild_id, current, 25)  # type: ignore
+    return [app_commands.Choice(name=name, value=name) for name in names]
 
+@app_commands.guild_only()
 class Gangs(commands.GroupCog, name="gangs"):
     def __init__(self, bot: bot.client):
         self.bot = bot
@@ -11,32 +31,92 @@ class Gangs(commands.GroupCog, name="gangs"):
 
     @app_commands.command(name="create", description="Create a new gang")
     async def create_gang(self, interaction: discord.Interaction, name: str):
-        self.bot.db.gang.create(name)
+        await self.bot.db.gang.create(interaction.guild_id, name)
         await interaction.response.send_message(f"Gang '{name}' created.", ephemeral=True)
 
     @app_commands.command(name="delete", description="Delete an existing gang")
+    @app_commands.autocomplete(name=gang_name_autocomplete)
     async def delete_gang(self, interaction: discord.Interaction, name: str):
         try:
-            gang = self.bot.db.gang.get_by_name(name)
+            gang = await self.bot.db.gang.get_by_name(interaction.guild_id, name)
         except ValueError as e:
             await interaction.response.send_message(str(e), ephemeral=True)
             return
-        self.bot.db.gang.delete(gang)
+        await self.bot.db.gang.delete(gang)
         await interaction.response.send_message(f"Gang '{name}' deleted.", ephemeral=True)
 
     @app_commands.command(name="edit", description="Edit an existing gang's name")
+    @app_commands.autocomplete(old_name=gang_name_autocomplete)
     async def edit_gang(self, interaction: discord.Interaction, old_name: str, new_name: str):
         try:
-            gang = self.bot.db.gang.get_by_name(old_name)
+            gang = await self.bot.db.gang.get_by_name(interaction.guild_id, old_name)
         except ValueError as e:
             await interaction.response.send_message(str(e), ephemeral=True)
             return
         try:
-            self.bot.db.gang.update_name(gang, new_name)
+            await self.bot.db.gang.update_name(gang, new_name)
         except ValueError as e:
             await interaction.response.send_message(str(e), ephemeral=True)
             return
         await interaction.response.send_message(f"Gang '{old_name}' renamed to '{new_name}'.", ephemeral=True)
 
+    @app_commands.command(name="leaderboard", description="Show the top gangs by wins")
+    @app_commands.describe(top="How many gangs to show", window="Only count wars from this period of the current season", season=SEASON_DESCRIPTION)
+    async def leaderboard(self, interaction: discord.Interaction, top: app_commands.Range[int, 1, 25] = 10, window: TimeWindow = "all", season: int | None = None):
+        since = window_start(window)
+        if season is not None:
+            try:
+                closed = await self.bot.db.season.get(interaction.guild_id, season)
+            except ValueError as e:
+                await interaction.response.send_message(str(e), ephemeral=True)
+                return
+            standings = await self.bot.db.season.top(closed, top)
+        elif since is None:
+            standings = await self.bot.db.standing.top(interaction.guild_id, top)
+        else:
+            standings = await self.bot.db.standing.between(interaction.guild_id, since, None, top)
+        if not standings:
+            await interaction.response.send_message("No gangs yet." if since is None else "No wars in that period.", ephemeral=True)
+            return
+        lines = [format_standing(rank, standing) for rank, standing in enumerate(standings, start=1)]
+        if season is not None:
+            title = f"Gang Leaderboard (season {season})"
+        else:
+            title = "Gang Leaderboard" if since is None else f"Gang Leaderboard (last {window})"
+        embed = discord.Embed(title=title, description="\n".join(lines))
+        await interaction.response.send_message(embed=embed)
+
+    @app_commands.command(name="rating", description="Show a gang's Elo rating, or the top rated gangs")
+    @app_commands.describe(gang="The gang to look up (leave empty for the top rated gangs)", top="How many gangs to show", season=SEASON_DESCRIPTION)
+    @app_commands.autocomplete(gang=gang_name_autocomplete)
+    async def rating(self, interaction: discord.Interaction, gang: str | None = None, top: app_commands.Range[int, 1, 25] = 10, season: int | None = None):
+        try:
+            closed = await self.bot.db.season.get(interaction.guild_id, season) if season is not None else None
+        except ValueError as e:
+            await interaction.response.send_message(str(e), ephemeral=True)
+            return
+        if gang is None:
+            rated = await (self.bot.db.season.top_rated(closed, top) if closed is not None else self.bot.db.rating.top(interaction.guild_id, top))
+            if not rated:
+                await interaction.response.send_message("No rated gangs yet.", ephemeral=True)
+                return
+            lines = [f"**{rank}. {row.gang.name}** - {row.rating:.0f} ({row.games} wars)" for rank, row in enumerate(rated, start=1)]
+            title = "Gang Ratings" if closed is None else f"Gang Ratings (season {season})"
+            await interaction.response.send_message(embed=discord.Embed(title=title, description="\n".join(lines)))
+            return
+        try:
+            if closed is not None:
+                row = await self.bot.db.season.standing(closed, gang)
+                target, rank = row.gang, await self.bot.db.season.rank(closed, row)
+            else:
+                target = await self.bot.db.gang.get_by_name(interaction.guild_id, gang)
+                row = await self.bot.db.rating.get(target)
+                rank = await self.bot.db.rating.rank(target)
+        except ValueError as e:
+            await interaction.response.send_message(str(e), ephemeral=True)
+            return
+        suffix = "" if closed is None else f" in season {season}"
+        await interaction.response.send_message(f"**{target.name}**: Elo {row.rating:.0f}, rank #{rank} after {row.games} wars{suffix}.")
+
 async def setup(bot: bot.client):
     await bot.add_cog(Gangs(bot))
\ No newline at end of file
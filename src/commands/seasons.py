@@ -0,0 +1,49 @@
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+import bot
+from live.scoreboard import format_standing
+
+SEASON_LIST_LIMIT = 10
+
+@app_commands.guild_only()
+class Seasons(commands.GroupCog, name="seasons"):
+    def __init__(self, bot: bot.client):
+        self.bot = bot
+        super().__init__()
+
+    @app_commands.command(name="list", description="Show the current season and the closed ones")
+    async def list_seasons(self, interaction: discord.Interaction):
+        current = await self.bot.db.season.current(interaction.guild_id)
+        closed = await self.bot.db.season.get_all(interaction.guild_id)
+        lines = []
+        for season in closed[:SEASON_LIST_LIMIT]:
+            top = await self.bot.db.season.top(season, 1)
+            started = f"{season.started_at:%Y-%m-%d}" if season.started_at is not None else "?"
+            champion = f", won by **{top[0].name}**" if top else ""
+            lines.append(f"**Season {season.number}** - {started} to {season.ended_at:%Y-%m-%d}, {season.duels} wars{champion}")
+        if len(closed) > len(lines):
+            lines.append(f"...and {len(closed) - len(lines)} earlier seasons.")
+        embed = discord.Embed(title=f"Season {current} in progress", description="\n".join(lines) or "No closed seasons yet.")
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+    @app_commands.command(name="close", description="End the current season: archive its wars and start over")
+    @app_commands.default_permissions(manage_guild=True)
+    async def close_season(self, interaction: discord.Interaction):
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        # Live score changes still in memory belong to the season that is ending.
+        await self.bot.live_scores.flush()
+        try:
+            season = await self.bot.db.season.close(interaction.guild_id, self.bot.config.storage.archive_dir)
+        except ValueError as e:
+            await interaction.followup.send(str(e), ephemeral=True)
+            return
+        standings = await self.bot.db.season.top(season, 3)
+        lines = [format_standing(rank, standing) for rank, standing in enumerate(standings, start=1)]
+        embed = discord.Embed(title=f"Season {season.number} closed", description="\n".join(lines))
+        embed.set_footer(text=f"{season.duels} wars archived. Season {season.number + 1} has started.")
+        await interaction.followup.send(embed=embed, ephemeral=True)
+
+async def setup(bot: bot.client):
+    await bot.add_cog(Seasons(bot))
@@ -2,8 +2,137 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 
+import csv
+import io
+import json
+
+from typing import Literal
+
 import bot
+from commands.gangs import SEASON_DESCRIPTION, TimeWindow, gang_name_autocomplete, window_start
+
+IMPORT_COLUMNS = ("attacker", "attacking_score", "defender", "defending_score")
+IMPORT_MAX_ROWS = 50000
+# SQLite stores integers in 64 bits; anything larger fails the whole insert.
+IMPORT_MAX_SCORE = 2 ** 63 - 1
+
+def parse_score(value) -> int:
+    """A score from an import row: a whole number in 0..`IMPORT_MAX_SCORE`, given as a number or text."""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    if isinstance(value, str):
+        try:
+            value = int(value.strip())
+        except ValueError:
+            pass
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise ValueError("scores must be whole numbers")
+    if not 0 <= value <= IMPORT_MAX_SCORE:
+        raise ValueError(f"scores must be between 0 and {IMPORT_MAX_SCORE}")
+    return value
+
+def parse_war_rows(data: bytes, filename: str) -> tuple[list[tuple[str, int, str, int]], list[int], list[tuple[int, str]]]:
+    """
+    Parse a war import file.
+    
+    JSON files hold a list of objects keyed by `IMPORT_COLUMNS` or a list of 4-item lists.
+    Anything else is read as CSV in `IMPORT_COLUMNS` order, with an optional header row.
+    
+    Args:
+        data (bytes): The raw file contents.
+        filename (str): The attachment's filename, used to pick the format.
+    Returns:
+        tuple: The parsed rows, the source line (CSV) or item (JSON) number of each row,
+            and (number, error) for every row that could not be parsed.
+    """
+    text = data.decode("utf-8-sig")
+    if filename.lower().endswith(".json"):
+        items = json.loads(text)
+        if not isinstance(items, list):
+            raise ValueError("JSON imports must be a list of wars.")
+        raw = [
+            (number, [item.get(column) for column in IMPORT_COLUMNS] if isinstance(item, dict) else item)
+            for number, item in enumerate(items, start=1)
+        ]
+    else:
+        raw = [(number, line) for number, line in enumerate(csv.reader(io.StringIO(text)), start=1) if any(cell.strip() for cell in line)]
+        if raw and [cell.strip().lower() for cell in raw[0][1]] == list(IMPORT_COLUMNS):
+            raw = raw[1:]
+    rows, numbers, errors = [], [], []
+    for number, values in raw:
+        try:
+            if not isinstance(values, list) or len(values) != 4:
+                raise ValueError(f"expected {len(IMPORT_COLUMNS)} columns: {', '.join(IMPORT_COLUMNS)}")
+            attacker, attacking_score, defender, defending_score = values
+            scores = parse_score(attacking_score), parse_score(defending_score)
+            rows.append((str(attacker).strip(), scores[0], str(defender).strip(), scores[1]))
+            numbers.append(number)
+        except ValueError as e:
+            errors.append((number, str(e)))
+    return rows, numbers, errors
+
+HISTORY_PAGE_SIZE = 10
+
+def format_duel(duel) -> str:
+    """Render a duel as a single line."""
+    return f"`#{duel.id}` **{duel.attacking_gang.name}** {duel.attacking_score} - {duel.defending_score} **{duel.defending_gang.name}**"
+
+class HistoryView(discord.ui.View):
+    """
+    Paged view over a gang's war history.
+    
+    Each button press fetches only the neighbouring page, keyed on the first or last
+    duel ID currently shown. With a closed `season`, pages come from its archive.
+    """
+    def __init__(self, bot: bot.client, gang, user_id: int, page_size: int = HISTORY_PAGE_SIZE, window: str = "all", season=None):
+        super().__init__(timeout=300)
+        self.bot = bot
+        self.gang = gang
+        self.season = season
+        self.window = window
+        self.since = window_start(window) if season is None else None
+        self.user_id = user_id
+        self.page_size = page_size
+        self.duels: list = []
+
+    async def load(self, after_id: int | None = None, before_id: int | None = None):
+        """Fetch a page (one extra row tells us whether there is more in that direction)."""
+        if self.season is not None:
+            duels = await self.bot.db.season.history(self.season, self.gang, after_id=after_id, before_id=before_id, limit=self.page_size + 1)
+        else:
+            duels = await self.bot.db.duel.history(self.gang, after_id=after_id, before_id=before_id, limit=self.page_size + 1, since=self.since)
+        more = len(duels) > self.page_size
+        if after_id is not None:
+            self.duels = duels[:self.page_size]
+            self.older.disabled = False
+            self.newer.disabled = not more
+        else:
+            self.duels = duels[-self.page_size:]
+            self.older.disabled = not more
+            self.newer.disabled = before_id is None
+
+    def embed(self) -> discord.Embed:
+        lines = [format_duel(duel) for duel in self.duels] or ["No wars yet."]
+        if self.season is not None:
+            title = f"War history: {self.gang.name} (season {self.season.number})"
+        else:
+            title = f"War history: {self.gang.name}" if self.since is None else f"War history: {self.gang.name} (last {self.window})"
+        return discord.Embed(title=title, description="\n".join(lines))
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        return interaction.user.id == self.user_id
+
+    @discord.ui.button(label="Older", style=discord.ButtonStyle.secondary)
+    async def older(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self.load(before_id=self.duels[0].id if self.duels else None)
+        await interaction.response.edit_message(embed=self.embed(), view=self)
+
+    @discord.ui.button(label="Newer", style=discord.ButtonStyle.secondary)
+    async def newer(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self.load(after_id=self.duels[-1].id if self.duels else 0)
+        await interaction.response.edit_message(embed=self.embed(), view=self)
 
+@app_commands.guild_only()
 class Wars(commands.GroupCog, name="wars"):
     def __init__(self, bot: bot.client):
         self.bot = bot
@@ -16,15 +145,16 @@ class Wars(commands.GroupCog, name="wars"):
         defending_gang="The name of the gang that is defending",
         defending_score="The score of the defending gang"
     )
+    @app_commands.autocomplete(attacking_gang=gang_name_autocomplete, defending_gang=gang_name_autocomplete)
     async def create_war(self, interaction: discord.Interaction, attacking_gang: str, attacking_score : int, defending_gang: str, defending_score: int):
         try:
-            attacker = self.bot.db.gang.get_by_name(attacking_gang)
-            defender = self.bot.db.gang.get_by_name(defending_gang)
+            attacker = await self.bot.db.gang.get_by_name(interaction.guild_id, attacking_gang)
+            defender = await self.bot.db.gang.get_by_name(interaction.guild_id, defending_gang)
         except ValueError as e:
             await interaction.response.send_message(str(e), ephemeral=True)
             return
         try:
-            duel = self.bot.db.duel.create(attacker, attacking_score, defender, defending_score)
+            duel = await self.bot.db.duel.create(attacker, attacking_score, defender, defending_score)
         except ValueError as e:
             await interaction.response.send_message(str(e), ephemeral=True)
             return
@@ -33,13 +163,127 @@ class Wars(commands.GroupCog, name="wars"):
     @app_commands.command(name="delete", description="Delete a war by its war_id")
     @app_commands.describe(war_id="The ID of the war to delete")
     async def delete_war(self, interaction: discord.Interaction, war_id: int):
+        # Ratings after the war are replayed, which can take a while behind other queued writes.
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        try:
+            duel = await self.bot.db.duel.get_by_id(interaction.guild_id, war_id)
+            await self.bot.db.duel.delete(duel)
+        except ValueError:
+            await interaction.followup.send(f"No war found with ID {war_id}.", ephemeral=True)
+            return
+        await interaction.followup.send(f"War with ID {war_id} deleted.", ephemeral=True)
+
+    @app_commands.command(name="score", description="Add points to one side of a war in progress")
+    @app_commands.describe(war_id="The ID of the war", side="The side that scored", points="Points to add (negative to take back)")
+    async def score(self, interaction: discord.Interaction, war_id: int, side: Literal["attacker", "defender"], points: app_commands.Range[int, -100, 100] = 1):
+        try:
+            if points == 0:
+                raise ValueError("Points cannot be zero.")
+            duel, (attacking_score, defending_score) = await self.bot.live_scores.add(interaction.guild_id, war_id, points if side == "attacker" else 0, points if side == "defender" else 0)
+        except ValueError as e:
+            await interaction.response.send_message(str(e), ephemeral=True)
+            return
+        await interaction.response.send_message(f"War #{war_id}: {self.gang_name(duel.attacking_gang_id)} {attacking_score} - {defending_score} {self.gang_name(duel.defending_gang_id)}", ephemeral=True)
+
+    @app_commands.command(name="close", description="Write a war's live score now and show the final result")
+    @app_commands.describe(war_id="The ID of the war")
+    async def close_war(self, interaction: discord.Interaction, war_id: int):
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        await self.bot.live_scores.flush()
+        try:
+            duel = await self.bot.db.duel.get_by_id(interaction.guild_id, war_id)
+        except ValueError as e:
+            await interaction.followup.send(str(e), ephemeral=True)
+            return
+        await interaction.followup.send(f"War #{war_id} final score: {self.gang_name(duel.attacking_gang_id)} {duel.attacking_score} - {duel.defending_score} {self.gang_name(duel.defending_gang_id)}", ephemeral=True)
+
+    def gang_name(self, gang_id: int) -> str:
+        """A gang's name from the in-memory registry, without touching the database."""
+        gang = self.bot.db.sync.gang.registry.get_by_id(gang_id)
+        return gang.name if gang is not None else "(deleted gang)"  # type: ignore
+
+    @app_commands.command(name="history", description="Show a gang's war history")
+    @app_commands.describe(gang="The name of the gang", window="Only show wars from this period of the current season", season=SEASON_DESCRIPTION)
+    @app_commands.autocomplete(gang=gang_name_autocomplete)
+    async def history(self, interaction: discord.Interaction, gang: str, window: TimeWindow = "all", season: int | None = None):
+        try:
+            if season is not None:
+                closed = await self.bot.db.season.get(interaction.guild_id, season)
+                target = (await self.bot.db.season.standing(closed, gang)).gang
+            else:
+                closed, target = None, await self.bot.db.gang.get_by_name(interaction.guild_id, gang)
+            view = HistoryView(self.bot, target, interaction.user.id, window=window, season=closed)
+            await view.load()
+        except ValueError as e:
+            await interaction.response.send_message(str(e), ephemeral=True)
+            return
+        await interaction.response.send_message(embed=view.embed(), view=view)
+
+    @app_commands.command(name="import", description="Import many wars from a CSV or JSON attachment")
+    @app_commands.describe(file="CSV or JSON rows of attacker, attacking_score, defender, defending_score")
+    async def import_wars(self, interaction: discord.Interaction, file: discord.Attachment):
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        try:
+            rows, numbers, errors = parse_war_rows(await file.read(), file.filename)
+        except (UnicodeDecodeError, ValueError) as e:
+            await interaction.followup.send(f"Could not read `{file.filename}`: {e}", ephemeral=True)
+            return
+        if len(rows) > IMPORT_MAX_ROWS:
+            await interaction.followup.send(f"Too many rows ({len(rows)}), the limit is {IMPORT_MAX_ROWS}.", ephemeral=True)
+            return
         try:
-            duel = self.bot.db.duel.get_by_id(war_id)
+            imported, rejected = await self.bot.db.duel.import_rows(interaction.guild_id, rows)
         except Exception:
-            await interaction.response.send_message(f"No war found with ID {war_id}.", ephemeral=True)
+            # The response is deferred, so without a followup the user would wait forever.
+            await interaction.followup.send(f"Importing `{file.filename}` failed, no wars were imported.", ephemeral=True)
+            raise
+        errors += [(numbers[index], error) for index, error in rejected]
+        errors.sort()
+        message = f"Imported {imported} wars from `{file.filename}`."
+        if errors:
+            lines = [f"Row {number}: {error}" for number, error in errors[:15]]
+            if len(errors) > len(lines):
+                lines.append(f"...and {len(errors) - len(lines)} more.")
+            message += f" {len(errors)} rows rejected:\n" + "\n".join(lines)
+        await interaction.followup.send(message[:2000], ephemeral=True)
+
+    @app_commands.command(name="rivalry", description="Show the head-to-head record between two gangs")
+    @app_commands.describe(gang_a="The first gang", gang_b="The second gang", season=SEASON_DESCRIPTION)
+    @app_commands.autocomplete(gang_a=gang_name_autocomplete, gang_b=gang_name_autocomplete)
+    async def rivalry(self, interaction: discord.Interaction, gang_a: str, gang_b: str, season: int | None = None):
+        try:
+            if season is not None:
+                closed = await self.bot.db.season.get(interaction.guild_id, season)
+                first = (await self.bot.db.season.standing(closed, gang_a)).gang
+                second = (await self.bot.db.season.standing(closed, gang_b)).gang
+                record = await self.bot.db.season.rivalry(closed, first.id, second.id)
+            else:
+                first = await self.bot.db.gang.get_by_name(interaction.guild_id, gang_a)
+                second = await self.bot.db.gang.get_by_name(interaction.guild_id, gang_b)
+                record = await self.bot.db.rivalry.get(first, second)
+        except ValueError as e:
+            await interaction.response.send_message(str(e), ephemeral=True)
             return
-        self.bot.db.duel.delete(duel)
-        await interaction.response.send_message(f"War with ID {war_id} deleted.", ephemeral=True)
+        if not record["duels"]:
+            await interaction.response.send_message(f"'{first.name}' and '{second.name}' have never fought{'' if season is None else f' in season {season}'}.", ephemeral=True)
+            return
+        embed = discord.Embed(title=f"{first.name} vs {second.name}" if season is None else f"{first.name} vs {second.name} (season {season})")
+        embed.add_field(name="Wars", value=str(record["duels"]))
+        embed.add_field(name="Wins", value=f"{record['wins'][first.id]} - {record['wins'][second.id]} ({record['draws']} draws)")
+        embed.add_field(name="Total score", value=f"{record['score'][first.id]} - {record['score'][second.id]}")
+        embed.set_footer(text=f"Last war ID: {record['last_duel_id']}")
+        await interaction.response.send_message(embed=embed)
+
+    @app_commands.command(name="rivalries", description="Export the head-to-head wins matrix for the server's gangs as CSV")
+    async def rivalries(self, interaction: discord.Interaction):
+        gangs, matrix = await self.bot.db.rivalry.matrix(interaction.guild_id)
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(["wins of row vs column"] + [gang.name for gang in gangs])
+        for gang, row in zip(gangs, matrix):
+            writer.writerow([gang.name] + row)
+        file = discord.File(io.BytesIO(buffer.getvalue().encode()), filename="rivalries.csv")
+        await interaction.response.send_message(f"Head-to-head matrix for {len(gangs)} gangs.", file=file, ephemeral=True)
 
 async def setup(bot: bot.client):
-    await bot.add_cog(Wars(bot))
+    await bot.add_cog(Wars(bot))
\ No newline at end of file
@@ -0,0 +1,130 @@
+from typing import Any, AsyncIterator, Callable
+
+from db.executor import DBExecutor
+from db.sqldb import STREAM_CHUNK, DuelRow, Gang, ScorekeeperDB
+
+class AsyncOps:
+    """
+    Awaitable view over a `ScorekeeperDB` operations group (e.g. `GangOps`).
+
+    Every callable attribute of the wrapped group is exposed as a coroutine function
+    that runs the original method on the database executor.
+    """
+    def __init__(self, executor: DBExecutor, ops: Any):
+        self._executor = executor
+        self._ops = ops
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._ops, name)
+        if not callable(attr):
+            return attr
+        executor = self._executor
+
+        async def call(*args, **kwargs):
+            return await executor.run(attr, *args, **kwargs)
+
+        call.__name__ = name
+        call.__doc__ = attr.__doc__
+        return call
+
+class AsyncGangOps(AsyncOps):
+    """
+    `AsyncOps` over `GangOps` whose lookups skip the executor.
+
+    Once the gang registry is loaded, lookups by name or ID are dictionary reads, so they
+    are answered on the event loop (like name autocomplete) instead of queueing behind
+    writes. Only a registry that is not loaded yet sends them to the database.
+    """
+    async def _lookup(self, name: str, *args) -> Any:
+        method = getattr(self._ops, name)
+        if self._ops.registry.loaded:
+            return method(*args)
+        return await self._executor.run(method, *args)
+
+    async def get_by_id(self, guild_id: int, gang_id: int) -> Gang:
+        return await self._lookup("get_by_id", guild_id, gang_id)
+
+    async def get_by_name(self, guild_id: int, name: str) -> Gang:
+        return await self._lookup("get_by_name", guild_id, name)
+
+    async def get_many_by_name(self, guild_id: int, names: list[str]) -> dict[str, Gang]:
+        return await self._lookup("get_many_by_name", guild_id, names)
+
+    async def get_all(self, guild_id: int) -> list[Gang]:
+        return await self._lookup("get_all", guild_id)
+
+class AsyncScorekeeperDB:
+    """
+    Non-blocking front end for `ScorekeeperDB`.
+
+    All queries run on a dedicated executor thread so the event loop stays responsive.
+    Usage mirrors the synchronous API: `await db.duel.create(...)`.
+
+    Attributes:
+        sync (ScorekeeperDB): The wrapped synchronous database.
+        executor (DBExecutor): The executor the queries run on.
+        gang (AsyncGangOps): Awaitable `GangOps`, with lookups served from the registry.
+        duel (AsyncOps): Awaitable `DuelOps`.
+        standing (AsyncOps): Awaitable `StandingOps`.
+        rating (AsyncOps): Awaitable `RatingOps`.
+        rivalry (AsyncOps): Awaitable `RivalryOps`.
+        scoreboard (AsyncOps): Awaitable `ScoreboardOps`.
+        journal (AsyncOps): Awaitable `JournalOps`.
+        season (AsyncOps): Awaitable `SeasonOps`.
+    """
+    def __init__(self, db: ScorekeeperDB | None = None, workers: int = 1, max_queue: int = 256):
+        self.sync = db if db is not None else ScorekeeperDB()
+        # Each worker thread holds one long-lived connection for its whole lifetime.
+        self.executor = DBExecutor(workers=workers, max_queue=max_queue,
+                                   initializer=self.sync.connect, finalizer=self.sync.disconnect)
+        self.gang = AsyncGangOps(self.executor, self.sync.gang)
+        self.duel = AsyncOps(self.executor, self.sync.duel)
+        self.standing = AsyncOps(self.executor, self.sync.standing)
+        self.rating = AsyncOps(self.executor, self.sync.rating)
+        self.rivalry = AsyncOps(self.executor, self.sync.rivalry)
+        self.scoreboard = AsyncOps(self.executor, self.sync.scoreboard)
+        self.journal = AsyncOps(self.executor, self.sync.journal)
+        self.season = AsyncOps(self.executor, self.sync.season)
+
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run an arbitrary blocking callable on the database executor."""
+        return await self.executor.run(fn, *args, **kwargs)
+
+    async def iter_duels(self, guild_id: int, gang: Gang | None = None, chunk_size: int = STREAM_CHUNK) -> AsyncIterator[DuelRow]:
+        """
+        Stream a guild's duels (or one of its gangs') in ID order without loading them all.
+
+        Each chunk is read with one `DuelOps.page` call on the executor, so other queries
+        interleave between chunks and memory stays bounded by `chunk_size` rows.
+        """
+        after_id = 0
+        while True:
+            rows = await self.executor.run(self.sync.duel.page, guild_id, after_id, chunk_size, gang)
+            for row in rows:
+                yield row
+            if len(rows) < chunk_size:
+                return
+            after_id = rows[-1].id
+
+    async def initialize_db(self):
+        """Start the executor and initialize the database on it."""
+        self.executor.start()
+        await self.executor.run(self.sync.initialize_db)
+
+    async def close_db(self):
+        """Checkpoint the WAL, then stop the executor and close its connections."""
+        if self.executor.running:
+            await self.executor.run(self.sync.checkpoint)
+            await self.executor.shutdown()
+
+    async def flush(self, guild_id: int, vacuum: bool = False) -> tuple[int, int]:
+        """Delete a guild's gangs, duels and aggregates in one transaction, optionally VACUUMing afterwards."""
+        return await self.executor.run(self.sync.flush, guild_id, vacuum)
+
+    async def adopt_legacy(self, guild_id: int) -> tuple[int, int]:
+        """Move gangs and duels from before data was partitioned by guild into `guild_id`."""
+        return await self.executor.run(self.sync.adopt_legacy, guild_id)
+
+    def stats(self) -> dict:
+        """Return the executor's queue depth and wait time statistics."""
+        return self.executor.stats()
@@ -0,0 +1,92 @@
+"""
+Online backup of the scorekeeper database with SQLite's incremental backup API.
+
+The copy is made `pages` pages per step on its own connection and thread, sleeping
+between steps, so the bot keeps reading and writing throughout. A step only holds a
+read lock on the source for as long as it takes to copy its pages.
+
+Usage (from `src/`, next to the bot's database):
+    python -m db.backup TARGET [--database scorekeeper.sqldb] [--pages 256] [--sleep 0.01]
+"""
+import argparse
+import json
+import os
+import sqlite3
+import time
+
+BACKUP_PAGES = 256
+BACKUP_SLEEP = 0.01
+MAX_RESTARTS = 3
+
+class BackupRestarted(Exception):
+    """The source changed under the backup too often for a stepped copy to finish."""
+
+def online_backup(source: str, target: str, pages: int = BACKUP_PAGES, sleep: float = BACKUP_SLEEP, max_restarts: int = MAX_RESTARTS) -> dict:
+    """
+    Copy the database at `source` to `target` while it stays in use. Blocking; run it on a worker thread.
+
+    SQLite restarts a backup from the first page when another connection writes to the
+    source between steps. After `max_restarts` restarts the remaining attempt copies
+    everything in a single step instead; in WAL mode that step still does not block
+    writers, it only holds one read transaction until it is done.
+
+    Args:
+        source (str): The path of the live database.
+        target (str): The backup file to write. It is replaced if it exists.
+        pages (int): Pages copied per step.
+        sleep (float): Seconds to pause between steps.
+        max_restarts (int): Restarts tolerated before falling back to a single step.
+    Returns:
+        dict: The target, its size, pages, steps, restarts and the time taken.
+    """
+    start = time.perf_counter()
+    partial = f"{target}.partial"
+    state = {"steps": 0, "restarts": 0, "remaining": None, "total": 0}
+
+    def progress(status: int, remaining: int, total: int):
+        state["steps"] += 1
+        state["total"] = total
+        if state["remaining"] is not None and remaining > state["remaining"]:
+            state["restarts"] += 1
+            if state["restarts"] > max_restarts:
+                raise BackupRestarted()
+        state["remaining"] = remaining
+        # sqlite3's own `sleep` only applies to busy retries; pause between steps here.
+        if remaining:
+            time.sleep(sleep)
+
+    source_db = sqlite3.connect(source)
+    try:
+        for step_pages in (pages, -1):
+            if os.path.exists(partial):
+                os.remove(partial)
+            target_db = sqlite3.connect(partial)
+            try:
+                source_db.backup(target_db, pages=step_pages, progress=progress, sleep=sleep)
+                break
+            except BackupRestarted:
+                state["remaining"] = None
+            finally:
+                target_db.close()
+    finally:
+        source_db.close()
+    os.replace(partial, target)
+    return {
+        "target": target,
+        "bytes": os.path.getsize(target),
+        "pages": state["total"],
+        "steps": state["steps"],
+        "restarts": state["restarts"],
+        "seconds": time.perf_counter() - start,
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("target")
+    parser.add_argument("--database", default="scorekeeper.sqldb")
+    parser.add_argument("--pages", type=int, default=BACKUP_PAGES)
+    parser.add_argument("--sleep", type=float, default=BACKUP_SLEEP)
+    args = parser.parse_args()
+    result = online_backup(args.database, args.target, args.pages, args.sleep)
+    result["seconds"] = round(result["seconds"], 3)
+    print(json.dumps(result, indent=4))
@@ -0,0 +1,165 @@
+import asyncio
+import queue
+import threading
+import time
+
+from collections import deque
+from typing import Any, Callable, Optional
+
+class DBExecutor:
+    """
+    Runs blocking database calls on dedicated worker threads.
+
+    Jobs are submitted from the event loop and resolved back onto it, so peewee queries
+    and SQLite fsyncs never run on the discord.py loop. The queue is bounded: once
+    `max_queue` jobs are pending, further submitters wait (asynchronously) for a slot.
+
+    One worker is the default: SQLite commits one write at a time anyway, and a single
+    thread keeps every job in submission order. More workers only let reads run beside
+    a write. A slot is held until the job's result is back on the loop, so a burst of
+    commands waits on the event loop without buffering unbounded work in memory.
+
+    Attributes:
+        workers (int): The number of worker threads.
+        max_queue (int): The maximum number of jobs pending or running at once.
+    """
+    def __init__(self, workers: int = 1, max_queue: int = 256, name: str = "scorekeeper-db",
+                 initializer: Optional[Callable[[], Any]] = None, finalizer: Optional[Callable[[], Any]] = None):
+        if workers < 1:
+            raise ValueError("DBExecutor needs at least one worker.")
+        if max_queue < 1:
+            raise ValueError("DBExecutor queue size must be positive.")
+        self.workers = workers
+        self.max_queue = max_queue
+        self.name = name
+        self._initializer = initializer
+        self._finalizer = finalizer
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._threads: list[threading.Thread] = []
+        self._stats_lock = threading.Lock()
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._peak_depth = 0
+        self._waits: deque[float] = deque(maxlen=1024)
+        self._runs: deque[float] = deque(maxlen=1024)
+        self._max_wait = 0.0
+
+    @property
+    def running(self) -> bool:
+        """Whether the worker threads have been started and not shut down."""
+        return bool(self._threads)
+
+    def start(self):
+        """Start the worker threads. Calling this on a running executor does nothing."""
+        if self._threads:
+            return
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._worker, name=f"{self.name}-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run `fn(*args, **kwargs)` on a worker thread and await its result.
+
+        Exceptions raised by `fn` are re-raised in the awaiting coroutine.
+        """
+        if not self._threads:
+            self.start()
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_queue)
+        await self._slots.acquire()
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        with self._stats_lock:
+            self._submitted += 1
+        # A slot is held, so the queue has room and put_nowait cannot raise queue.Full.
+        self._queue.put_nowait((fn, args, kwargs, future, loop, time.perf_counter()))
+        depth = self._queue.qsize()
+        if depth > self._peak_depth:
+            self._peak_depth = depth
+        return await future
+
+    def _worker(self):
+        if self._initializer is not None:
+            self._initializer()
+        try:
+            while True:
+                job = self._queue.get()
+                if job is None:
+                    break
+                fn, args, kwargs, future, loop, enqueued = job
+                started = time.perf_counter()
+                result, error = None, None
+                try:
+                    result = fn(*args, **kwargs)
+                except BaseException as e:
+                    error = e
+                finished = time.perf_counter()
+                with self._stats_lock:
+                    wait = started - enqueued
+                    self._waits.append(wait)
+                    self._runs.append(finished - started)
+                    self._max_wait = max(self._max_wait, wait)
+                    if error is None:
+                        self._completed += 1
+                    else:
+                        self._failed += 1
+                try:
+                    loop.call_soon_threadsafe(self._resolve, future, result, error)
+                except RuntimeError:
+                    pass  # The loop is closed, nobody is waiting any more.
+        finally:
+            if self._finalizer is not None:
+                self._finalizer()
+
+    def _resolve(self, future: asyncio.Future, result: Any, error: Optional[BaseException]):
+        if self._slots is not None:
+            self._slots.release()
+        if future.cancelled():
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    async def shutdown(self):
+        """Drain the queue, stop the worker threads and wait for them to exit."""
+        threads, self._threads = self._threads, []
+        for _ in threads:
+            await asyncio.to_thread(self._queue.put, None)
+        for thread in threads:
+            await asyncio.to_thread(thread.join)
+
+    def stats(self) -> dict:
+        """
+        Return a snapshot of the executor's queue and timing statistics.
+
+        Returns:
+            dict: Queue depth, job counters, and wait/run times in milliseconds.
+        """
+        with self._stats_lock:
+            waits = sorted(self._waits)
+            runs = sorted(self._runs)
+            return {
+                "workers": self.workers,
+                "queue_depth": self._queue.qsize(),
+                "peak_queue_depth": self._peak_depth,
+                "max_queue": self.max_queue,
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "failed": self._failed,
+                "wait_ms_p50": _percentile(waits, 0.50) * 1000,
+                "wait_ms_p99": _percentile(waits, 0.99) * 1000,
+                "wait_ms_max": self._max_wait * 1000,
+                "run_ms_p50": _percentile(runs, 0.50) * 1000,
+                "run_ms_p99": _percentile(runs, 0.99) * 1000,
+            }
+
+def _percentile(sorted_values: list[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
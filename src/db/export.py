@@ -0,0 +1,127 @@
+"""
+Streaming export of a guild's gangs and duels as gzip-compressed CSV or JSONL.
+
+Duels are read in keyset pages (`DuelOps.page`) and compressed as they arrive, so memory
+stays bounded by one page however many duels a guild has.
+
+Usage (from `src/`, next to the bot's database):
+    python -m db.export GUILD_ID [--format csv|jsonl] [--output DIR] [--database scorekeeper.sqldb]
+"""
+import argparse
+import asyncio
+import csv
+import gzip
+import io
+import json
+import os
+import time
+
+from datetime import datetime
+from typing import BinaryIO, Iterable
+
+from db.async_db import AsyncScorekeeperDB
+from db.sqldb import STREAM_CHUNK, DuelRow, ScorekeeperDB
+
+FORMATS = ("csv", "jsonl")
+GANG_COLUMNS = ("id", "guild_id", "name")
+DUEL_COLUMNS = DuelRow._fields
+
+def _value(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+class ExportWriter:
+    """
+    Writes one table as gzip-compressed CSV (with a header row) or JSON Lines.
+
+    Args:
+        fp (BinaryIO): The binary file the compressed output is written to.
+        fmt (str): "csv" or "jsonl".
+        columns (tuple[str, ...]): The column names, in row order.
+    """
+    def __init__(self, fp: BinaryIO, fmt: str, columns: tuple[str, ...]):
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown export format '{fmt}', expected one of: {', '.join(FORMATS)}.")
+        self.fmt = fmt
+        self.columns = columns
+        self.rows = 0
+        self._text = io.TextIOWrapper(gzip.GzipFile(fileobj=fp, mode="wb"), encoding="utf-8", newline="")
+        self._csv = csv.writer(self._text) if fmt == "csv" else None
+        if self._csv is not None:
+            self._csv.writerow(columns)
+
+    def write(self, rows: Iterable[tuple]):
+        """Append rows, each ordered like `columns`."""
+        for row in rows:
+            values = [_value(value) for value in row]
+            if self._csv is not None:
+                self._csv.writerow(values)
+            else:
+                self._text.write(json.dumps(dict(zip(self.columns, values)), separators=(",", ":")) + "\n")
+            self.rows += 1
+
+    def close(self):
+        """Finish the gzip stream. The underlying file is left open."""
+        self._text.flush()
+        self._text.detach().close()  # type: ignore
+
+def export_paths(directory: str, guild_id: int, fmt: str) -> dict[str, str]:
+    """The file each table of a guild's export is written to."""
+    return {table: os.path.join(directory, f"{table}-{guild_id}.{fmt}.gz") for table in ("gangs", "duels")}
+
+async def export_guild(db: AsyncScorekeeperDB, guild_id: int, directory: str, fmt: str = "csv", chunk_size: int = STREAM_CHUNK) -> dict:
+    """
+    Export a guild's gangs and duels into `directory` without blocking the event loop.
+
+    Duels are streamed with `AsyncScorekeeperDB.iter_duels`, so bot queries interleave with
+    the export, and each page is compressed on a worker thread.
+
+    Returns:
+        dict: The written file per table, row counts and the time taken.
+    """
+    start = time.perf_counter()
+    paths = export_paths(directory, guild_id, fmt)
+    gangs = [(gang.id, gang.guild_id, gang.name) for gang in await db.gang.get_all(guild_id)]  # type: ignore
+    with open(paths["gangs"], "wb") as fp:
+        writer = ExportWriter(fp, fmt, GANG_COLUMNS)
+        await asyncio.to_thread(writer.write, gangs)
+        writer.close()
+    with open(paths["duels"], "wb") as fp:
+        writer = ExportWriter(fp, fmt, DUEL_COLUMNS)
+        rows = []
+        async for row in db.iter_duels(guild_id, chunk_size=chunk_size):
+            rows.append(row)
+            if len(rows) == chunk_size:
+                await asyncio.to_thread(writer.write, rows)
+                rows = []
+        await asyncio.to_thread(writer.write, rows)
+        writer.close()
+    return {"files": paths, "gangs": len(gangs), "duels": writer.rows, "seconds": time.perf_counter() - start}
+
+def export_guild_sync(db: ScorekeeperDB, guild_id: int, directory: str, fmt: str = "csv", chunk_size: int = STREAM_CHUNK) -> dict:
+    """Blocking `export_guild` for use without the bot, e.g. from the command line."""
+    start = time.perf_counter()
+    paths = export_paths(directory, guild_id, fmt)
+    with open(paths["gangs"], "wb") as fp:
+        writer = ExportWriter(fp, fmt, GANG_COLUMNS)
+        writer.write((gang.id, gang.guild_id, gang.name) for gang in db.gang.get_all(guild_id))  # type: ignore
+        writer.close()
+        gangs = writer.rows
+    with open(paths["duels"], "wb") as fp:
+        writer = ExportWriter(fp, fmt, DUEL_COLUMNS)
+        writer.write(db.duel.iter_all(guild_id, chunk_size=chunk_size))
+        writer.close()
+    return {"files": paths, "gangs": gangs, "duels": writer.rows, "seconds": time.perf_counter() - start}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("guild_id", type=int)
+    parser.add_argument("--format", choices=FORMATS, default="csv")
+    parser.add_argument("--output", default=".", help="Directory the .gz files are written to")
+    parser.add_argument("--database", default="scorekeeper.sqldb")
+    args = parser.parse_args()
+    db = ScorekeeperDB(args.database)
+    db.initialize_db()
+    result = export_guild_sync(db, args.guild_id, args.output, args.format)
+    db.disconnect()
+    result["seconds"] = round(result["seconds"], 3)
+    print(json.dumps(result, indent=4))
@@ -0,0 +1,228 @@
+import asyncio
+import logging
+import os
+import threading
+
+from db.async_db import AsyncScorekeeperDB
+from db.sqldb import Duel, sqldb
+
+JOURNAL_NAME = "live_scores"
+
+class LiveScores:
+    """
+    Write-behind accumulator for score changes to wars in progress.
+
+    `add` reads the duel and records the increment in memory; nothing is written to
+    SQLite on that path. A background task hands everything accumulated to `DuelOps.add_scores`
+    every `interval` seconds, so a hundred `+1`s to one war cost one row update, one
+    standings/rivalry adjustment and one rating replay instead of a hundred. `flush`
+    pushes the pending changes immediately, e.g. when a war is closed.
+
+    Every increment is first appended to a journal file (`<seq> <duel id> <attacking
+    delta> <defending delta>` per line) and handed to the OS before `add` returns, so a
+    crash loses nothing that was acknowledged. Each flush stores the journal sequence
+    number it covers in the same transaction as the scores; at startup, entries after
+    that checkpoint are replayed exactly once, and the journal is truncated whenever it
+    holds nothing unapplied.
+
+    A live score is the stored row plus the changes not written yet. With more than one
+    database worker a batch can commit while the row is being read, so the row is read
+    together with the journal checkpoint in one snapshot: that tells whether the batch
+    in flight is already in it, and a read that missed an earlier batch is repeated.
+
+    Attributes:
+        increments (int): Increments accepted.
+        flushes (int): Batches written to the database.
+        flushed_duels (int): Duel rows updated by those batches.
+        replayed (int): Journal entries replayed at startup.
+    """
+    def __init__(self, db: AsyncScorekeeperDB, journal_path: str, interval: float = 2.0):
+        self.db = db
+        self.journal_path = journal_path
+        self.interval = interval
+        self.logger = logging.getLogger()
+        self.increments = 0
+        self.flushes = 0
+        self.flushed_duels = 0
+        self.replayed = 0
+        self._lock = threading.Lock()
+        self._pending: dict[int, list[int]] = {}
+        self._inflight: dict[int, list[int]] = {}
+        self._seq = 0
+        # Journal checkpoint of the last committed batch, and of the batch being written.
+        self._applied = 0
+        self._inflight_seq: int | None = None
+        self._journal = None
+        self._flush_lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+
+    async def start(self):
+        """Replay the journal, open it for appending and start the flush task. Run after the database is initialized."""
+        if self._task is not None:
+            return
+        applied = await self.db.journal.seq(JOURNAL_NAME)
+        entries = await asyncio.to_thread(self._read_journal)
+        deltas: dict[int, list[int]] = {}
+        for seq, duel_id, attacking_delta, defending_delta in entries:
+            if seq > applied:
+                delta = deltas.setdefault(duel_id, [0, 0])
+                delta[0] += attacking_delta
+                delta[1] += defending_delta
+                self.replayed += 1
+        self._seq = max([applied] + [entry[0] for entry in entries])
+        # Either nothing was replayed, or the replay just stored `_seq`.
+        self._applied = self._seq
+        if self.replayed:
+            duels = await self.db.duel.add_scores({duel_id: tuple(delta) for duel_id, delta in deltas.items()}, JOURNAL_NAME, self._seq)
+            self.logger.info("Replayed %s live score changes to %s wars from %s.", self.replayed, len(duels), self.journal_path)
+        # Everything in the file is applied now; start a fresh one.
+        self._journal = open(self.journal_path, "w", encoding="utf-8")
+        self._task = asyncio.get_running_loop().create_task(self._run(), name="live-scores")
+
+    async def stop(self):
+        """Stop the flush task, write out everything pending and close the journal."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        try:
+            await self.flush()
+        finally:
+            self._journal.close()  # type: ignore
+            self._journal = None
+
+    def _read_journal(self) -> list[tuple[int, int, int, int]]:
+        entries = []
+        try:
+            with open(self.journal_path, encoding="utf-8") as journal:
+                for line in journal:
+                    try:
+                        seq, duel_id, attacking_delta, defending_delta = map(int, line.split())
+                    except ValueError:
+                        continue  # A line torn by a crash mid-write was never acknowledged.
+                    entries.append((seq, duel_id, attacking_delta, defending_delta))
+        except FileNotFoundError:
+            pass
+        return entries
+
+    def _read(self, guild_id: int, duel_id: int) -> tuple[Duel, int]:
+        # One read transaction, so the row and the checkpoint come from the same snapshot.
+        with sqldb.atomic():
+            return self.db.sync.duel.get_by_id(guild_id, duel_id), self.db.sync.journal.seq(JOURNAL_NAME)
+
+    async def add(self, guild_id: int, duel_id: int, attacking_delta: int, defending_delta: int) -> tuple[Duel, tuple[int, int]]:
+        """
+        Record a score change for a guild's duel.
+
+        Args:
+            guild_id (int): The guild the duel belongs to.
+            duel_id (int): The duel's ID.
+            attacking_delta (int): Points to add to the attacking side (negative to remove).
+            defending_delta (int): Points to add to the defending side (negative to remove).
+        Raises:
+            ValueError: If there is no such duel, or a score would drop below zero.
+        Returns:
+            tuple: The duel as stored, and its live (attacking, defending) scores including changes not written yet.
+        """
+        if self._journal is None:
+            raise RuntimeError("Live scores are not started.")
+        while True:
+            duel, applied = await self.db.run(self._read, guild_id, duel_id)
+            with self._lock:
+                scores = self._live(duel, applied)
+                if scores is None:
+                    continue  # A batch was committed after the read; read again.
+                attacking_score, defending_score = scores
+                if attacking_score + attacking_delta < 0 or defending_score + defending_delta < 0:
+                    raise ValueError("Scores cannot be negative.")
+                self._seq += 1
+                self._journal.write(f"{self._seq} {duel.id} {attacking_delta} {defending_delta}\n")
+                self._journal.flush()
+                delta = self._pending.setdefault(duel.id, [0, 0])  # type: ignore
+                delta[0] += attacking_delta
+                delta[1] += defending_delta
+                self.increments += 1
+                return duel, (attacking_score + attacking_delta, defending_score + defending_delta)
+
+    def _live(self, duel: Duel, applied: int) -> tuple[int, int] | None:
+        """The live scores of a duel read at journal checkpoint `applied`, None if that read is out of date."""
+        if applied == self._applied:
+            changes = (self._inflight, self._pending)
+        elif applied == self._inflight_seq:
+            # The batch in flight committed before the read but is not cleared yet: the row has it.
+            changes = (self._pending,)
+        else:
+            return None
+        attacking_score, defending_score = duel.attacking_score, duel.defending_score
+        for deltas in changes:
+            delta = deltas.get(duel.id)  # type: ignore
+            if delta is not None:
+                attacking_score += delta[0]
+                defending_score += delta[1]
+        return attacking_score, defending_score  # type: ignore
+
+    async def flush(self) -> int:
+        """
+        Write every pending change to the database now.
+
+        Returns:
+            int: The number of duels whose scores changed.
+        """
+        async with self._flush_lock:
+            with self._lock:
+                if not self._pending:
+                    return 0
+                self._inflight, self._pending = self._pending, {}
+                seq = self._inflight_seq = self._seq
+            try:
+                await asyncio.to_thread(os.fsync, self._journal.fileno())  # type: ignore
+                duels = await self.db.duel.add_scores({duel_id: tuple(delta) for duel_id, delta in self._inflight.items()}, JOURNAL_NAME, seq)
+            except Exception:
+                # Keep the changes for the next attempt; the journal still holds them.
+                with self._lock:
+                    for duel_id, delta in self._inflight.items():
+                        pending = self._pending.setdefault(duel_id, [0, 0])
+                        pending[0] += delta[0]
+                        pending[1] += delta[1]
+                    self._inflight = {}
+                    self._inflight_seq = None
+                raise
+            with self._lock:
+                self._inflight = {}
+                self._applied = seq
+                self._inflight_seq = None
+                self.flushes += 1
+                self.flushed_duels += len(duels)
+                if self._seq == seq:
+                    # Nothing was added while writing, so the journal holds only applied entries.
+                    self._journal.seek(0)  # type: ignore
+                    self._journal.truncate()  # type: ignore
+            return len(duels)
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                self.logger.warning("Could not write live scores: %s", e)
+
+    def stats(self) -> dict:
+        """
+        Return the accumulator's counters.
+
+        Returns:
+            dict: Increments accepted, duels with pending changes, flushes, duels written and entries replayed.
+        """
+        with self._lock:
+            return {
+                "increments": self.increments,
+                "pending": len(self._pending),
+                "flushes": self.flushes,
+                "flushed_duels": self.flushed_duels,
+                "replayed": self.replayed,
+            }
@@ -0,0 +1,69 @@
+from peewee import Database, DateTimeField, IntegerField
+from playhouse.migrate import SqliteMigrator, migrate
+
+def add_missing_columns(database: Database, table: str, columns: dict[str, object]) -> list[str]:
+    """
+    Add any of `columns` (name -> peewee field) that `table` does not have yet.
+
+    Does nothing if the table does not exist; `create_tables` will create it with
+    every column.
+
+    Returns:
+        list[str]: The names of the columns that were added.
+    """
+    if not database.table_exists(table):
+        return []
+    existing = {column.name for column in database.get_columns(table)}
+    missing = [name for name in columns if name not in existing]
+    if missing:
+        migrator = SqliteMigrator(database)
+        with database.atomic():
+            migrate(*(migrator.add_column(table, name, columns[name]) for name in missing))
+    return missing
+
+def drop_indexes(database: Database, table: str, names: list[str]) -> list[str]:
+    """
+    Drop any of the named indexes that still exist on `table`.
+
+    Returns:
+        list[str]: The names of the indexes that were dropped.
+    """
+    if not database.table_exists(table):
+        return []
+    existing = {index.name for index in database.get_indexes(table)}
+    dropped = [name for name in names if name in existing]
+    if dropped:
+        migrator = SqliteMigrator(database)
+        with database.atomic():
+            migrate(*(migrator.drop_index(table, name) for name in dropped))
+    return dropped
+
+def upgrade(database: Database) -> list[str]:
+    """
+    Bring an existing scorekeeper database up to the current schema.
+
+    Runs before `create_tables`, which then adds any new tables and indexes. Every
+    step checks the live schema first, so running this on an up-to-date file is a no-op.
+
+    Returns:
+        list[str]: A description of every change that was made.
+    """
+    changes = []
+    # Duels recorded before timestamps existed keep NULL: their time is unknown.
+    for column in add_missing_columns(database, "duel", {
+        "created_at": DateTimeField(null=True),
+        "updated_at": DateTimeField(null=True),
+    }):
+        changes.append(f"duel.{column}")
+    # Gangs and duels from before data was partitioned by guild land in guild 0 until adopted.
+    for table in ("gang", "duel"):
+        for column in add_missing_columns(database, table, {"guild_id": IntegerField(default=0)}):
+            changes.append(f"{table}.{column}")
+    # Gang names became unique per guild, and duel lookups lead with the guild.
+    for table, index in (("gang", "gang_name"), ("duel", "duel_created_at_id")):
+        for name in drop_indexes(database, table, [index]):
+            changes.append(f"-{name}")
+    # Leaderboards became per guild: they sort a guild's few gangs, so a global ordering index only slows writes.
+    for name in drop_indexes(database, "gangstanding", ["gangstanding_wins_draws_points_for"]):
+        changes.append(f"-{name}")
+    return changes
@@ -0,0 +1,93 @@
+import math
+
+from array import array
+from typing import Iterable
+
+INITIAL_RATING = 1500.0
+K_FACTOR = 32.0
+LN10_OVER_400 = math.log(10.0) / 400.0
+
+def expected_score(rating: float, opponent: float) -> float:
+    """The Elo expected score of a gang rated `rating` against one rated `opponent`."""
+    return 1.0 / (1.0 + 10.0 ** ((opponent - rating) / 400.0))
+
+def duel_result(attacking_score: int, defending_score: int) -> float:
+    """The attacker's Elo result: 1 for a win, 0.5 for a draw, 0 for a loss."""
+    if attacking_score > defending_score:
+        return 1.0
+    if attacking_score < defending_score:
+        return 0.0
+    return 0.5
+
+def rate(attacker: float, defender: float, attacking_score: int, defending_score: int, k: float = K_FACTOR) -> tuple[float, float]:
+    """
+    Apply one duel to a pair of ratings.
+
+    Returns:
+        tuple: The new (attacker, defender) ratings.
+    """
+    delta = k * (duel_result(attacking_score, defending_score) - expected_score(attacker, defender))
+    return attacker + delta, defender - delta
+
+def unrate(attacker: float, defender: float, attacking_score: int, defending_score: int, k: float = K_FACTOR) -> tuple[float, float]:
+    """
+    Undo one duel: the ratings a pair had before `rate` turned them into `attacker` and `defender`.
+
+    A duel keeps the pair's sum and moves their gap x to x + 2k * (result - expected(x)).
+    That is strictly increasing in x (its slope is at least 1 - k * ln(10) / 800), so the
+    gap before the duel is found with a few Newton steps.
+
+    Returns:
+        tuple: The (attacker, defender) ratings before the duel.
+    """
+    total = attacker + defender
+    target = attacker - defender - 2.0 * k * duel_result(attacking_score, defending_score)
+    gap = attacker - defender
+    for _ in range(50):
+        expected = 1.0 / (1.0 + 10.0 ** (-gap / 400.0))
+        step = (gap - 2.0 * k * expected - target) / (1.0 - 2.0 * k * LN10_OVER_400 * expected * (1.0 - expected))
+        gap -= step
+        if abs(step) < 1e-12:
+            break
+    return (total + gap) / 2.0, (total - gap) / 2.0
+
+def replay(results: Iterable[tuple[int, int, int, int]], k: float = K_FACTOR) -> dict[int, tuple[float, int]]:
+    """
+    Compute every gang's rating from scratch by replaying duels in order.
+
+    Ratings and game counts live in flat arrays indexed by a dense per-gang slot, so the
+    loop does no per-duel allocation or dict churn beyond the id -> slot lookup.
+
+    Args:
+        results (Iterable): (attacking gang ID, attacking score, defending gang ID, defending score),
+            in chronological order.
+    Returns:
+        dict: Gang ID to (rating, games played), for every gang that played.
+    """
+    slots: dict[int, int] = {}
+    ratings = array("d")
+    games = array("q")
+    for attacking_id, attacking_score, defending_id, defending_score in results:
+        a = slots.get(attacking_id)
+        if a is None:
+            a = slots[attacking_id] = len(ratings)
+            ratings.append(INITIAL_RATING)
+            games.append(0)
+        d = slots.get(defending_id)
+        if d is None:
+            d = slots[defending_id] = len(ratings)
+            ratings.append(INITIAL_RATING)
+            games.append(0)
+        if attacking_score > defending_score:
+            result = 1.0
+        elif attacking_score < defending_score:
+            result = 0.0
+        else:
+            result = 0.5
+        # Inlined `rate()`: this loop runs once per duel in the database.
+        delta = k * (result - 1.0 / (1.0 + 10.0 ** ((ratings[d] - ratings[a]) / 400.0)))
+        ratings[a] += delta
+        ratings[d] -= delta
+        games[a] += 1
+        games[d] += 1
+    return {gang_id: (ratings[slot], games[slot]) for gang_id, slot in slots.items()}
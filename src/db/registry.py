@@ -0,0 +1,179 @@
+import bisect
+import threading
+
+from typing import Iterable, Optional
+
+def normalize_name(name: str) -> str:
+    """Normalize a gang name for case-insensitive lookups."""
+    return name.strip().casefold()
+
+class PrefixIndex:
+    """
+    Sorted array of (normalized name, display name) pairs for prefix completion.
+
+    Lookups are two binary searches plus a slice, so they stay in the microsecond range
+    with thousands of names. Inserts and removals keep the array sorted in place.
+    """
+    def __init__(self):
+        self._entries: list[tuple[str, str]] = []
+
+    def load(self, names: Iterable[str]):
+        """Replace the index contents with `names`."""
+        self._entries = sorted((normalize_name(name), name) for name in names)
+
+    def add(self, name: str):
+        """Add a name to the index."""
+        bisect.insort(self._entries, (normalize_name(name), name))
+
+    def remove(self, name: str):
+        """Remove a name from the index if it is present."""
+        entry = (normalize_name(name), name)
+        i = bisect.bisect_left(self._entries, entry)
+        if i < len(self._entries) and self._entries[i] == entry:
+            del self._entries[i]
+
+    def complete(self, prefix: str, limit: int = 25) -> list[str]:
+        """Return up to `limit` display names starting with `prefix` (case-insensitive), in order."""
+        key = normalize_name(prefix)
+        start = bisect.bisect_left(self._entries, (key,))
+        names = []
+        for normalized, name in self._entries[start:start + limit]:
+            if not normalized.startswith(key):
+                break
+            names.append(name)
+        return names
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+class GangRegistry:
+    """
+    In-process, write-through index of every gang, partitioned by guild.
+
+    Holds a global id -> Gang map (IDs are unique across guilds) and, per guild, a
+    normalized name -> Gang map and a prefix index. Lookups touch only their guild's
+    maps, so they cost the same with one guild or thousands. Once loaded it is
+    authoritative: `GangOps` keeps it in sync on every write, so lookups never need
+    SQLite.
+
+    Attributes:
+        loaded (bool): Whether the registry holds the full gang table.
+        hits (int): Lookups answered with a gang.
+        misses (int): Lookups for a gang that is not registered.
+    """
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._by_id: dict[int, object] = {}
+        self._by_name: dict[int, dict[str, object]] = {}
+        self._prefix: dict[int, PrefixIndex] = {}
+        self.loaded = False
+        self.hits = 0
+        self.misses = 0
+
+    def load(self, gangs: Iterable[object]):
+        """Replace the registry contents with `gangs` and mark it as loaded."""
+        with self._lock:
+            self._by_id = {gang.id: gang for gang in gangs}  # type: ignore
+            self._by_name = {}
+            for gang in self._by_id.values():
+                self._by_name.setdefault(gang.guild_id, {})[normalize_name(gang.name)] = gang  # type: ignore
+            self._prefix = {}
+            for guild_id, names in self._by_name.items():
+                self._prefix[guild_id] = PrefixIndex()
+                self._prefix[guild_id].load(gang.name for gang in names.values())  # type: ignore
+            self.loaded = True
+
+    def clear(self):
+        """Drop every entry and mark the registry as not loaded."""
+        with self._lock:
+            self._by_id.clear()
+            self._by_name.clear()
+            self._prefix.clear()
+            self.loaded = False
+
+    def put(self, gang: object):
+        """Insert or replace a gang."""
+        with self._lock:
+            guild_id = gang.guild_id  # type: ignore
+            names = self._by_name.setdefault(guild_id, {})
+            prefix = self._prefix.setdefault(guild_id, PrefixIndex())
+            key = normalize_name(gang.name)  # type: ignore
+            previous = names.get(key)
+            if previous is not None:
+                prefix.remove(previous.name)  # type: ignore
+            self._by_id[gang.id] = gang  # type: ignore
+            names[key] = gang
+            prefix.add(gang.name)  # type: ignore
+
+    def rename(self, gang: object, old_name: str):
+        """Move a gang from `old_name` to its current name."""
+        with self._lock:
+            names = self._by_name.get(gang.guild_id, {})  # type: ignore
+            key = normalize_name(old_name)
+            current = names.get(key)
+            if current is not None and current.id == gang.id:  # type: ignore
+                del names[key]
+                self._prefix[gang.guild_id].remove(old_name)  # type: ignore
+            self.put(gang)
+
+    def remove(self, gang: object):
+        """Remove a gang."""
+        with self._lock:
+            self._by_id.pop(gang.id, None)  # type: ignore
+            names = self._by_name.get(gang.guild_id, {})  # type: ignore
+            key = normalize_name(gang.name)  # type: ignore
+            current = names.get(key)
+            if current is not None and current.id == gang.id:  # type: ignore
+                del names[key]
+                self._prefix[gang.guild_id].remove(current.name)  # type: ignore
+
+    def get_by_id(self, gang_id: int) -> Optional[object]:
+        """Return the gang with `gang_id`, in any guild, or None."""
+        with self._lock:
+            return self._count(self._by_id.get(gang_id))
+
+    def get_by_name(self, guild_id: int, name: str) -> Optional[object]:
+        """Return the guild's gang whose name matches `name` case-insensitively, or None."""
+        with self._lock:
+            return self._count(self._by_name.get(guild_id, {}).get(normalize_name(name)))
+
+    def has_name(self, guild_id: int, name: str) -> bool:
+        """Whether the guild has a gang with this name (case-insensitive). Not counted."""
+        with self._lock:
+            return normalize_name(name) in self._by_name.get(guild_id, {})
+
+    def complete(self, guild_id: int, prefix: str, limit: int = 25) -> list[str]:
+        """Return up to `limit` of the guild's gang names starting with `prefix` (case-insensitive). Not counted."""
+        with self._lock:
+            index = self._prefix.get(guild_id)
+            return index.complete(prefix, limit) if index is not None else []
+
+    def all(self, guild_id: int) -> list[object]:
+        """Return every gang registered in the guild, ordered by ID."""
+        with self._lock:
+            return sorted(self._by_name.get(guild_id, {}).values(), key=lambda gang: gang.id)  # type: ignore
+
+    def _count(self, gang: Optional[object]) -> Optional[object]:
+        if gang is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return gang
+
+    def stats(self) -> dict:
+        """
+        Return the registry's size and hit/miss counters.
+
+        Returns:
+            dict: Size, guild count, load state, hits, misses and hit rate.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "loaded": self.loaded,
+                "gangs": len(self._by_id),
+                "guilds": sum(1 for names in self._by_name.values() if names),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
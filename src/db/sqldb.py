@@ -1,8 +1,54 @@
-from peewee import Model, SqliteDatabase, CharField, IntegerField, AutoField, ForeignKeyField
+from peewee import Model, SqliteDatabase, CharField, IntegerField, FloatField, DateTimeField, AutoField, ForeignKeyField, fn, Case, JOIN, SQL, Select
 import peewee
 
+from datetime import datetime, timezone
+from typing import Callable, Iterable, Iterator, NamedTuple
+
+import contextlib
+import logging
+import os
+import threading
+import time
+
+import metrics
+from db import migrations, ratings
+from db.registry import GangRegistry, normalize_name
+
+class InstrumentedSqliteDatabase(SqliteDatabase):
+    """SqliteDatabase that records every statement's execution time in `metrics.registry`."""
+    def execute_sql(self, sql, params=None, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return super().execute_sql(sql, params, *args, **kwargs)
+        finally:
+            metrics.registry.observe(metrics.QUERY_SECONDS, (metrics.statement_type(sql),), time.perf_counter() - start)
+
+logger = logging.getLogger()
+
+# Rewinding costs a few Elo updates per duel, so past this many duels a rating fix-up only
+# rewinds when the suffix is under 1/REWIND_COST of the guild's duels; otherwise it replays.
+REWIND_CHEAP = 1000
+REWIND_COST = 4
+
 # Initialize the database
-sqldb = SqliteDatabase('scorekeeper.sqldb')
+sqldb = InstrumentedSqliteDatabase('scorekeeper.sqldb')
+
+# Storage profile used when none is configured. Values are passed to SQLite as PRAGMAs
+# on every new connection.
+DEFAULT_PRAGMAS = {
+    # Readers see a snapshot and never wait for the one writer.
+    "journal_mode": "wal",
+    # In WAL mode, commits skip the fsync; a power loss can only drop the newest ones.
+    "synchronous": "normal",
+    "cache_size": -16000,  # Negative values are KiB, so ~16MB of page cache.
+    "mmap_size": 64 * 1024 * 1024,
+    "temp_store": "memory",
+    "busy_timeout": 5000,
+}
+
+def utcnow() -> datetime:
+    """The current UTC time as a naive datetime, the form timestamps are stored in."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
 
 class BaseModel(Model):
     class Meta:
@@ -10,121 +56,1561 @@ class BaseModel(Model):
 
 class Gang(BaseModel):
     id = AutoField(primary_key=True) 
-    name = CharField(unique=True)
-    
+    # The Discord guild the gang belongs to; 0 holds data from before gangs were per guild.
+    guild_id = IntegerField(default=0)
+    name = CharField()
+
+    class Meta:  # type: ignore
+        # Names are unique per guild only. Case-insensitive uniqueness is enforced by `GangOps`.
+        indexes = (
+            (('guild_id', 'name'), True),
+            (('guild_id', 'id'), False),
+        )
+
 class Duel(BaseModel):
     id = AutoField(primary_key=True)
+    # Always the guild of both gangs; stored so per-guild reads never join Gang.
+    guild_id = IntegerField(default=0)
     attacking_gang = ForeignKeyField(Gang, backref='duels_as_attacker')
     defending_gang = ForeignKeyField(Gang, backref='duels_as_defender')
     attacking_score = IntegerField(default=0)
     defending_score = IntegerField(default=0)
+    # NULL for duels recorded before timestamps were added.
+    created_at = DateTimeField(null=True, default=utcnow)
+    updated_at = DateTimeField(null=True, default=utcnow)
+
+    class Meta:  # type: ignore
+        # Duels are inserted in time order, so the second index also maps a time window to an ID range.
+        indexes = (
+            (('guild_id', 'id'), False),
+            (('guild_id', 'created_at', 'id'), False),
+        )
+
+class GangStanding(BaseModel):
+    gang = ForeignKeyField(Gang, primary_key=True, backref='standing')
+    wins = IntegerField(default=0)
+    losses = IntegerField(default=0)
+    draws = IntegerField(default=0)
+    points_for = IntegerField(default=0)
+    points_against = IntegerField(default=0)
+
+class GangRating(BaseModel):
+    gang = ForeignKeyField(Gang, primary_key=True, backref='rating')
+    rating = FloatField(default=ratings.INITIAL_RATING, index=True)
+    games = IntegerField(default=0)
+
+class Rivalry(BaseModel):
+    # Unordered gang pair, stored with the lower gang ID first.
+    gang_low = ForeignKeyField(Gang, backref='rivalries_low')
+    gang_high = ForeignKeyField(Gang, backref='rivalries_high')
+    wins_low = IntegerField(default=0)
+    wins_high = IntegerField(default=0)
+    draws = IntegerField(default=0)
+    score_low = IntegerField(default=0)
+    score_high = IntegerField(default=0)
+    duels = IntegerField(default=0)
+    last_duel_id = IntegerField(null=True)
+
+    class Meta:  # type: ignore
+        primary_key = peewee.CompositeKey('gang_low', 'gang_high')
+
+class ScoreboardMessage(BaseModel):
+    # The persistent live scoreboard message in each configured channel.
+    channel_id = IntegerField(primary_key=True)
+    message_id = IntegerField()
+
+class JournalCheckpoint(BaseModel):
+    # The last journal sequence number whose effect is committed, per append-only journal.
+    name = CharField(primary_key=True)
+    seq = IntegerField(default=0)
+
+class Season(BaseModel):
+    # A closed season of a guild. Its duels live in the `archive` file, its results in
+    # SeasonStanding and SeasonRivalry; the season in progress has no row.
+    id = AutoField(primary_key=True)
+    guild_id = IntegerField()
+    number = IntegerField()
+    # NULL when every duel of the season predates timestamps.
+    started_at = DateTimeField(null=True)
+    ended_at = DateTimeField(default=utcnow)
+    duels = IntegerField(default=0)
+    first_duel_id = IntegerField()
+    last_duel_id = IntegerField()
+    archive = CharField()
+
+    class Meta:  # type: ignore
+        indexes = (
+            (('guild_id', 'number'), True),
+        )
+
+class SeasonStanding(BaseModel):
+    # A gang's final record and Elo in a closed season. Plain IDs, not foreign keys: the
+    # summary outlives the gang.
+    season = ForeignKeyField(Season, backref='standings')
+    gang_id = IntegerField()
+    # The gang's name when the season closed.
+    name = CharField()
+    wins = IntegerField(default=0)
+    losses = IntegerField(default=0)
+    draws = IntegerField(default=0)
+    points_for = IntegerField(default=0)
+    points_against = IntegerField(default=0)
+    rating = FloatField(default=ratings.INITIAL_RATING)
+    games = IntegerField(default=0)
+
+    class Meta:  # type: ignore
+        primary_key = peewee.CompositeKey('season', 'gang_id')
+        indexes = (
+            (('season', 'wins', 'draws', 'points_for'), False),
+        )
+
+    @property
+    def gang(self) -> Gang:
+        """The gang as it was named in the season, so summaries render like live standings."""
+        return Gang(id=self.gang_id, name=self.name)
+
+class SeasonRivalry(BaseModel):
+    # A gang pair's head-to-head record in a closed season, lower gang ID first like `Rivalry`.
+    season = ForeignKeyField(Season, backref='rivalries')
+    gang_low = IntegerField()
+    gang_high = IntegerField()
+    wins_low = IntegerField(default=0)
+    wins_high = IntegerField(default=0)
+    draws = IntegerField(default=0)
+    score_low = IntegerField(default=0)
+    score_high = IntegerField(default=0)
+    duels = IntegerField(default=0)
+    last_duel_id = IntegerField(null=True)
+
+    class Meta:  # type: ignore
+        primary_key = peewee.CompositeKey('season', 'gang_low', 'gang_high')
+
+# Schema name a season's archive file is attached under.
+ARCHIVE_SCHEMA = "archive"
+
+class ArchivedDuel(Duel):
+    # A duel of a closed season, in the archive file attached as `ARCHIVE_SCHEMA`. Only
+    # exists while an archive is attached; see `SeasonOps.attach`.
+    class Meta:  # type: ignore
+        schema = ARCHIVE_SCHEMA
+        table_name = 'duel'
+        # An archive holds one guild's season; the gang indexes from the foreign keys are enough.
+        indexes = ()
+
+RIVALRY_FIELDS = ("wins_low", "wins_high", "draws", "score_low", "score_high", "duels")
+
+STANDING_FIELDS = ("wins", "losses", "draws", "points_for", "points_against")
+
+def duel_outcome(attacking_score: int, defending_score: int) -> tuple[tuple[int, int, int, int, int], tuple[int, int, int, int, int]]:
+    """
+    Split a duel result into standing deltas for each side.
+    
+    Returns:
+        tuple: (attacker, defender) deltas, each ordered like `STANDING_FIELDS`.
+    """
+    won = int(attacking_score > defending_score)
+    lost = int(attacking_score < defending_score)
+    drawn = int(attacking_score == defending_score)
+    return (
+        (won, lost, drawn, attacking_score, defending_score),
+        (lost, won, drawn, defending_score, attacking_score),
+    )
+
+def rivalry_totals(results: Iterable[tuple[int, int, int, int, int]]) -> dict[tuple[int, int], list[int]]:
+    """
+    Sum duels per unordered gang pair.
+
+    Args:
+        results (Iterable): (duel ID, attacking gang ID, attacking score, defending gang ID, defending score) tuples.
+    Returns:
+        dict: (lower gang ID, higher gang ID) to totals ordered like `RIVALRY_FIELDS`, then the highest duel ID.
+    """
+    totals: dict[tuple[int, int], list[int]] = {}
+    for duel_id, attacking_id, attacking_score, defending_id, defending_score in results:
+        won = attacking_score > defending_score
+        lost = attacking_score < defending_score
+        drawn = int(not (won or lost))
+        if attacking_id < defending_id:
+            key, deltas = (attacking_id, defending_id), (int(won), int(lost), drawn, attacking_score, defending_score)
+        else:
+            key, deltas = (defending_id, attacking_id), (int(lost), int(won), drawn, defending_score, attacking_score)
+        current = totals.get(key)
+        if current is None:
+            totals[key] = [*deltas, 1, duel_id]
+        else:
+            for i, value in enumerate(deltas):
+                current[i] += value
+            current[5] += 1
+            current[6] = max(current[6], duel_id)
+    return totals
+
+class DuelEvent(NamedTuple):
+    """
+    A committed duel write, as passed to `DuelOps` listeners.
+
+    Attributes:
+        kind (str): "created", "updated", "deleted" or "imported".
+        guild_id (int): The guild the duel belongs to.
+        duel_id (int): The duel's ID; for imports, the first inserted ID.
+        attacking_gang_id (int): The attacker; 0 for imports.
+        attacking_score (int): The attacker's score; 0 for imports.
+        defending_gang_id (int): The defender; 0 for imports.
+        defending_score (int): The defender's score; 0 for imports.
+        count (int): How many duels the write covered.
+    """
+    kind: str
+    guild_id: int
+    duel_id: int
+    attacking_gang_id: int
+    attacking_score: int
+    defending_gang_id: int
+    defending_score: int
+    count: int = 1
+
+class DuelRow(NamedTuple):
+    """A duel as a plain tuple, for reading many duels without building a `Duel` model per row."""
+    id: int
+    guild_id: int
+    attacking_gang_id: int
+    attacking_score: int
+    defending_gang_id: int
+    defending_score: int
+    created_at: datetime | None
+    updated_at: datetime | None
+
+DUEL_ROW_FIELDS = (Duel.id, Duel.guild_id, Duel.attacking_gang, Duel.attacking_score, Duel.defending_gang, Duel.defending_score, Duel.created_at, Duel.updated_at)
+
+# Rows per query when streaming duels; bounds memory to one chunk however large the table is.
+STREAM_CHUNK = 5000
 
 class ScorekeeperDB:
-    def __init__(self):
+    def __init__(self, path: str | None = None, pragmas: dict | None = None):
         self.gang = self.GangOps(self)
         self.duel = self.DuelOps(self)
+        self.standing = self.StandingOps(self)
+        self.rating = self.RatingOps(self)
+        self.rivalry = self.RivalryOps(self)
+        self.scoreboard = self.ScoreboardOps(self)
+        self.journal = self.JournalOps(self)
+        self.season = self.SeasonOps(self)
+        # Held by whichever worker thread is writing; see `writing`.
+        self.write_lock = threading.RLock()
+        if path is not None or pragmas is not None:
+            self.configure(path or sqldb.database, pragmas)
+
+    def configure(self, path: str, pragmas: dict | None = None):
+        """
+        Point the database at `path` and set the PRAGMA profile for new connections.
+        
+        Args:
+            path (str): The path to the SQLite database file.
+            pragmas (dict | None): PRAGMA name to value. Defaults to `DEFAULT_PRAGMAS`.
+        Returns:
+            None
+        """
+        sqldb.init(path, pragmas=DEFAULT_PRAGMAS if pragmas is None else pragmas)
+
+    def connect(self):
+        """Open this thread's long-lived connection if it is not open yet."""
+        sqldb.connect(reuse_if_open=True)
+
+    def disconnect(self):
+        """Close this thread's connection if it is open."""
+        if not sqldb.is_closed():
+            sqldb.close()
+
+    @contextlib.contextmanager
+    def writing(self) -> Iterator[None]:
+        """
+        A write transaction: BEGIN IMMEDIATE, while holding `write_lock`.
+
+        With several worker connections, a deferred transaction that reads before it
+        writes fails with "database is locked" as soon as another connection commits in
+        between, and busy_timeout cannot help it. IMMEDIATE takes SQLite's write lock up
+        front, and `write_lock` queues the writers of this process in Python instead.
+        Reads still run in parallel. Nested blocks become savepoints.
+        """
+        with self.write_lock, sqldb.atomic("IMMEDIATE"):
+            yield
 
     def initialize_db(self):
         """Initialize the database and create tables if they do not exist."""
-        sqldb.connect()
-        sqldb.create_tables([Gang, Duel], safe=True)  # type: ignore
-        sqldb.close()
+        self.connect()
+        migrations.upgrade(sqldb)
+        sqldb.create_tables([Gang, Duel, GangStanding, GangRating, Rivalry, ScoreboardMessage, JournalCheckpoint, Season, SeasonStanding, SeasonRivalry], safe=True)  # type: ignore
+        self.gang.load_cache()
+        self.duel.id_floor = Season.select(fn.MAX(Season.last_duel_id)).scalar() or 0  # type: ignore
+        # Databases created before standings or ratings existed have duels but no aggregate rows.
+        if Duel.select().exists():  # type: ignore
+            if not GangStanding.select().exists():  # type: ignore
+                self.standing.rebuild()
+            if not GangRating.select().exists():  # type: ignore
+                self.rating.replay()
+            if not Rivalry.select().exists():  # type: ignore
+                self.rivalry.rebuild()
+
+    def flush(self, guild_id: int, vacuum: bool = False) -> tuple[int, int]:
+        """
+        Delete a guild's gangs, duels and aggregates, including its closed seasons' summaries, in a single transaction.
+
+        The closed seasons' archive files are deleted once it commits. Other guilds are not touched.
+
+        Args:
+            guild_id (int): The guild whose data is deleted.
+            vacuum (bool): Whether to VACUUM afterwards to return the freed pages to the OS.
+        Returns:
+            tuple: The number of gangs and duels deleted.
+        """
+        with self.writing():
+            gang_ids = self._guild_gang_ids(guild_id)
+            duels = Duel.delete().where(Duel.guild_id == guild_id).execute()  # type: ignore
+            for batch in peewee.chunked(gang_ids, 500):
+                GangStanding.delete().where(GangStanding.gang.in_(batch)).execute()  # type: ignore
+                GangRating.delete().where(GangRating.gang.in_(batch)).execute()  # type: ignore
+                # Both gangs of a pair belong to the same guild.
+                Rivalry.delete().where(Rivalry.gang_low.in_(batch)).execute()  # type: ignore
+            seasons = Season.select(Season.id).where(Season.guild_id == guild_id)
+            archives = [path for (path,) in Season.select(Season.archive).where(Season.guild_id == guild_id).tuples()]  # type: ignore
+            SeasonStanding.delete().where(SeasonStanding.season.in_(seasons)).execute()  # type: ignore
+            SeasonRivalry.delete().where(SeasonRivalry.season.in_(seasons)).execute()  # type: ignore
+            Season.delete().where(Season.guild_id == guild_id).execute()  # type: ignore
+            gangs = Gang.delete().where(Gang.guild_id == guild_id).execute()  # type: ignore
+            # `duel.id_floor` stays: other guilds' archives may need it, and war IDs are never reused anyway.
+            self.gang.load_cache()
+        self.duel.version += 1
+        for path in archives:
+            if os.path.exists(path):
+                os.remove(path)
+        if vacuum:
+            sqldb.execute_sql("VACUUM;")
+        return gangs, duels
+
+    def _guild_gang_ids(self, guild_id: int) -> set[int]:
+        """The IDs of a guild's gangs, including deleted ones its duels still refer to."""
+        gang_ids = {gang_id for (gang_id,) in Gang.select(Gang.id).where(Gang.guild_id == guild_id).tuples()}  # type: ignore
+        for field in (Duel.attacking_gang, Duel.defending_gang):
+            gang_ids.update(gang_id for (gang_id,) in Duel.select(field).distinct().where(Duel.guild_id == guild_id).tuples())  # type: ignore
+        return gang_ids
+
+    def adopt_legacy(self, guild_id: int) -> tuple[int, int]:
+        """
+        Move gangs and duels recorded before data was partitioned by guild (guild 0) into a guild.
+
+        Args:
+            guild_id (int): The guild that takes over the legacy data.
+        Raises:
+            ValueError: If a legacy gang's name is already used in the guild.
+        Returns:
+            tuple: The number of gangs and duels moved.
+        """
+        with self.write_lock:
+            legacy = {normalize_name(gang.name) for gang in self.gang.get_all(0)}  # type: ignore
+            clashes = sorted(gang.name for gang in self.gang.get_all(guild_id) if normalize_name(gang.name) in legacy)  # type: ignore
+            if clashes:
+                raise ValueError(f"These gang names already exist in the server: {', '.join(clashes[:10])}")
+            with self.writing():
+                gangs = Gang.update(guild_id=guild_id).where(Gang.guild_id == 0).execute()  # type: ignore
+                duels = Duel.update(guild_id=guild_id).where(Duel.guild_id == 0).execute()  # type: ignore
+            self.gang.load_cache()
+        self.duel.version += 1
+        return gangs, duels
+
+    def checkpoint(self):
+        """Checkpoint the write-ahead log into the main database file and truncate it."""
+        if sqldb.journal_mode.lower() == "wal":  # type: ignore
+            sqldb.execute_sql("PRAGMA wal_checkpoint(TRUNCATE);")
 
     def close_db(self):
-        """Close the database connection."""
+        """Checkpoint the WAL and close the database connection."""
         if not sqldb.is_closed():
+            self.checkpoint()
             sqldb.close()
-            print("Database connection closed.")
+            logger.info("Database connection closed.")
         else:
-            print("Database connection is already closed.")
+            logger.info("Database connection is already closed.")
 
     class GangOps:
         def __init__(self, db: 'ScorekeeperDB'):
             self.db = db
+            self.registry = GangRegistry()
+
+        def load_cache(self) -> None:
+            """Load every gang into the in-process registry."""
+            self.registry.load(Gang.select())  # type: ignore
+
+        def _name_taken(self, guild_id: int, name: str) -> bool:
+            if self.registry.loaded:
+                return self.registry.has_name(guild_id, name)
+            return Gang.select().where((Gang.guild_id == guild_id) & (fn.LOWER(Gang.name) == name.strip().lower())).exists()  # type: ignore
 
-        def create(self, name: str) -> Gang:
-            """Create a new gang with the given name."""
+        def create(self, guild_id: int, name: str) -> Gang:
+            """Create a new gang with the given name in a guild."""
             if name.strip() == "":
                 raise ValueError("Gang name cannot be empty.")
-            if Gang.select().where(Gang.name == name).exists():  # type: ignore
-                raise ValueError(f"A gang with the name '{name}' already exists.")
-            return Gang.create(name=name)  # type: ignore
+            # The unique index is case-sensitive, so the name check and the registry update
+            # must not interleave with another worker's.
+            with self.db.write_lock:
+                if self._name_taken(guild_id, name):
+                    raise ValueError(f"A gang with the name '{name}' already exists.")
+                with self.db.writing():
+                    gang = Gang.create(guild_id=guild_id, name=name)  # type: ignore
+                    GangStanding.create(gang=gang)  # type: ignore
+                self.registry.put(gang)
+            return gang  # type: ignore
+
+        def insert_many(self, guild_id: int, names: list[str]) -> list[Gang]:
+            """
+            Create many gangs in a guild in a single transaction.
+
+            Args:
+                guild_id (int): The guild the gangs belong to.
+                names (list[str]): The new gang names. Must be non-empty and unused in the guild.
+            Returns:
+                list[Gang]: The created gangs.
+            """
+            keys = [normalize_name(name) for name in names]
+            if "" in keys:
+                raise ValueError("Gang name cannot be empty.")
+            if len(set(keys)) != len(keys):
+                raise ValueError("Gang names must be unique.")
+            with self.db.write_lock:
+                for name in names:
+                    if self._name_taken(guild_id, name):
+                        raise ValueError(f"A gang with the name '{name}' already exists.")
+                with self.db.writing():
+                    for batch in peewee.chunked(names, 500):
+                        Gang.insert_many([(guild_id, name) for name in batch], fields=[Gang.guild_id, Gang.name]).execute()  # type: ignore
+                    gangs = []
+                    for batch in peewee.chunked(names, 500):
+                        gangs += list(Gang.select().where((Gang.guild_id == guild_id) & Gang.name.in_(batch)))  # type: ignore
+                    for batch in peewee.chunked(gangs, 500):
+                        GangStanding.insert_many([(gang.id,) for gang in batch], fields=[GangStanding.gang]).execute()  # type: ignore
+                for gang in gangs:
+                    self.registry.put(gang)
+            return gangs
 
         def delete(self, gang: Gang) -> None:
-            """Delete a gang from the database."""
-            gang.delete_instance()  # type: ignore
-            print(f"Gang '{gang.name}' deleted successfully.")  # type: ignore
+            """Delete a gang, its standing and its rating from the database."""
+            with self.db.write_lock:
+                with self.db.writing():
+                    GangStanding.delete().where(GangStanding.gang == gang).execute()  # type: ignore
+                    GangRating.delete().where(GangRating.gang == gang).execute()  # type: ignore
+                    gang.delete_instance()  # type: ignore
+                self.registry.remove(gang)
+            self.db.duel.version += 1
+            logger.debug("Gang %s (%s) deleted.", gang.id, gang.name)  # type: ignore
 
-        def get_by_id(self, gang_id: int) -> Gang:
-            """Retrieve a gang by its ID."""
+        def get_by_id(self, guild_id: int, gang_id: int) -> Gang:
+            """Retrieve a guild's gang by its ID."""
+            if self.registry.loaded:
+                gang = self.registry.get_by_id(gang_id)
+                if gang is None or gang.guild_id != guild_id:  # type: ignore
+                    raise ValueError(f"No gang found with ID {gang_id}.")
+                return gang  # type: ignore
             try:
-                return Gang.get(Gang.id == gang_id)  # type: ignore
+                return Gang.get((Gang.guild_id == guild_id) & (Gang.id == gang_id))  # type: ignore
             except peewee.DoesNotExist:
                 raise ValueError(f"No gang found with ID {gang_id}.")
 
-        def get_by_name(self, name: str) -> Gang:
-            """Retrieve a gang by its name."""
+        def get_by_name(self, guild_id: int, name: str) -> Gang:
+            """Retrieve a guild's gang by its name (case-insensitive)."""
+            if self.registry.loaded:
+                gang = self.registry.get_by_name(guild_id, name)
+                if gang is None:
+                    raise ValueError(f"No gang found with the name '{name}'.")
+                return gang  # type: ignore
             try:
-                return Gang.get(Gang.name == name)  # type: ignore
+                return Gang.get((Gang.guild_id == guild_id) & (fn.LOWER(Gang.name) == name.strip().lower()))  # type: ignore
             except peewee.DoesNotExist:
                 raise ValueError(f"No gang found with the name '{name}'.")
 
-        def get_all(self) -> list[Gang]:
-            """Retrieve all gangs."""
-            return list(Gang.select())  # type: ignore
+        def get_many_by_name(self, guild_id: int, names: Iterable[str]) -> dict[str, Gang]:
+            """
+            Resolve many of a guild's gang names at once (case-insensitive).
+
+            Returns:
+                dict: Normalized name to gang, for every name that exists.
+            """
+            keys = {normalize_name(name) for name in names}
+            if self.registry.loaded:
+                found = {key: self.registry.get_by_name(guild_id, key) for key in keys}
+                return {key: gang for key, gang in found.items() if gang is not None}  # type: ignore
+            gangs = {}
+            for batch in peewee.chunked(keys, 500):
+                for gang in Gang.select().where((Gang.guild_id == guild_id) & fn.LOWER(Gang.name).in_(batch)):  # type: ignore
+                    gangs[normalize_name(gang.name)] = gang  # type: ignore
+            return gangs
+
+        def get_all(self, guild_id: int) -> list[Gang]:
+            """Retrieve all of a guild's gangs, ordered by ID."""
+            if self.registry.loaded:
+                return self.registry.all(guild_id)  # type: ignore
+            return list(Gang.select().where(Gang.guild_id == guild_id).order_by(Gang.id))  # type: ignore
 
         def update_name(self, gang: Gang, new_name: str) -> Gang:
             """Update the name of a gang."""
             if new_name.strip() == "":
                 raise ValueError("Gang name cannot be empty.")
-            if Gang.select().where(Gang.name == new_name).exists():  # type: ignore
-                raise ValueError(f"A gang with the name '{new_name}' already exists.")
-            gang.name = new_name  # type: ignore
-            gang.save()  # type: ignore
+            with self.db.write_lock:
+                # Changing only the case of a gang's own name is allowed.
+                if normalize_name(new_name) != normalize_name(gang.name) and self._name_taken(gang.guild_id, new_name):  # type: ignore
+                    raise ValueError(f"A gang with the name '{new_name}' already exists.")
+                # The gang is the registry's shared instance: it only takes the new name once the write commits.
+                with self.db.writing():
+                    Gang.update(name=new_name).where(Gang.id == gang.id).execute()  # type: ignore
+                old_name = gang.name
+                gang.name = new_name  # type: ignore
+                self.registry.rename(gang, old_name)  # type: ignore
+            self.db.duel.version += 1
             return gang  # type: ignore
 
     class DuelOps:
         def __init__(self, db: 'ScorekeeperDB'):
             self.db = db
+            self.listeners: list[Callable[[DuelEvent], None]] = []
+            # Bumped after every committed write that can change the standings, so readers
+            # can tell whether anything changed without querying.
+            self.version = 0
+            # The highest ID of any archived duel. New duels get larger IDs, so a war ID
+            # never names two duels.
+            self.id_floor = 0
+
+        def add_listener(self, listener: Callable[[DuelEvent], None]) -> None:
+            """
+            Call `listener` with a `DuelEvent` after every committed duel write.
+            
+            Listeners run synchronously on the thread that made the write, so they must
+            return quickly; hand the event off (e.g. `loop.call_soon_threadsafe`) rather
+            than doing work in them.
+            """
+            self.listeners.append(listener)
+
+        def remove_listener(self, listener: Callable[[DuelEvent], None]) -> None:
+            """Stop calling `listener`. Does nothing if it was not added."""
+            if listener in self.listeners:
+                self.listeners.remove(listener)
+
+        def _notify(self, kind: str, duel: Duel) -> None:
+            self.version += 1
+            if self.listeners:
+                self._emit(DuelEvent(kind, duel.guild_id, duel.id, duel.attacking_gang_id, duel.attacking_score, duel.defending_gang_id, duel.defending_score))  # type: ignore
+
+        def _emit(self, event: DuelEvent) -> None:
+            for listener in list(self.listeners):
+                try:
+                    listener(event)
+                except Exception:
+                    # The write is already committed; a broken listener must not fail it.
+                    pass
+
+        def _next_id(self) -> int:
+            """The ID the next inserted duel gets: SQLite's max(id) + 1, but never an archived duel's ID."""
+            return max(Duel.select(fn.MAX(Duel.id)).scalar() or 0, self.id_floor) + 1  # type: ignore
 
         def create(self, attacking_gang: Gang, attacking_score: int, defending_gang: Gang, defending_score: int) -> Duel:
-            """Create a new duel between two gangs."""
+            """Create a new duel between two gangs of the same guild."""
             if attacking_gang == defending_gang:
                 raise ValueError("A gang cannot duel itself.")
-            return Duel.create(attacking_gang=attacking_gang, defending_gang=defending_gang, attacking_score=attacking_score, defending_score=defending_score)  # type: ignore
+            if attacking_gang.guild_id != defending_gang.guild_id:  # type: ignore
+                raise ValueError("Both gangs must belong to the same server.")
+            with self.db.writing():
+                # Without archived seasons SQLite's own choice is the same ID, without the extra query.
+                ids = {"id": self._next_id()} if self.id_floor else {}
+                duel = Duel.create(**ids, guild_id=attacking_gang.guild_id, attacking_gang=attacking_gang, defending_gang=defending_gang, attacking_score=attacking_score, defending_score=defending_score)  # type: ignore
+                self.db.standing.apply(duel)
+                self.db.rating.apply([(duel.attacking_gang_id, attacking_score, duel.defending_gang_id, defending_score)])  # type: ignore
+                self.db.rivalry.apply(duel)
+            self._notify("created", duel)  # type: ignore
+            return duel  # type: ignore
+
+        def insert_many(self, guild_id: int, results: list[tuple[int, int, int, int]]) -> int:
+            """
+            Insert many duels in a guild in a single transaction.
+
+            Args:
+                guild_id (int): The guild every gang in `results` belongs to.
+                results (list): (attacking gang ID, attacking score, defending gang ID, defending score) tuples,
+                    already validated.
+            Returns:
+                int: The number of duels inserted.
+            """
+            # Build the statement once and bind every row to it; generating SQL per row in
+            # peewee costs far more than SQLite's insert itself.
+            fields = [Duel.id, Duel.guild_id, Duel.attacking_gang, Duel.attacking_score, Duel.defending_gang, Duel.defending_score, Duel.created_at, Duel.updated_at]
+            sql, _ = Duel.insert_many([(0, 0, 0, 0, 0, 0, None, None)], fields=fields).sql()  # type: ignore
+            now = Duel.created_at.db_value(utcnow())  # type: ignore
+            with self.db.writing():
+                # The batch gets consecutive IDs from here.
+                first_id = self._next_id()
+                sqldb.cursor().executemany(sql, ((first_id + i, guild_id, *result, now, now) for i, result in enumerate(results)))
+                self.db.standing.apply_many(results)
+                self.db.rating.apply(results)
+                self.db.rivalry.apply_many((first_id + i, *result) for i, result in enumerate(results))
+            if results:
+                self.version += 1
+            if results and self.listeners:
+                self._emit(DuelEvent("imported", guild_id, first_id, 0, 0, 0, 0, len(results)))
+            return len(results)
+
+        def import_rows(self, guild_id: int, rows: list[tuple[str, int, str, int]]) -> tuple[int, list[tuple[int, str]]]:
+            """
+            Validate and insert duels given by gang name.
+
+            Names are resolved in one pass against the guild's gangs, invalid rows are skipped
+            and every valid row is inserted through `insert_many`.
+
+            Args:
+                guild_id (int): The guild whose gangs the names refer to.
+                rows (list): (attacking gang name, attacking score, defending gang name, defending score) tuples.
+            Returns:
+                tuple: The number of duels inserted, and (row index, error) for every rejected row.
+            """
+            gangs = self.db.gang.get_many_by_name(guild_id, (name for row in rows for name in (row[0], row[2])))
+            results, errors = [], []
+            for index, (attacking_name, attacking_score, defending_name, defending_score) in enumerate(rows):
+                attacker = gangs.get(normalize_name(attacking_name))
+                defender = gangs.get(normalize_name(defending_name))
+                if attacker is None:
+                    errors.append((index, f"No gang found with the name '{attacking_name}'."))
+                elif defender is None:
+                    errors.append((index, f"No gang found with the name '{defending_name}'."))
+                elif attacker.id == defender.id:  # type: ignore
+                    errors.append((index, "A gang cannot duel itself."))
+                elif attacking_score < 0 or defending_score < 0:
+                    errors.append((index, "Scores cannot be negative."))
+                else:
+                    results.append((attacker.id, attacking_score, defender.id, defending_score))  # type: ignore
+            return self.insert_many(guild_id, results), errors
+
+        def _refresh(self, duel: Duel) -> None:
+            """Reload a duel's scores inside a write; another worker may have changed or deleted it since it was read."""
+            row = Duel.select(Duel.attacking_score, Duel.defending_score).where(Duel.id == duel.id).tuples().first()  # type: ignore
+            if row is None:
+                raise ValueError(f"No duel found with ID {duel.id}.")  # type: ignore
+            duel.attacking_score, duel.defending_score = row  # type: ignore
 
         def delete(self, duel: Duel) -> None:
             """Delete a duel from the database."""
-            duel.delete_instance()  # type: ignore
-            print(f"Duel between '{duel.attacking_gang.name}' and '{duel.defending_gang.name}' deleted successfully.")  # type: ignore
+            with self.db.writing(), self.db.rating.replaying(duel.guild_id, duel.id):  # type: ignore
+                self._refresh(duel)
+                self.db.standing.apply(duel, sign=-1)
+                self.db.rivalry.apply(duel, sign=-1)
+                duel.delete_instance()  # type: ignore
+                self.db.rivalry.refresh_last(duel.attacking_gang_id, duel.defending_gang_id)  # type: ignore
+            self._notify("deleted", duel)
+            # Log IDs only: reading `duel.attacking_gang` would lazy-load a gang that may be gone.
+            logger.debug("Duel %s between gangs %s and %s deleted.", duel.id, duel.attacking_gang_id, duel.defending_gang_id)  # type: ignore
 
-        def get_by_id(self, duel_id: int) -> Duel:
-            """Retrieve a duel by its ID."""
+        def get_by_id(self, guild_id: int, duel_id: int) -> Duel:
+            """Retrieve a guild's duel by its ID."""
             try:
-                return Duel.get(Duel.id == duel_id)  # type: ignore
+                return Duel.get((Duel.guild_id == guild_id) & (Duel.id == duel_id))  # type: ignore
             except peewee.DoesNotExist:
                 raise ValueError(f"No duel found with ID {duel_id}.")
 
+        def _with_gangs(self, model: type[Duel] = Duel):
+            """Select duels (or archived duels) together with both gangs, so rendering never lazy-loads them."""
+            attacker, defender = Gang.alias(), Gang.alias()
+            return (model
+                    .select(model, attacker, defender)
+                    .join(attacker, JOIN.LEFT_OUTER, on=(model.attacking_gang == attacker.id))  # type: ignore
+                    .switch(model)
+                    .join(defender, JOIN.LEFT_OUTER, on=(model.defending_gang == defender.id)))  # type: ignore
+
+        def _fill_deleted(self, duels: list[Duel]) -> list[Duel]:
+            """Give duels whose gang was deleted a placeholder gang instead of a lazy-load that fails."""
+            for duel in duels:
+                for field in ("attacking_gang", "defending_gang"):
+                    # peewee only populates __rel__ when the outer join found a row.
+                    if field not in duel.__rel__:
+                        setattr(duel, field, Gang(id=getattr(duel, f"{field}_id"), guild_id=duel.guild_id, name="(deleted gang)"))
+            return duels
+
         def get_by_gang(self, gang: Gang) -> list[Duel]:
-            """Retrieve all duels involving a specific gang."""
-            duels_as_attacker = Duel.select().where(Duel.attacking_gang == gang)  # type: ignore
-            duels_as_defender = Duel.select().where(Duel.defending_gang == gang)  # type: ignore
-            return list(duels_as_attacker) + list(duels_as_defender)  # type: ignore
+            """
+            Retrieve all duels involving a specific gang, oldest first, with both gangs loaded.
+
+            Builds every row up front; use `iter_all` to walk a gang's whole record.
+            """
+            query = (self._with_gangs()
+                     .where((Duel.attacking_gang == gang) | (Duel.defending_gang == gang))  # type: ignore
+                     .order_by(Duel.id))
+            return self._fill_deleted(list(query))  # type: ignore
+
+        def id_range(self, guild_id: int, since: datetime | None = None, until: datetime | None = None) -> tuple[int | None, int | None] | None:
+            """
+            Map a time window to the inclusive range of a guild's duel IDs created inside it.
+
+            Each bound is one lookup on the (guild_id, created_at, id) index. Relies on duels
+            being inserted in time order, which `create` and `insert_many` guarantee.
+
+            Args:
+                guild_id (int): The guild whose duels to consider.
+                since (datetime | None): Start of the window (inclusive, UTC). None for unbounded.
+                until (datetime | None): End of the window (exclusive, UTC). None for unbounded.
+            Returns:
+                tuple | None: (first ID, last ID), either None when unbounded, or None if the window is empty.
+            """
+            first = last = None
+            if since is not None:
+                first = Duel.select(Duel.id).where((Duel.guild_id == guild_id) & (Duel.created_at >= since)).order_by(Duel.created_at, Duel.id).limit(1).scalar()  # type: ignore
+                if first is None:
+                    return None
+            if until is not None:
+                last = Duel.select(Duel.id).where((Duel.guild_id == guild_id) & (Duel.created_at < until)).order_by(Duel.created_at.desc(), Duel.id.desc()).limit(1).scalar()  # type: ignore
+                if last is None:
+                    return None
+            if first is not None and last is not None and first > last:
+                return None
+            return first, last
+
+        def get_between(self, guild_id: int, since: datetime | None = None, until: datetime | None = None, limit: int = 100) -> list[Duel]:
+            """Retrieve up to `limit` of a guild's most recent duels created inside a time window, oldest first."""
+            bounds = self.id_range(guild_id, since, until)
+            if bounds is None:
+                return []
+            query = self._with_gangs().where(Duel.guild_id == guild_id)  # type: ignore
+            if bounds[0] is not None:
+                query = query.where(Duel.id >= bounds[0])  # type: ignore
+            if bounds[1] is not None:
+                query = query.where(Duel.id <= bounds[1])  # type: ignore
+            return self._fill_deleted(list(query.order_by(Duel.id.desc()).limit(limit)))[::-1]  # type: ignore
+
+        def history(self, gang: Gang, after_id: int | None = None, before_id: int | None = None, limit: int = 10,
+                    since: datetime | None = None, until: datetime | None = None) -> list[Duel]:
+            """
+            Retrieve one page of a gang's duels with keyset pagination, oldest first.
+            
+            With `after_id`, returns the first `limit` duels newer than it. Otherwise returns the
+            last `limit` duels older than `before_id` (or the most recent ones if neither is given).
+            Each side of the gang is read through its own index range, so a page costs O(limit)
+            regardless of how many duels the gang has.
+            
+            Args:
+                gang (Gang): The gang whose duels to page through.
+                after_id (int | None): Only return duels with a greater ID.
+                before_id (int | None): Only return duels with a smaller ID.
+                limit (int): The maximum number of duels to return.
+                since (datetime | None): Only return duels created at or after this time (UTC).
+                until (datetime | None): Only return duels created before this time (UTC).
+            Returns:
+                list[Duel]: The page, ordered by ID, with both gangs loaded.
+            """
+            newer = after_id is not None
+            low, high = after_id, before_id  # Exclusive ID bounds.
+            if since is not None or until is not None:
+                bounds = self.id_range(gang.guild_id, since, until)  # type: ignore
+                if bounds is None:
+                    return []
+                if bounds[0] is not None:
+                    low = bounds[0] - 1 if low is None else max(low, bounds[0] - 1)
+                if bounds[1] is not None:
+                    high = bounds[1] + 1 if high is None else min(high, bounds[1] + 1)
+            return self._gang_page(Duel, gang, low, high, newer, limit)
+
+        def _gang_page(self, model: type[Duel], gang: Gang, low: int | None, high: int | None, newer: bool, limit: int) -> list[Duel]:
+            """One page of `history` between exclusive ID bounds, from the live or an archived duel table."""
+            order = model.id.asc() if newer else model.id.desc()  # type: ignore
+            ids = None
+            for field in (model.attacking_gang, model.defending_gang):
+                condition = field == gang
+                if low is not None:
+                    condition &= model.id > low  # type: ignore
+                if high is not None:
+                    condition &= model.id < high  # type: ignore
+                page = model.select(model.id).where(condition).order_by(order).limit(limit).alias("page")  # type: ignore
+                side = Select([page], [SQL('"page"."id"')])
+                ids = side if ids is None else ids.union_all(side)
+            duels = self._fill_deleted(list(self._with_gangs(model).where(model.id.in_(ids)).order_by(order).limit(limit)))  # type: ignore
+            return duels if newer else duels[::-1]
+
+        def page(self, guild_id: int, after_id: int = 0, limit: int = STREAM_CHUNK, gang: Gang | None = None) -> list[DuelRow]:
+            """
+            Read the next `limit` of a guild's duels (or of one of its gangs) after `after_id`, in ID order.
 
-        def get_all(self) -> list[Duel]:
-            """Retrieve all duels."""
-            return list(Duel.select())  # type: ignore
+            Pages are keyed on the last ID returned, so every page is an index range scan
+            that costs the same at the end of the table as at the start, and no read
+            transaction stays open between pages.
 
-        def get_recent(self, limit: int = 6) -> list[Duel]:
-            """Retrieve the most recent duels."""
-            return list(Duel.select().order_by(Duel.id.desc()).limit(limit))  # type: ignore
+            Args:
+                guild_id (int): The guild whose duels to read.
+                after_id (int): Only return duels with a greater ID.
+                limit (int): The maximum number of duels to return.
+                gang (Gang | None): Only return this gang's duels.
+            Returns:
+                list[DuelRow]: The page, as plain tuples.
+            """
+            if gang is None:
+                condition = (Duel.guild_id == guild_id) & (Duel.id > after_id)  # type: ignore
+            else:
+                ids = None
+                for field in (Duel.attacking_gang, Duel.defending_gang):
+                    page = Duel.select(Duel.id).where((field == gang) & (Duel.id > after_id)).order_by(Duel.id).limit(limit).alias("page")  # type: ignore
+                    side = Select([page], [SQL('"page"."id"')])
+                    ids = side if ids is None else ids.union_all(side)
+                condition = (Duel.guild_id == guild_id) & Duel.id.in_(ids)  # type: ignore
+            query = Duel.select(*DUEL_ROW_FIELDS).where(condition).order_by(Duel.id).limit(limit)  # type: ignore
+            return [DuelRow._make(row) for row in query.tuples().iterator()]  # type: ignore
+
+        def iter_all(self, guild_id: int, gang: Gang | None = None, chunk_size: int = STREAM_CHUNK) -> Iterator[DuelRow]:
+            """
+            Stream a guild's duels (or one of its gangs') in ID order, `chunk_size` rows per query.
+
+            Only one chunk is held in memory at a time. Iterate it on the thread that owns the
+            connection, i.e. inside `AsyncScorekeeperDB.run`; from the event loop, use
+            `AsyncScorekeeperDB.iter_duels`.
+            """
+            after_id = 0
+            while True:
+                rows = self.page(guild_id, after_id, chunk_size, gang)
+                yield from rows
+                if len(rows) < chunk_size:
+                    return
+                after_id = rows[-1].id
+
+        def get_recent(self, guild_id: int, limit: int = 6) -> list[Duel]:
+            """Retrieve a guild's most recent duels."""
+            return list(Duel.select().where(Duel.guild_id == guild_id).order_by(Duel.id.desc()).limit(limit))  # type: ignore
 
         def update_scores(self, duel: Duel, attacking_score: int, defending_score: int) -> Duel:
             """Update the scores of a duel."""
             if attacking_score < 0 or defending_score < 0:
                 raise ValueError("Scores cannot be negative.")
-            duel.attacking_score = attacking_score  # type: ignore
-            duel.defending_score = defending_score  # type: ignore
-            duel.save()  # type: ignore
+            with self.db.writing(), self.db.rating.replaying(duel.guild_id, duel.id):  # type: ignore
+                self._refresh(duel)
+                self.db.standing.apply(duel, sign=-1)
+                self.db.rivalry.apply(duel, sign=-1)
+                duel.attacking_score = attacking_score  # type: ignore
+                duel.defending_score = defending_score  # type: ignore
+                duel.updated_at = utcnow()  # type: ignore
+                duel.save()  # type: ignore
+                self.db.standing.apply(duel)
+                self.db.rivalry.apply(duel)
+            self._notify("updated", duel)
             return duel  # type: ignore
 
+        def add_scores(self, deltas: dict[int, tuple[int, int]], journal: str | None = None, seq: int = 0) -> list[Duel]:
+            """
+            Add accumulated score changes to many duels in a single transaction.
+
+            Scores are clamped at zero and duels that no longer exist are skipped. Standings
+            and rivalries move from each duel's old result to its new one in one pass, and
+            ratings are replayed once per guild for the whole batch, from its oldest changed
+            duel on, instead of once per change.
+
+            Args:
+                deltas (dict): Duel ID to (attacking score delta, defending score delta).
+                journal (str | None): If given, record in the same transaction that this
+                    journal's entries up to `seq` are applied.
+                seq (int): The journal sequence number the deltas cover.
+            Returns:
+                list[Duel]: The duels whose scores changed.
+            """
+            with self.db.writing():
+                duels = []
+                for batch in peewee.chunked(deltas, 500):
+                    duels += list(Duel.select().where(Duel.id.in_(batch)))  # type: ignore
+                old, changed = [], []
+                now = utcnow()
+                for duel in duels:
+                    attacking_delta, defending_delta = deltas[duel.id]  # type: ignore
+                    attacking_score = max(0, duel.attacking_score + attacking_delta)  # type: ignore
+                    defending_score = max(0, duel.defending_score + defending_delta)  # type: ignore
+                    if (attacking_score, defending_score) == (duel.attacking_score, duel.defending_score):
+                        continue
+                    old.append((duel.id, duel.attacking_gang_id, duel.attacking_score, duel.defending_gang_id, duel.defending_score))  # type: ignore
+                    duel.attacking_score, duel.defending_score, duel.updated_at = attacking_score, defending_score, now  # type: ignore
+                    changed.append(duel)
+                if changed:
+                    new = [(duel.id, duel.attacking_gang_id, duel.attacking_score, duel.defending_gang_id, duel.defending_score) for duel in changed]  # type: ignore
+                    first_ids: dict[int, int] = {}
+                    for duel in changed:
+                        first_ids[duel.guild_id] = min(first_ids.get(duel.guild_id, duel.id), duel.id)  # type: ignore
+                    with contextlib.ExitStack() as replays:
+                        # Live wars are the newest duels, so each guild's suffix to replay is short.
+                        for guild_id, first_id in first_ids.items():
+                            replays.enter_context(self.db.rating.replaying(guild_id, first_id))
+                        self.db.standing.apply_many((row[1:] for row in old), sign=-1)
+                        self.db.standing.apply_many(row[1:] for row in new)
+                        self.db.rivalry.apply_many(old, sign=-1)
+                        self.db.rivalry.apply_many(new)
+                        Duel.bulk_update(changed, fields=[Duel.attacking_score, Duel.defending_score, Duel.updated_at], batch_size=500)  # type: ignore
+                if journal is not None:
+                    self.db.journal.mark(journal, seq)
+            for duel in changed:
+                self._notify("updated", duel)
+            return changed
+
+    class StandingOps:
+        def __init__(self, db: 'ScorekeeperDB'):
+            self.db = db
+
+        def apply(self, duel: Duel, sign: int = 1) -> None:
+            """
+            Add (sign=1) or remove (sign=-1) a duel's result from both gangs' standings.
+            
+            Must run inside the transaction that writes the duel.
+            """
+            self.apply_many([(duel.attacking_gang_id, duel.attacking_score, duel.defending_gang_id, duel.defending_score)], sign)  # type: ignore
+
+        def apply_many(self, results: Iterable[tuple[int, int, int, int]], sign: int = 1) -> None:
+            """
+            Add (sign=1) or remove (sign=-1) many duel results, given as
+            (attacking gang ID, attacking score, defending gang ID, defending score).
+            
+            Deltas are summed per gang first, so this issues one upsert per gang touched.
+            Must run inside the transaction that writes the duels.
+            """
+            totals: dict[int, list[int]] = {}
+            for attacking_id, attacking_score, defending_id, defending_score in results:
+                attacker, defender = duel_outcome(attacking_score, defending_score)
+                for gang_id, deltas in ((attacking_id, attacker), (defending_id, defender)):
+                    current = totals.get(gang_id)
+                    if current is None:
+                        totals[gang_id] = list(deltas)
+                    else:
+                        current[0] += deltas[0]
+                        current[1] += deltas[1]
+                        current[2] += deltas[2]
+                        current[3] += deltas[3]
+                        current[4] += deltas[4]
+            # Duels can outlive a deleted gang; editing or removing one must not resurrect its standing.
+            # Every live gang has a standing row from the moment it is created.
+            existing = {gang_id for (gang_id,) in GangStanding.select(GangStanding.gang).where(GangStanding.gang.in_(list(totals))).tuples()}  # type: ignore
+            totals = {gang_id: deltas for gang_id, deltas in totals.items() if gang_id in existing}
+            update = {getattr(GangStanding, name): getattr(GangStanding, name) + getattr(peewee.EXCLUDED, name) for name in STANDING_FIELDS}
+            fields = [GangStanding.gang] + [getattr(GangStanding, name) for name in STANDING_FIELDS]
+            sql, _ = (GangStanding
+                      .insert_many([(0,) * len(fields)], fields=fields)
+                      .on_conflict(conflict_target=[GangStanding.gang], update=update)
+                      .sql())  # type: ignore
+            sqldb.cursor().executemany(sql, [(gang_id, *(sign * value for value in deltas)) for gang_id, deltas in totals.items()])
+
+        def get(self, gang: Gang) -> GangStanding:
+            """Retrieve a gang's standing, all zeroes if it has none yet."""
+            standing = GangStanding.get_or_none(GangStanding.gang == gang)  # type: ignore
+            return standing if standing is not None else GangStanding(gang=gang)  # type: ignore
+
+        def top(self, guild_id: int, limit: int = 10) -> list[GangStanding]:
+            """
+            Retrieve a guild's `limit` best gangs, ordered by wins, then draws, then points scored.
+
+            Each row also carries the gang's Elo `rating`.
+            """
+            query = (GangStanding
+                     .select(GangStanding, Gang, fn.COALESCE(GangRating.rating, ratings.INITIAL_RATING).alias("rating"))
+                     .join(Gang)
+                     .join(GangRating, JOIN.LEFT_OUTER, on=(GangRating.gang == Gang.id))  # type: ignore
+                     .where(Gang.guild_id == guild_id)
+                     .order_by(GangStanding.wins.desc(), GangStanding.draws.desc(), GangStanding.points_for.desc())  # type: ignore
+                     .limit(limit))
+            return list(query)  # type: ignore
+
+        def between(self, guild_id: int, since: datetime | None = None, until: datetime | None = None, limit: int = 10) -> list[GangStanding]:
+            """
+            Rank a guild's gangs by their results inside a time window, like `top`.
+            
+            The window is turned into a duel ID range first, so only duels inside it are read.
+            
+            Returns:
+                list[GangStanding]: Unsaved standings for the window, best first.
+            """
+            bounds = self.db.duel.id_range(guild_id, since, until)
+            if bounds is None:
+                return []
+            condition = Duel.guild_id == guild_id
+            if bounds[0] is not None:
+                condition &= Duel.id >= bounds[0]  # type: ignore
+            if bounds[1] is not None:
+                condition &= Duel.id <= bounds[1]  # type: ignore
+            totals = self._aggregate(condition)
+            standings = []
+            for gang_id, values in totals.items():
+                try:
+                    gang = self.db.gang.get_by_id(guild_id, gang_id)
+                except ValueError:
+                    continue  # A deleted gang.
+                standings.append(GangStanding(gang=gang, **dict(zip(STANDING_FIELDS, values))))
+            standings.sort(key=lambda row: (row.wins, row.draws, row.points_for), reverse=True)
+            return standings[:limit]
+
+        def _aggregate(self, condition) -> dict[int, list[int]]:
+            """Sum duel results per gang over the duels matching `condition`."""
+            totals: dict[int, list[int]] = {}
+            sides = (
+                (Duel.attacking_gang, Duel.attacking_score, Duel.defending_score),
+                (Duel.defending_gang, Duel.defending_score, Duel.attacking_score),
+            )
+            for gang_field, own, other in sides:
+                query = (Duel
+                         .select(gang_field,
+                                 fn.SUM(Case(None, [(own > other, 1)], 0)),
+                                 fn.SUM(Case(None, [(own < other, 1)], 0)),
+                                 fn.SUM(Case(None, [(own == other, 1)], 0)),
+                                 fn.SUM(own),
+                                 fn.SUM(other))
+                         .where(condition)
+                         .group_by(gang_field)
+                         .tuples())
+                for gang_id, *values in query:
+                    current = totals.setdefault(gang_id, [0, 0, 0, 0, 0])
+                    for i, value in enumerate(values):
+                        current[i] += value
+            return totals
+
+        def compute(self, guild_id: int | None = None) -> dict[int, tuple[int, int, int, int, int]]:
+            """
+            Recompute every gang's standing from the duel table.
+            
+            Args:
+                guild_id (int | None): Only this guild's gangs, from its duels. Every guild if None.
+            Returns:
+                dict: Gang ID to totals, ordered like `STANDING_FIELDS`.
+            """
+            gangs = Gang.select(Gang.id)
+            condition = SQL("1")
+            if guild_id is not None:
+                gangs = gangs.where(Gang.guild_id == guild_id)
+                condition = Duel.guild_id == guild_id
+            totals = {gang_id: [0, 0, 0, 0, 0] for (gang_id,) in gangs.tuples()}  # type: ignore
+            for gang_id, values in self._aggregate(condition).items():
+                if gang_id in totals:
+                    totals[gang_id] = values
+            return {gang_id: tuple(values) for gang_id, values in totals.items()}  # type: ignore
+
+        def rebuild(self, guild_id: int | None = None) -> int:
+            """
+            Replace all standings with a from-scratch recompute.
+            
+            Args:
+                guild_id (int | None): Only replace this guild's standings. Every guild if None.
+            Returns:
+                int: The number of standing rows written.
+            """
+            totals = self.compute(guild_id)
+            rows = [{"gang": gang_id, **dict(zip(STANDING_FIELDS, values))} for gang_id, values in totals.items()]
+            stale = GangStanding.delete()
+            if guild_id is not None:
+                stale = stale.where(GangStanding.gang.in_(Gang.select(Gang.id).where(Gang.guild_id == guild_id)))  # type: ignore
+            with self.db.writing():
+                stale.execute()  # type: ignore
+                for batch in peewee.chunked(rows, 100):
+                    GangStanding.insert_many(batch).execute()  # type: ignore
+            return len(rows)
+
+        def check(self, guild_id: int | None = None) -> list[tuple[int, tuple, tuple]]:
+            """
+            Compare the stored standings against a from-scratch recompute.
+            
+            Args:
+                guild_id (int | None): Only check this guild's gangs. Every guild if None.
+            Returns:
+                list: (gang ID, stored, expected) for every gang that differs. Empty when consistent.
+            """
+            expected = self.compute(guild_id)
+            query = GangStanding.select(GangStanding.gang, *(getattr(GangStanding, name) for name in STANDING_FIELDS))  # type: ignore
+            if guild_id is not None:
+                query = query.where(GangStanding.gang.in_(Gang.select(Gang.id).where(Gang.guild_id == guild_id)))  # type: ignore
+            stored = {gang_id: tuple(values) for gang_id, *values in query.tuples()}
+            mismatches = []
+            for gang_id in sorted(set(expected) | set(stored)):
+                have = stored.get(gang_id, (0, 0, 0, 0, 0))
+                want = expected.get(gang_id, (0, 0, 0, 0, 0))
+                if have != want or gang_id not in stored:
+                    mismatches.append((gang_id, have, want))
+            return mismatches
+
+    class RatingOps:
+        def __init__(self, db: 'ScorekeeperDB'):
+            self.db = db
+
+        def apply(self, results: list[tuple[int, int, int, int]]) -> None:
+            """
+            Apply new duels to the ratings incrementally, in order.
+            
+            Each duel is an O(1) Elo update. Must run inside the transaction that inserts the duels,
+            and only for duels newer than every duel already rated.
+            
+            Args:
+                results (list): (attacking gang ID, attacking score, defending gang ID, defending score) tuples.
+            """
+            gang_ids = {gang_id for result in results for gang_id in (result[0], result[2])}
+            current = {gang_id: [ratings.INITIAL_RATING, 0] for gang_id in gang_ids}
+            for batch in peewee.chunked(gang_ids, 500):
+                for gang_id, rating, games in GangRating.select(GangRating.gang, GangRating.rating, GangRating.games).where(GangRating.gang.in_(batch)).tuples():  # type: ignore
+                    current[gang_id] = [rating, games]
+            for attacking_id, attacking_score, defending_id, defending_score in results:
+                attacker, defender = current[attacking_id], current[defending_id]
+                attacker[0], defender[0] = ratings.rate(attacker[0], defender[0], attacking_score, defending_score)
+                attacker[1] += 1
+                defender[1] += 1
+            self._write([(gang_id, rating, games) for gang_id, (rating, games) in current.items()])
+
+        def replay(self, guild_id: int | None = None) -> int:
+            """
+            Recompute ratings from scratch by replaying duels in ID order.
+
+            Duels against deleted gangs still count for their opponents, but deleted gangs
+            get no rating row back.
+
+            Args:
+                guild_id (int | None): Only replay this guild's duels, on the (guild_id, id)
+                    index, and only replace its gangs' ratings. Every guild if None.
+            Returns:
+                int: The number of gangs rated.
+            """
+            query = (Duel
+                     .select(Duel.attacking_gang, Duel.attacking_score, Duel.defending_gang, Duel.defending_score)
+                     .order_by(Duel.id))  # type: ignore
+            gangs = Gang.select(Gang.id)
+            stale = GangRating.delete()
+            if guild_id is not None:
+                query = query.where(Duel.guild_id == guild_id)
+                gangs = gangs.where(Gang.guild_id == guild_id)
+                stale = stale.where(GangRating.gang.in_(gangs))  # type: ignore
+            # Iterate the raw cursor: peewee's per-row conversion would cost more than the replay.
+            totals = ratings.replay(sqldb.execute(query))
+            with self.db.writing():
+                existing = {gang_id for (gang_id,) in gangs.tuples()}  # type: ignore
+                rows = [(gang_id, rating, games) for gang_id, (rating, games) in totals.items() if gang_id in existing]
+                stale.execute()  # type: ignore
+                self._write(rows)
+            return len(rows)
+
+        def _suffix(self, guild_id: int, first_id: int, newest_first: bool = False) -> list[tuple[int, int, int, int]]:
+            query = (Duel
+                     .select(Duel.attacking_gang, Duel.attacking_score, Duel.defending_gang, Duel.defending_score)
+                     .where((Duel.guild_id == guild_id) & (Duel.id >= first_id))  # type: ignore
+                     .order_by(Duel.id.desc() if newest_first else Duel.id))  # type: ignore
+            return list(sqldb.execute(query))
+
+        def rewind(self, guild_id: int, first_id: int) -> dict[int, list] | None:
+            """
+            The ratings of every gang that played in duel `first_id` or later, as they were just before it.
+
+            Undoes the guild's duels one by one, newest first, starting from the stored
+            ratings; call it before any of those duels changes. The result matches a full
+            replay to within float rounding.
+
+            Returns:
+                dict | None: Gang ID to [rating, games]. None when undoing would cost about
+                    as much as a full replay of the guild, or a gang involved has no stored
+                    rating (it was deleted); replay the guild instead.
+            """
+            later = Duel.select().where((Duel.guild_id == guild_id) & (Duel.id >= first_id)).count()  # type: ignore
+            if later > REWIND_CHEAP and later * REWIND_COST > Duel.select().where(Duel.guild_id == guild_id).count():  # type: ignore
+                return None
+            suffix = self._suffix(guild_id, first_id, newest_first=True)
+            gang_ids = {gang_id for row in suffix for gang_id in (row[0], row[2])}
+            state = {}
+            for batch in peewee.chunked(gang_ids, 500):
+                for gang_id, rating, games in GangRating.select(GangRating.gang, GangRating.rating, GangRating.games).where(GangRating.gang.in_(batch)).tuples():  # type: ignore
+                    state[gang_id] = [rating, games]
+            if len(state) != len(gang_ids):
+                return None
+            for attacking_id, attacking_score, defending_id, defending_score in suffix:
+                attacker, defender = state[attacking_id], state[defending_id]
+                attacker[0], defender[0] = ratings.unrate(attacker[0], defender[0], attacking_score, defending_score)
+                attacker[1] -= 1
+                defender[1] -= 1
+            return state
+
+        @contextlib.contextmanager
+        def replaying(self, guild_id: int, first_id: int) -> Iterator[None]:
+            """
+            Keep ratings right while the block changes or deletes a guild's duels from `first_id` on.
+
+            Elo is order dependent, so every later duel has to be replayed. Only that suffix
+            is: the ratings before `first_id` are rewound from the stored ones, and the
+            guild's duels from `first_id` on are applied to them again once the block is
+            done. Falls back to `replay(guild_id)` when rewinding does not pay off. Must run
+            inside the transaction that writes the duels.
+            """
+            state = self.rewind(guild_id, first_id)
+            yield
+            if state is None:
+                self.replay(guild_id)
+                return
+            for attacking_id, attacking_score, defending_id, defending_score in self._suffix(guild_id, first_id):
+                attacker, defender = state[attacking_id], state[defending_id]
+                attacker[0], defender[0] = ratings.rate(attacker[0], defender[0], attacking_score, defending_score)
+                attacker[1] += 1
+                defender[1] += 1
+            self._write([(gang_id, rating, games) for gang_id, (rating, games) in state.items()])
+
+        def _write(self, rows: list[tuple[int, float, int]]) -> None:
+            sql, _ = (GangRating
+                      .insert_many([(0, 0.0, 0)], fields=[GangRating.gang, GangRating.rating, GangRating.games])
+                      .on_conflict_replace()
+                      .sql())  # type: ignore
+            sqldb.cursor().executemany(sql, rows)
+
+        def get(self, gang: Gang) -> GangRating:
+            """Retrieve a gang's rating, the initial rating if it has not played."""
+            rating = GangRating.get_or_none(GangRating.gang == gang)  # type: ignore
+            return rating if rating is not None else GangRating(gang=gang)  # type: ignore
+
+        def rank(self, gang: Gang) -> int:
+            """The gang's 1-based position when its guild's rated gangs are ordered by rating."""
+            rating = self.get(gang).rating
+            return GangRating.select().join(Gang).where((Gang.guild_id == gang.guild_id) & (GangRating.rating > rating)).count() + 1  # type: ignore
+
+        def top(self, guild_id: int, limit: int = 10) -> list[GangRating]:
+            """Retrieve a guild's `limit` highest rated gangs."""
+            query = (GangRating
+                     .select(GangRating, Gang)
+                     .join(Gang)
+                     .where(Gang.guild_id == guild_id)
+                     .order_by(GangRating.rating.desc())  # type: ignore
+                     .limit(limit))
+            return list(query)  # type: ignore
+
+    class RivalryOps:
+        def __init__(self, db: 'ScorekeeperDB'):
+            self.db = db
+
+        def apply(self, duel: Duel, sign: int = 1) -> None:
+            """
+            Add (sign=1) or remove (sign=-1) a duel from its gang pair's head-to-head record.
+            
+            Must run inside the transaction that writes the duel.
+            """
+            self.apply_many([(duel.id, duel.attacking_gang_id, duel.attacking_score, duel.defending_gang_id, duel.defending_score)], sign)  # type: ignore
+
+        def apply_many(self, results: Iterable[tuple[int, int, int, int, int]], sign: int = 1) -> None:
+            """
+            Add (sign=1) or remove (sign=-1) many duels, given as
+            (duel ID, attacking gang ID, attacking score, defending gang ID, defending score).
+            
+            Deltas are summed per pair first, so this issues one upsert per pair touched.
+            Removing a duel leaves `last_duel_id` alone; call `refresh_last` after the delete.
+            """
+            totals = rivalry_totals(results)
+            update = {getattr(Rivalry, name): getattr(Rivalry, name) + getattr(peewee.EXCLUDED, name) for name in RIVALRY_FIELDS}
+            update[Rivalry.last_duel_id] = fn.MAX(fn.COALESCE(Rivalry.last_duel_id, SQL("0")), peewee.EXCLUDED.last_duel_id)
+            fields = [Rivalry.gang_low, Rivalry.gang_high] + [getattr(Rivalry, name) for name in RIVALRY_FIELDS] + [Rivalry.last_duel_id]
+            sql, _ = (Rivalry
+                      .insert_many([(0,) * len(fields)], fields=fields)
+                      .on_conflict(conflict_target=[Rivalry.gang_low, Rivalry.gang_high], update=update)
+                      .sql())  # type: ignore
+            if sign > 0:
+                rows = [(low, high, *current) for (low, high), current in totals.items()]
+            else:
+                rows = [(low, high, *(-value for value in current[:6]), 0) for (low, high), current in totals.items()]
+            sqldb.cursor().executemany(sql, rows)
+
+        def refresh_last(self, gang_a: int, gang_b: int) -> None:
+            """Recompute a pair's `last_duel_id` (e.g. after deleting its latest duel)."""
+            low, high = min(gang_a, gang_b), max(gang_a, gang_b)
+            last = (Duel
+                    .select(fn.MAX(Duel.id))
+                    .where(((Duel.attacking_gang == low) & (Duel.defending_gang == high)) | ((Duel.attacking_gang == high) & (Duel.defending_gang == low)))  # type: ignore
+                    .scalar())
+            Rivalry.update(last_duel_id=last).where((Rivalry.gang_low == low) & (Rivalry.gang_high == high)).execute()  # type: ignore
+
+        def get(self, gang_a: Gang, gang_b: Gang) -> dict:
+            """
+            Read the head-to-head record between two gangs with one primary key lookup.
+            
+            Returns:
+                dict: `wins`, `score` (each keyed by gang ID), `draws`, `duels` and `last_duel_id`.
+            """
+            if gang_a.id == gang_b.id:  # type: ignore
+                raise ValueError("A gang has no rivalry with itself.")
+            low, high = sorted((gang_a.id, gang_b.id))  # type: ignore
+            row = Rivalry.get_or_none((Rivalry.gang_low == low) & (Rivalry.gang_high == high))  # type: ignore
+            if row is None:
+                return {"wins": {low: 0, high: 0}, "score": {low: 0, high: 0}, "draws": 0, "duels": 0, "last_duel_id": None}
+            return {
+                "wins": {low: row.wins_low, high: row.wins_high},
+                "score": {low: row.score_low, high: row.score_high},
+                "draws": row.draws,
+                "duels": row.duels,
+                "last_duel_id": row.last_duel_id,
+            }
+
+        def matrix(self, guild_id: int) -> tuple[list[Gang], list[list[int]]]:
+            """
+            Build a dense wins matrix for a guild's gangs from the rivalry table.
+
+            Returns:
+                tuple: The gangs (ordered by ID) and a matrix where `[i][j]` is how often gang i beat gang j.
+            """
+            gangs = self.db.gang.get_all(guild_id)
+            slots = {gang.id: i for i, gang in enumerate(gangs)}  # type: ignore
+            matrix = [[0] * len(gangs) for _ in gangs]
+            query = (Rivalry
+                     .select(Rivalry.gang_low, Rivalry.gang_high, Rivalry.wins_low, Rivalry.wins_high)
+                     .join(Gang, on=(Rivalry.gang_low == Gang.id))  # type: ignore
+                     .where(Gang.guild_id == guild_id))
+            for low, high, wins_low, wins_high in query.tuples():  # type: ignore
+                if low in slots and high in slots:
+                    matrix[slots[low]][slots[high]] = wins_low
+                    matrix[slots[high]][slots[low]] = wins_high
+            return gangs, matrix
+
+        def rebuild(self, guild_id: int | None = None) -> int:
+            """
+            Replace every rivalry row with a from-scratch recompute over all duels.
+            
+            Args:
+                guild_id (int | None): Only recompute this guild's pairs, from its duels. Every guild if None.
+            Returns:
+                int: The number of gang pairs written.
+            """
+            query = (Duel
+                     .select(Duel.id, Duel.attacking_gang, Duel.attacking_score, Duel.defending_gang, Duel.defending_score)
+                     .order_by(Duel.id))  # type: ignore
+            if guild_id is None:
+                with self.db.writing():
+                    Rivalry.delete().execute()  # type: ignore
+                    for batch in peewee.chunked(sqldb.execute(query), 50000):
+                        self.apply_many(batch)
+                return Rivalry.select().count()  # type: ignore
+            with self.db.writing():
+                # Both gangs of a pair belong to the same guild, so the lower ID identifies the guild's pairs.
+                gang_ids = self.db._guild_gang_ids(guild_id)
+                for batch in peewee.chunked(gang_ids, 500):
+                    Rivalry.delete().where(Rivalry.gang_low.in_(batch)).execute()  # type: ignore
+                for batch in peewee.chunked(sqldb.execute(query.where(Duel.guild_id == guild_id)), 50000):
+                    self.apply_many(batch)
+                return sum(Rivalry.select().where(Rivalry.gang_low.in_(batch)).count() for batch in peewee.chunked(gang_ids, 500))  # type: ignore
+
+    class ScoreboardOps:
+        def __init__(self, db: 'ScorekeeperDB'):
+            self.db = db
+
+        def get_all(self) -> dict[int, int]:
+            """
+            Retrieve every stored scoreboard message.
+            
+            Returns:
+                dict: Channel ID to message ID.
+            """
+            return dict(ScoreboardMessage.select(ScoreboardMessage.channel_id, ScoreboardMessage.message_id).tuples())  # type: ignore
+
+        def set(self, channel_id: int, message_id: int) -> None:
+            """Store the scoreboard message for a channel, replacing any previous one."""
+            ScoreboardMessage.insert(channel_id=channel_id, message_id=message_id).on_conflict_replace().execute()  # type: ignore
+
+        def delete(self, channel_id: int) -> None:
+            """Forget the scoreboard message for a channel."""
+            ScoreboardMessage.delete().where(ScoreboardMessage.channel_id == channel_id).execute()  # type: ignore
+
+    class JournalOps:
+        def __init__(self, db: 'ScorekeeperDB'):
+            self.db = db
+
+        def seq(self, name: str) -> int:
+            """The last sequence number of journal `name` whose entries are committed, 0 if none."""
+            return JournalCheckpoint.select(JournalCheckpoint.seq).where(JournalCheckpoint.name == name).scalar() or 0  # type: ignore
+
+        def mark(self, name: str, seq: int) -> None:
+            """Record that journal `name` is applied up to `seq`. Run it in the transaction that applies the entries."""
+            JournalCheckpoint.insert(name=name, seq=seq).on_conflict_replace().execute()  # type: ignore
+
+    class SeasonOps:
+        def __init__(self, db: 'ScorekeeperDB'):
+            self.db = db
+
+        @contextlib.contextmanager
+        def attach(self, path: str) -> Iterator[None]:
+            """
+            Attach an archive file as `ARCHIVE_SCHEMA` on this thread's connection for the duration.
+
+            `ArchivedDuel` queries only work inside this block. Must not be entered inside a transaction.
+            """
+            sqldb.execute_sql(f"ATTACH DATABASE ? AS {ARCHIVE_SCHEMA};", (path,))
+            try:
+                yield
+            finally:
+                sqldb.execute_sql(f"DETACH DATABASE {ARCHIVE_SCHEMA};")
+
+        def current(self, guild_id: int) -> int:
+            """The number of a guild's season in progress."""
+            return (Season.select(fn.MAX(Season.number)).where(Season.guild_id == guild_id).scalar() or 0) + 1  # type: ignore
+
+        def get_all(self, guild_id: int) -> list[Season]:
+            """Retrieve a guild's closed seasons, newest first."""
+            return list(Season.select().where(Season.guild_id == guild_id).order_by(Season.number.desc()))  # type: ignore
+
+        def get(self, guild_id: int, number: int) -> Season:
+            """Retrieve one of a guild's closed seasons by its number."""
+            try:
+                return Season.get((Season.guild_id == guild_id) & (Season.number == number))  # type: ignore
+            except peewee.DoesNotExist:
+                raise ValueError(f"Season {number} is not a closed season.")
+
+        def close(self, guild_id: int, archive_dir: str, vacuum: bool = True) -> Season:
+            """
+            End a guild's season in progress and start the next one.
+
+            The season's duels are copied into a new SQLite file in `archive_dir` and that copy
+            is committed first. Then, in one transaction here, each gang's and gang pair's
+            results are stored as summary rows, the duels are deleted, and the guild's
+            standings, ratings and rivalries start over. The copy is written to a `.partial`
+            file that only gets its final name once complete, and an existing file is never
+            overwritten, so a crash in between leaves the live data and earlier archives
+            untouched. Finally the database is VACUUMed and checkpointed, which blocks other
+            queries until it is done.
+
+            Args:
+                guild_id (int): The guild whose season ends.
+                archive_dir (str): The directory the archive file is written to.
+                vacuum (bool): Whether to VACUUM afterwards to return the freed pages to the OS.
+            Raises:
+                ValueError: If the season has no duels, or they changed while they were being archived.
+            Returns:
+                Season: The closed season.
+            """
+            def snapshot(condition) -> tuple:
+                # Every write to a duel either changes the count or bumps the latest updated_at.
+                return Duel.select(fn.COUNT(Duel.id), fn.MIN(Duel.id), fn.MAX(Duel.id), fn.MIN(Duel.created_at), fn.MAX(Duel.updated_at)).where(condition).tuples().get()  # type: ignore
+
+            count, first_id, last_id, started_at, _ = before = snapshot(Duel.guild_id == guild_id)
+            if not count:
+                raise ValueError("This season has no wars yet.")
+            season_duels = (Duel.guild_id == guild_id) & (Duel.id <= last_id)  # type: ignore
+            number = self.current(guild_id)
+            os.makedirs(archive_dir, exist_ok=True)
+            partial = os.path.join(archive_dir, f"season-{guild_id}-{number}.sqldb.partial")
+            # Only a close writes .partial files, so one that exists was left by an interrupted close.
+            if os.path.exists(partial):
+                os.remove(partial)
+            with self.attach(partial):
+                ArchivedDuel.create_table()
+                # Only the archive is written; a write lock on the live database would block every other writer.
+                with sqldb.atomic():
+                    ArchivedDuel.insert_from(Duel.select().where(season_duels), fields=ArchivedDuel._meta.sorted_fields).execute()  # type: ignore
+            path = self._archive_path(archive_dir, guild_id, number)
+            os.replace(partial, path)
+            try:
+                with self.db.writing():
+                    if snapshot(season_duels) != before:
+                        raise ValueError("Wars changed while the season was being archived; try again.")
+                    season = Season.create(guild_id=guild_id, number=number, started_at=started_at, duels=count,  # type: ignore
+                                           first_duel_id=first_id, last_duel_id=last_id, archive=path)
+                    gang_ids = self._summarize(season, season_duels)
+                    Duel.delete().where(season_duels).execute()  # type: ignore
+                    self._restart(guild_id, gang_ids)
+            except BaseException:
+                # The file was created just above and no season points at it.
+                os.remove(path)
+                raise
+            self.db.duel.id_floor = max(self.db.duel.id_floor, last_id)
+            self.db.duel.version += 1
+            if vacuum:
+                sqldb.execute_sql("VACUUM;")
+                # In WAL mode the compacted pages only reach the file at a checkpoint.
+                self.db.checkpoint()
+            return season
+
+        @staticmethod
+        def _archive_path(archive_dir: str, guild_id: int, number: int) -> str:
+            """The first free archive file name for a guild's season."""
+            path = os.path.join(archive_dir, f"season-{guild_id}-{number}.sqldb")
+            suffix = 1
+            # A crash right after the rename leaves a file no season points at; keep it rather than guess.
+            while os.path.exists(path):
+                suffix += 1
+                path = os.path.join(archive_dir, f"season-{guild_id}-{number}-{suffix}.sqldb")
+            return path
+
+        def _summarize(self, season: Season, condition) -> set[int]:
+            """Store per-gang and per-pair summary rows for the duels matching `condition`. Returns the gang IDs involved."""
+            standings = self.db.standing._aggregate(condition)
+            # Each season's ratings start over, so replaying just its duels gives their final values.
+            results = Duel.select(Duel.attacking_gang, Duel.attacking_score, Duel.defending_gang, Duel.defending_score).where(condition).order_by(Duel.id)  # type: ignore
+            rated = ratings.replay(sqldb.execute(results))
+            names = {}
+            for batch in peewee.chunked(standings, 500):
+                names.update(Gang.select(Gang.id, Gang.name).where(Gang.id.in_(batch)).tuples())  # type: ignore
+            rows = [
+                (season.id, gang_id, names.get(gang_id, "(deleted gang)"), *values, *rated.get(gang_id, (ratings.INITIAL_RATING, 0)))
+                for gang_id, values in standings.items()
+            ]
+            fields = [SeasonStanding.season, SeasonStanding.gang_id, SeasonStanding.name] + [getattr(SeasonStanding, name) for name in STANDING_FIELDS] + [SeasonStanding.rating, SeasonStanding.games]
+            for batch in peewee.chunked(rows, 500):
+                SeasonStanding.insert_many(batch, fields=fields).execute()  # type: ignore
+            duels = Duel.select(Duel.id, Duel.attacking_gang, Duel.attacking_score, Duel.defending_gang, Duel.defending_score).where(condition).order_by(Duel.id)  # type: ignore
+            pairs = rivalry_totals(sqldb.execute(duels))
+            rows = [(season.id, low, high, *totals) for (low, high), totals in pairs.items()]
+            fields = [SeasonRivalry.season, SeasonRivalry.gang_low, SeasonRivalry.gang_high] + [getattr(SeasonRivalry, name) for name in RIVALRY_FIELDS] + [SeasonRivalry.last_duel_id]
+            for batch in peewee.chunked(rows, 500):
+                SeasonRivalry.insert_many(batch, fields=fields).execute()  # type: ignore
+            sql, _ = Rivalry.delete().where((Rivalry.gang_low == 0) & (Rivalry.gang_high == 0)).sql()  # type: ignore
+            sqldb.cursor().executemany(sql, list(pairs))
+            return set(standings)
+
+        def _restart(self, guild_id: int, gang_ids: set[int]) -> None:
+            """Reset a guild's standings and ratings to its remaining duels (usually none) after its season was archived."""
+            gang_ids = gang_ids | {gang.id for gang in self.db.gang.get_all(guild_id)}  # type: ignore
+            zeroes = {name: 0 for name in STANDING_FIELDS}
+            for batch in peewee.chunked(gang_ids, 500):
+                GangStanding.update(**zeroes).where(GangStanding.gang.in_(batch)).execute()  # type: ignore
+                GangRating.delete().where(GangRating.gang.in_(batch)).execute()  # type: ignore
+            # Duels recorded while the archive was being written belong to the new season.
+            remaining = list(Duel.select(Duel.id, Duel.attacking_gang, Duel.attacking_score, Duel.defending_gang, Duel.defending_score).where(Duel.guild_id == guild_id).order_by(Duel.id).tuples())  # type: ignore
+            if remaining:
+                self.db.standing.apply_many(row[1:] for row in remaining)
+                self.db.rating.apply([row[1:] for row in remaining])
+                self.db.rivalry.apply_many(remaining)
+
+        def top(self, season: Season, limit: int = 10) -> list[SeasonStanding]:
+            """Retrieve a closed season's `limit` best gangs, ordered like `StandingOps.top`."""
+            query = (SeasonStanding
+                     .select()
+                     .where(SeasonStanding.season == season)
+                     .order_by(SeasonStanding.wins.desc(), SeasonStanding.draws.desc(), SeasonStanding.points_for.desc())  # type: ignore
+                     .limit(limit))
+            return list(query)  # type: ignore
+
+        def top_rated(self, season: Season, limit: int = 10) -> list[SeasonStanding]:
+            """Retrieve a closed season's `limit` highest rated gangs, by their final Elo."""
+            query = (SeasonStanding
+                     .select()
+                     .where((SeasonStanding.season == season) & (SeasonStanding.games > 0))
+                     .order_by(SeasonStanding.rating.desc())  # type: ignore
+                     .limit(limit))
+            return list(query)  # type: ignore
+
+        def standing(self, season: Season, name: str) -> SeasonStanding:
+            """Retrieve a gang's summary in a closed season by the name it had then (case-insensitive)."""
+            try:
+                return SeasonStanding.get((SeasonStanding.season == season) & (fn.LOWER(SeasonStanding.name) == name.strip().lower()))  # type: ignore
+            except peewee.DoesNotExist:
+                raise ValueError(f"No gang named '{name}' fought in season {season.number}.")
+
+        def rank(self, season: Season, standing: SeasonStanding) -> int:
+            """The gang's 1-based position by final Elo among the season's rated gangs."""
+            return SeasonStanding.select().where((SeasonStanding.season == season) & (SeasonStanding.games > 0) & (SeasonStanding.rating > standing.rating)).count() + 1  # type: ignore
+
+        def rivalry(self, season: Season, gang_a: int, gang_b: int) -> dict:
+            """Read two gangs' head-to-head record in a closed season, shaped like `RivalryOps.get`."""
+            if gang_a == gang_b:
+                raise ValueError("A gang has no rivalry with itself.")
+            low, high = sorted((gang_a, gang_b))
+            row = SeasonRivalry.get_or_none((SeasonRivalry.season == season) & (SeasonRivalry.gang_low == low) & (SeasonRivalry.gang_high == high))  # type: ignore
+            if row is None:
+                return {"wins": {low: 0, high: 0}, "score": {low: 0, high: 0}, "draws": 0, "duels": 0, "last_duel_id": None}
+            return {
+                "wins": {low: row.wins_low, high: row.wins_high},
+                "score": {low: row.score_low, high: row.score_high},
+                "draws": row.draws,
+                "duels": row.duels,
+                "last_duel_id": row.last_duel_id,
+            }
+
+        def history(self, season: Season, gang: Gang, after_id: int | None = None, before_id: int | None = None, limit: int = 10) -> list[Duel]:
+            """
+            Retrieve one page of a gang's duels in a closed season, like `DuelOps.history`.
+
+            The season's archive is attached for the query and detached again.
+
+            Raises:
+                ValueError: If the archive file is missing.
+            """
+            if not os.path.exists(season.archive):  # type: ignore
+                raise ValueError(f"The archive of season {season.number} is missing ({season.archive}).")
+            with self.attach(season.archive):  # type: ignore
+                return self.db.duel._gang_page(ArchivedDuel, gang, after_id, before_id, after_id is not None, limit)
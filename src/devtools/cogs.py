@@ -61,5 +61,26 @@ class CogManager(commands.Cog, name="Cog Manager"):
         except Exception as e:
             await interaction.response.send_message(f"Batch unload failed: {e}")
 
+    @command_group.command(name="timings", description="Show the slowest cogs to load")
+    async def timings(self, interaction: discord.Interaction, count: app_commands.Range[int, 1, 25] = 10):
+        timings = sorted(self.bot.cog_timings.items(), key=lambda item: item[1]["seconds"], reverse=True)[:count]
+        if not timings:
+            await interaction.response.send_message("No cog load timings recorded yet.")
+            return
+        lines = [
+            f"`{cog}` - {timing['seconds'] * 1000:.1f}ms{'' if timing['ok'] else ' FAILED'}"
+            for cog, timing in timings
+        ]
+        await interaction.response.send_message("\n".join(lines))
+
+    @command_group.command(name="sync", description="Sync application commands if the command tree changed")
+    async def sync(self, interaction: discord.Interaction, force: bool = False):
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        try:
+            synced = await self.bot.sync_commands(force=force)
+            await interaction.followup.send("Synced application commands." if synced else "Command tree unchanged, sync skipped.", ephemeral=True)
+        except Exception as e:
+            await interaction.followup.send(f"Sync failed: {e}", ephemeral=True)
+
 async def setup(bot : client):
     await bot.add_cog(CogManager(bot))
\ No newline at end of file
@@ -2,49 +2,175 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 import bot
+import asyncio
+import os
 import random
+import tempfile
 
+from typing import Literal
+
+from db.backup import online_backup
+from db.export import export_guild
+from db.sqldb import ScorekeeperDB, sqldb, utcnow
+
+FAKE_DATA_BATCH = 200000
+
+def generate_fake_data(db: ScorekeeperDB, guild_id: int, gang_count: int, duel_count: int, seed: int, batch_size: int = FAKE_DATA_BATCH) -> tuple[int, int]:
+    """
+    Create `Gang_1`..`Gang_<gang_count>` in a guild (skipping existing ones) and `duel_count` random duels between them.
+    
+    The same seed on an empty database always produces the same dataset. Duels are
+    inserted in transactions of `batch_size` rows, so memory stays bounded for large counts.
+    
+    Returns:
+        tuple: The number of gangs created and duels inserted.
+    """
+    rng = random.Random(seed)
+    names = [f"Gang_{i}" for i in range(1, gang_count + 1)]
+    created = db.gang.insert_many(guild_id, [name for name in names if not db.gang.registry.has_name(guild_id, name)])
+    gang_ids = [gang.id for gang in db.gang.get_many_by_name(guild_id, names).values()]
+    gang_ids.sort()
+    count = len(gang_ids)
+    draw = rng.random
+    for start in range(0, duel_count, batch_size):
+        results = []
+        for _ in range(min(batch_size, duel_count - start)):
+            # Two distinct gangs and two scores in 0..10, without random.sample's per-call overhead.
+            attacker = int(draw() * count)
+            defender = int(draw() * (count - 1))
+            if defender >= attacker:
+                defender += 1
+            results.append((gang_ids[attacker], int(draw() * 11), gang_ids[defender], int(draw() * 11)))
+        db.duel.insert_many(guild_id, results)
+    return len(created), duel_count
+
+@app_commands.guild_only()
 class DatabaseTools(commands.GroupCog, name="database"):
     def __init__(self, bot: bot.client):
         self.bot = bot
         super().__init__()
 
-    @app_commands.command(name="flush", description="Flush (delete) all data from the database.")
-    async def flush_database(self, interaction: discord.Interaction):
+    @app_commands.command(name="flush", description="Flush (delete) this server's gangs, wars and seasons.")
+    @app_commands.describe(vacuum="Also VACUUM the database file afterwards")
+    async def flush_database(self, interaction: discord.Interaction, vacuum: bool = False):
+        await interaction.response.defer(ephemeral=True, thinking=True)
         try:
-            # Delete all duels first (due to FK constraints), then all gangs
-            for duel in self.bot.db.duel.get_all():
-                self.bot.db.duel.delete(duel)
-            for gang in self.bot.db.gang.get_all():
-                self.bot.db.gang.delete(gang)
-            await interaction.response.send_message("Database flushed (all gangs and duels deleted).", ephemeral=True)
+            gangs, duels = await self.bot.db.flush(interaction.guild_id, vacuum)
+            await interaction.followup.send(f"Server data flushed ({gangs} gangs and {duels} duels deleted{', vacuumed' if vacuum else ''}).", ephemeral=True)
         except Exception as e:
-            await interaction.response.send_message(f"Error flushing database: {e}", ephemeral=True)
+            await interaction.followup.send(f"Error flushing database: {e}", ephemeral=True)
+
+    @app_commands.command(name="adopt", description="Move gangs and duels recorded before per-server data into this server.")
+    async def adopt_legacy(self, interaction: discord.Interaction):
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        try:
+            gangs, duels = await self.bot.db.adopt_legacy(interaction.guild_id)
+            await interaction.followup.send(f"Moved {gangs} gangs and {duels} duels into this server.", ephemeral=True)
+        except ValueError as e:
+            await interaction.followup.send(str(e), ephemeral=True)
 
     @app_commands.command(name="fake_data", description="Populate the database with fake gangs and duels.")
-    async def fake_data(self, interaction: discord.Interaction):
+    @app_commands.describe(gangs="Number of gangs", duels="Number of duels", seed="Random seed, for reproducible datasets")
+    async def fake_data(self, interaction: discord.Interaction,
+                        gangs: app_commands.Range[int, 2, 100000] = 6,
+                        duels: app_commands.Range[int, 0, 10000000] = 8,
+                        seed: int = 0):
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        try:
+            created, inserted = await self.bot.db.run(generate_fake_data, self.bot.db.sync, interaction.guild_id, gangs, duels, seed)
+            await interaction.followup.send(f"Fake data added: {created} new gangs, {inserted} duels (seed {seed}).", ephemeral=True)
+        except Exception as e:
+            await interaction.followup.send(f"Error adding fake data: {e}", ephemeral=True)
+
+    @app_commands.command(name="export", description="Export this server's gangs and duels as gzip-compressed files.")
+    @app_commands.describe(format="CSV with a header row, or one JSON object per line")
+    async def export(self, interaction: discord.Interaction, format: Literal["csv", "jsonl"] = "csv"):
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        with tempfile.TemporaryDirectory() as tmp:
+            result = await export_guild(self.bot.db, interaction.guild_id, tmp, format)  # type: ignore
+            paths = result["files"].values()
+            size = sum(os.path.getsize(path) for path in paths)
+            limit = interaction.guild.filesize_limit if interaction.guild is not None else discord.utils.DEFAULT_FILE_SIZE_LIMIT_BYTES
+            if size > limit:
+                await interaction.followup.send(
+                    f"The export is {size / 1e6:.1f}MB, over the {limit / 1e6:.0f}MB upload limit. "
+                    f"Run `python -m db.export {interaction.guild_id}` on the host instead.",
+                    ephemeral=True,
+                )
+                return
+            files = [discord.File(path, filename=os.path.basename(path)) for path in paths]
+            await interaction.followup.send(
+                f"Exported {result['gangs']} gangs and {result['duels']} duels in {result['seconds']:.1f}s.",
+                files=files,
+                ephemeral=True,
+            )
+
+    @app_commands.command(name="backup", description="Write an online backup of the whole database on the host.")
+    @app_commands.describe(pages="Pages copied per step; smaller steps interleave more finely with writes")
+    async def backup(self, interaction: discord.Interaction, pages: app_commands.Range[int, 1, 100000] = 256):
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        directory = self.bot.config.storage.backup_dir
+        os.makedirs(directory, exist_ok=True)
+        target = os.path.join(directory, f"scorekeeper-{utcnow():%Y%m%d-%H%M%S}.sqldb")
         try:
-            # Add fake gangs
-            gang_names = [f"Gang_{i}" for i in range(1, 7)]
-            gangs = []
-            for name in gang_names:
-                try:
-                    gang = self.bot.db.gang.create(name)
-                except ValueError:
-                    gang = self.bot.db.gang.get_by_name(name)
-                gangs.append(gang)
-            # Add fake duels
-            for _ in range(8):
-                g1, g2 = random.sample(gangs, 2)
-                score1 = random.randint(0, 10)
-                score2 = random.randint(0, 10)
-                try:
-                    self.bot.db.duel.create(g1, score1, g2, score2)
-                except Exception:
-                    continue
-            await interaction.response.send_message("Fake data added: 6 gangs, 8 duels.", ephemeral=True)
+            result = await asyncio.to_thread(online_backup, sqldb.database, target, pages)
         except Exception as e:
-            await interaction.response.send_message(f"Error adding fake data: {e}", ephemeral=True)
+            await interaction.followup.send(f"Backup failed: {e}", ephemeral=True)
+            return
+        await interaction.followup.send(
+            f"Backed up {result['bytes'] / 1e6:.1f}MB to `{result['target']}` in {result['seconds']:.1f}s "
+            f"({result['steps']} steps, {result['restarts']} restarts).",
+            ephemeral=True,
+        )
+
+    @app_commands.command(name="rebuild_standings", description="Recompute this server's gang standings from the duel table.")
+    async def rebuild_standings(self, interaction: discord.Interaction):
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        try:
+            rows = await self.bot.db.standing.rebuild(interaction.guild_id)
+            await interaction.followup.send(f"Rebuilt standings for {rows} gangs.", ephemeral=True)
+        except Exception as e:
+            await interaction.followup.send(f"Error rebuilding standings: {e}", ephemeral=True)
+
+    @app_commands.command(name="rebuild_rivalries", description="Recompute this server's head-to-head table from the duel table.")
+    async def rebuild_rivalries(self, interaction: discord.Interaction):
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        try:
+            rows = await self.bot.db.rivalry.rebuild(interaction.guild_id)
+            await interaction.followup.send(f"Rebuilt rivalries for {rows} gang pairs.", ephemeral=True)
+        except Exception as e:
+            await interaction.followup.send(f"Error rebuilding rivalries: {e}", ephemeral=True)
+
+    @app_commands.command(name="check_standings", description="Compare this server's stored gang standings against a full recompute.")
+    async def check_standings(self, interaction: discord.Interaction):
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        mismatches = await self.bot.db.standing.check(interaction.guild_id)
+        if not mismatches:
+            await interaction.followup.send("Standings are consistent.", ephemeral=True)
+            return
+        lines = [f"Gang {gang_id}: stored {have}, expected {want}" for gang_id, have, want in mismatches[:20]]
+        await interaction.followup.send(f"{len(mismatches)} inconsistent standings (wins, losses, draws, for, against):\n" + "\n".join(lines), ephemeral=True)
+
+    @app_commands.command(name="cache", description="Show gang registry cache size and hit/miss counters.")
+    async def cache_stats(self, interaction: discord.Interaction):
+        stats = self.bot.db.sync.gang.registry.stats()
+        await interaction.response.send_message(
+            f"Gang registry: {'loaded' if stats['loaded'] else 'not loaded'}, {stats['gangs']} gangs in {stats['guilds']} servers\n"
+            f"Hits: {stats['hits']}, misses: {stats['misses']} (hit rate {stats['hit_rate']:.1%})",
+            ephemeral=True,
+        )
+
+    @app_commands.command(name="executor", description="Show database executor queue depth and wait times.")
+    async def executor_stats(self, interaction: discord.Interaction):
+        stats = self.bot.db.stats()
+        lines = [
+            f"Workers: {stats['workers']}",
+            f"Queue depth: {stats['queue_depth']}/{stats['max_queue']} (peak {stats['peak_queue_depth']})",
+            f"Jobs: {stats['completed']} completed, {stats['failed']} failed, {stats['submitted']} submitted",
+            f"Wait: p50 {stats['wait_ms_p50']:.2f}ms, p99 {stats['wait_ms_p99']:.2f}ms, max {stats['wait_ms_max']:.2f}ms",
+            f"Run: p50 {stats['run_ms_p50']:.2f}ms, p99 {stats['run_ms_p99']:.2f}ms",
+        ]
+        await interaction.response.send_message("\n".join(lines), ephemeral=True)
 
 async def setup(bot: bot.client):
     await bot.add_cog(DatabaseTools(bot))
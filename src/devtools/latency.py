@@ -11,7 +11,7 @@ class LatencyCog(commands.Cog):
     async def latency(self, interaction: discord.Interaction):
         latency = round(self.bot.latency * 1000)  # Convert to milliseconds
         await interaction.response.send_message(f"Latency: {latency}ms")
-        self.bot.logger.info(f"Latency: {latency}ms")
+        self.bot.logger.info("Latency: %sms", latency)
 
 async def setup(bot : client):
     await bot.add_cog(LatencyCog(bot))
\ No newline at end of file
@@ -0,0 +1,59 @@
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+import io
+
+import metrics
+from bot import client
+
+class MetricsCog(commands.Cog):
+    def __init__(self, bot: client):
+        self.bot = bot
+
+    @app_commands.command(name="metrics", description="Show command and database query latencies.")
+    @app_commands.describe(top="How many commands to list", raw="Attach the full Prometheus text output")
+    async def show_metrics(self, interaction: discord.Interaction, top: app_commands.Range[int, 1, 25] = 10, raw: bool = False):
+        if not metrics.registry.enabled:
+            await interaction.response.send_message("Metrics are disabled (`metrics.enabled` in config).", ephemeral=True)
+            return
+        lines = ["**Commands**"]
+        for row in metrics.registry.summary(metrics.COMMAND_SECONDS)[:top]:
+            lines.append(
+                f"`/{row['labels']['command']}` ({row['labels']['status']}) - {row['count']}x, "
+                f"avg {row['avg_ms']:.1f}ms, p50 {row['p50_ms']:.1f}ms, p99 {row['p99_ms']:.1f}ms"
+            )
+        if len(lines) == 1:
+            lines.append("No commands recorded yet.")
+        lines.append("**Queries**")
+        for row in metrics.registry.summary(metrics.QUERY_SECONDS):
+            lines.append(
+                f"`{row['labels']['statement']}` - {row['count']}x, total {row['total_s']:.2f}s, "
+                f"avg {row['avg_ms']:.2f}ms, p99 {row['p99_ms']:.2f}ms"
+            )
+        if lines[-1] == "**Queries**":
+            lines.append("No queries recorded yet.")
+        if self.bot.war_feed is not None:
+            feed = self.bot.war_feed.stats()
+            lines.append(
+                f"**War feed** - {feed['events']} events, {feed['published']} embeds, {feed['queued']} queued, "
+                f"{feed['dropped']} dropped, {feed['rate_limited']} rate limited, window {feed['window_s']:.1f}s"
+            )
+        if self.bot.scoreboard is not None:
+            board = self.bot.scoreboard.stats()
+            lines.append(
+                f"**Scoreboard** - {board['channels']} channels in {board['guilds']} servers, {board['renders']} renders, "
+                f"{board['edits']} edits, {board['skipped']} unchanged renders skipped"
+            )
+        scores = self.bot.live_scores.stats()
+        lines.append(
+            f"**Live scores** - {scores['increments']} increments, {scores['pending']} wars pending, "
+            f"{scores['flushes']} flushes writing {scores['flushed_duels']} wars, {scores['replayed']} replayed at startup"
+        )
+        files = []
+        if raw:
+            files.append(discord.File(io.BytesIO(metrics.registry.render_prometheus().encode()), filename="metrics.txt"))
+        await interaction.response.send_message("\n".join(lines), files=files, ephemeral=True)
+
+async def setup(bot: client):
+    await bot.add_cog(MetricsCog(bot))
@@ -0,0 +1,20 @@
+import discord
+
+async def channel_guild_id(bot: discord.Client, channel_id: int) -> int | None:
+    """
+    Resolve the guild a channel belongs to.
+
+    Uses the cache when the channel is in it and asks Discord otherwise, so it should
+    run after `wait_until_ready`.
+
+    Returns:
+        int | None: The guild ID, or None if the channel is unknown, inaccessible or not in a guild.
+    """
+    channel = bot.get_channel(channel_id)
+    if channel is None:
+        try:
+            channel = await bot.fetch_channel(channel_id)
+        except discord.HTTPException:
+            return None
+    guild = getattr(channel, "guild", None)
+    return guild.id if guild is not None else None
@@ -0,0 +1,161 @@
+import discord
+
+import asyncio
+import hashlib
+import json
+import logging
+
+from live.channels import channel_guild_id
+
+def format_standing(rank: int, standing) -> str:
+    """Render one leaderboard row: record, points and, when present, Elo."""
+    line = f"**{rank}. {standing.gang.name}** - {standing.wins}W {standing.losses}L {standing.draws}D ({standing.points_for}:{standing.points_against})"
+    rating = getattr(standing, "rating", None)
+    return line if rating is None else f"{line} | Elo {rating:.0f}"
+
+class Scoreboard:
+    """
+    Keeps one persistent leaderboard message per configured channel up to date.
+
+    Each channel shows the standings of the guild it belongs to, resolved once the bot is
+    ready. Every `interval` seconds the scoreboard compares `DuelOps.version` with the
+    version it last rendered; an idle bot costs one integer comparison per tick. When the
+    version moved it re-reads each guild's standings and renders its embed, and it only
+    edits that guild's messages if the embed's content hash differs from the last one
+    sent, e.g. a war in another guild, or a draw between two gangs outside the top N,
+    changes nothing visible. However many wars land, each message is edited at most once
+    per `interval`.
+
+    Message IDs are stored with `ScoreboardOps`, so restarts edit the same messages. A
+    channel without a stored (or with a deleted) message gets a new one, pinned if the
+    bot has permission.
+
+    Attributes:
+        renders (int): Times the standings were read and rendered.
+        edits (int): Messages edited or posted.
+        skipped (int): Renders whose content matched the last published embed.
+    """
+    def __init__(self, bot: discord.Client, channel_ids: list[int], interval: float = 10.0, size: int = 10):
+        self.bot = bot
+        self.channel_ids = list(channel_ids)
+        self.interval = interval
+        self.size = size
+        self.logger = logging.getLogger()
+        self.renders = 0
+        self.edits = 0
+        self.skipped = 0
+        self._version: int | None = None
+        self._guilds: dict[int, int] = {}
+        self._hashes: dict[int, str] = {}
+        self._embeds: dict[int, discord.Embed] = {}
+        self._messages: dict[int, int] = {}
+        self._task: asyncio.Task | None = None
+
+    def start(self):
+        """Start the update task. Must run on the event loop."""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run(), name="scoreboard")
+
+    async def stop(self):
+        """Stop the update task."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        self._messages = await self.bot.db.scoreboard.get_all()  # type: ignore
+        await self.bot.wait_until_ready()
+        for channel_id in self.channel_ids:
+            guild_id = await channel_guild_id(self.bot, channel_id)
+            if guild_id is None:
+                self.logger.warning("Scoreboard channel %s is not a server channel the bot can see; skipping it.", channel_id)
+            else:
+                self._guilds[channel_id] = guild_id
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                self.logger.warning("Scoreboard refresh failed: %s", e)
+            await asyncio.sleep(self.interval)
+
+    async def render(self, guild_id: int) -> discord.Embed:
+        """Read a guild's current standings and build its scoreboard embed."""
+        standings = await self.bot.db.standing.top(guild_id, self.size)  # type: ignore
+        self.renders += 1
+        lines = [format_standing(rank, standing) for rank, standing in enumerate(standings, start=1)]
+        return discord.Embed(title="Live Scoreboard", description="\n".join(lines) or "No gangs yet.")
+
+    @staticmethod
+    def content_hash(embed: discord.Embed) -> str:
+        """Hash an embed's content, so identical renders can be skipped."""
+        return hashlib.sha256(json.dumps(embed.to_dict(), sort_keys=True).encode()).hexdigest()
+
+    async def refresh(self, force: bool = False) -> bool:
+        """
+        Re-render and publish the scoreboard if the standings changed.
+
+        Args:
+            force (bool): Render and edit even if nothing looks changed.
+        Returns:
+            bool: Whether any message was edited or posted.
+        """
+        version = self.bot.db.sync.duel.version  # type: ignore
+        targets = [channel_id for channel_id in self._guilds if channel_id not in self._messages]
+        if force or version != self._version:
+            for guild_id in set(self._guilds.values()):
+                embed = await self.render(guild_id)
+                digest = self.content_hash(embed)
+                if force or digest != self._hashes.get(guild_id):
+                    self._embeds[guild_id], self._hashes[guild_id] = embed, digest
+                    targets += [channel_id for channel_id, guild in self._guilds.items() if guild == guild_id and channel_id not in targets]
+                else:
+                    self.skipped += 1
+            self._version = version
+        try:
+            for channel_id in targets:
+                await self._publish(channel_id, self._embeds[self._guilds[channel_id]])
+        except Exception:
+            # Re-render and re-send everything on the next tick.
+            self._version = None
+            self._hashes.clear()
+            raise
+        return bool(targets)
+
+    async def _publish(self, channel_id: int, embed: discord.Embed):
+        channel = self.bot.get_partial_messageable(channel_id)
+        message_id = self._messages.get(channel_id)
+        if message_id is not None:
+            try:
+                await channel.get_partial_message(message_id).edit(embed=embed)
+                self.edits += 1
+                return
+            except discord.NotFound:
+                pass  # Deleted by someone; post a new one.
+        message = await channel.send(embed=embed)
+        self.edits += 1
+        self._messages[channel_id] = message.id
+        await self.bot.db.scoreboard.set(channel_id, message.id)  # type: ignore
+        try:
+            await message.pin(reason="Live scoreboard")
+        except discord.HTTPException as e:
+            self.logger.warning("Could not pin the scoreboard in %s: %s", channel_id, e)
+
+    def stats(self) -> dict:
+        """
+        Return the scoreboard's counters.
+
+        Returns:
+            dict: Channels, guilds, renders, edits, skipped renders and the last rendered version.
+        """
+        return {
+            "channels": len(self.channel_ids),
+            "guilds": len(set(self._guilds.values())),
+            "renders": self.renders,
+            "edits": self.edits,
+            "skipped": self.skipped,
+            "version": self._version,
+        }
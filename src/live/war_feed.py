@@ -0,0 +1,217 @@
+import discord
+
+import asyncio
+import logging
+import time
+
+from db.sqldb import DuelEvent
+from live.channels import channel_guild_id
+
+# Embed descriptions hold at most 4096 characters; stay well under it.
+MAX_LINES = 25
+# Keep editing the current message for this long before starting a new one.
+MESSAGE_LIFETIME = 15 * 60
+
+class WarFeed:
+    """
+    Posts duel results to the war update channel, coalesced into as few API calls as possible.
+
+    Only duels of the channel's own guild are posted; the guild is resolved once the bot
+    is ready, and events from other guilds are discarded on arrival.
+
+    `DuelOps` listeners run on database worker threads, so the feed's listener only hands
+    the event to the event loop (`call_soon_threadsafe`) and returns; the command that made
+    the write never waits on Discord. A single publisher task collects events for
+    `window` seconds, merges repeated writes to the same duel, and renders them into
+    one embed. Recent messages are edited in place, so a burst of results costs one edit
+    per window instead of one message per war.
+
+    discord.py waits out rate limits inside the request, so while a publish is held up,
+    new events simply pile into the next batch. Only when a publish still fails with a 429
+    after discord.py's own retries does the feed wait `Retry-After` itself, keep the
+    batch, and double its window (up to `max_window`) until requests succeed again.
+
+    Attributes:
+        window (float): The current debounce window in seconds.
+        published (int): Embeds sent or edited.
+        events (int): Duel events received.
+        dropped (int): Events dropped because the queue was full.
+        rate_limited (int): Publishes that still failed with a 429 after discord.py's retries.
+    """
+    def __init__(self, bot: discord.Client, channel_id: int, window: float = 5.0, max_window: float = 60.0, max_queue: int = 10000):
+        self.bot = bot
+        self.channel_id = channel_id
+        self.base_window = window
+        self.window = window
+        self.max_window = max_window
+        self.logger = logging.getLogger()
+        self.queue: asyncio.Queue[DuelEvent] = asyncio.Queue(maxsize=max_queue)
+        self.published = 0
+        self.events = 0
+        self.dropped = 0
+        self.rate_limited = 0
+        self.guild_id: int | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._task: asyncio.Task | None = None
+        self._message: discord.Message | None = None
+        self._message_started = 0.0
+        self._lines: dict[tuple[str, int], str] = {}
+
+    def start(self):
+        """Subscribe to duel writes and start the publisher task. Must run on the event loop."""
+        if self._task is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self.bot.db.sync.duel.add_listener(self._on_duel_event)  # type: ignore
+        self._task = self._loop.create_task(self._run(), name="war-feed")
+
+    async def stop(self):
+        """Unsubscribe and stop the publisher. Unpublished events are discarded."""
+        self.bot.db.sync.duel.remove_listener(self._on_duel_event)  # type: ignore
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def _on_duel_event(self, event: DuelEvent):
+        # Database worker thread: hand off and return immediately.
+        try:
+            self._loop.call_soon_threadsafe(self._enqueue, event)  # type: ignore
+        except RuntimeError:
+            pass  # The loop is closed; the bot is shutting down.
+
+    def _enqueue(self, event: DuelEvent):
+        if self.guild_id is not None and event.guild_id != self.guild_id:
+            return
+        self.events += 1
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.dropped += 1
+
+    async def _collect(self) -> dict[tuple[str, int], DuelEvent]:
+        """Wait for an event, then gather everything that arrives within the window."""
+        batch: dict[tuple[str, int], DuelEvent] = {}
+        self._add(batch, await self.queue.get())
+        deadline = time.monotonic() + self.window
+        while (remaining := deadline - time.monotonic()) > 0:
+            try:
+                self._add(batch, await asyncio.wait_for(self.queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    def _add(self, batch: dict[tuple[str, int], DuelEvent], event: DuelEvent):
+        # Events queued before the guild was resolved may belong to another guild.
+        if event.guild_id != self.guild_id:
+            return
+        # Later writes to the same duel replace earlier ones, so create + update in one
+        # window becomes a single line.
+        key = ("import" if event.kind == "imported" else "duel", event.duel_id)
+        batch.pop(key, None)
+        batch[key] = event
+
+    async def _run(self):
+        await self.bot.wait_until_ready()
+        self.guild_id = await channel_guild_id(self.bot, self.channel_id)
+        if self.guild_id is None:
+            self.logger.warning("War update channel %s is not a server channel the bot can see; war updates are off.", self.channel_id)
+            self.bot.db.sync.duel.remove_listener(self._on_duel_event)  # type: ignore
+            return
+        while True:
+            batch = await self._collect()
+            if not batch:
+                continue
+            while True:
+                try:
+                    await self._publish(batch)
+                    self.window = max(self.base_window, self.window / 2)
+                    break
+                except discord.HTTPException as e:
+                    if e.status != 429:
+                        self.logger.warning("War feed could not publish %s results: %s", len(batch), e)
+                        break
+                    await self._back_off(float(e.response.headers.get("Retry-After", self.window)))
+                # Fold in anything that arrived while we waited before retrying.
+                while not self.queue.empty():
+                    self._add(batch, self.queue.get_nowait())
+
+    async def _back_off(self, retry_after: float):
+        self.rate_limited += 1
+        self.window = min(self.max_window, self.window * 2)
+        self.logger.warning("War feed rate limited; retrying in %.1fs, window now %.1fs.", retry_after, self.window)
+        await asyncio.sleep(retry_after)
+
+    def _gang_name(self, gang_id: int) -> str:
+        gang = self.bot.db.sync.gang.registry.get_by_id(gang_id)  # type: ignore
+        return gang.name if gang is not None else "(deleted gang)"  # type: ignore
+
+    def format_event(self, event: DuelEvent) -> str:
+        """Render one event as an embed line."""
+        if event.kind == "imported":
+            return f"Imported {event.count} wars (from #{event.duel_id})"
+        attacker = self._gang_name(event.attacking_gang_id)
+        defender = self._gang_name(event.defending_gang_id)
+        if event.attacking_score > event.defending_score:
+            attacker = f"**{attacker}**"
+        elif event.attacking_score < event.defending_score:
+            defender = f"**{defender}**"
+        line = f"#{event.duel_id} {attacker} {event.attacking_score} - {event.defending_score} {defender}"
+        if event.kind == "updated":
+            return f"{line} (updated)"
+        if event.kind == "deleted":
+            return f"~~{line}~~ (deleted)"
+        return line
+
+    def _render(self) -> discord.Embed:
+        embed = discord.Embed(title="War updates", description="\n".join(self._lines.values()), color=discord.Color.red())
+        embed.set_footer(text=f"{len(self._lines)} results")
+        embed.timestamp = discord.utils.utcnow()
+        return embed
+
+    async def _publish(self, batch: dict[tuple[str, int], DuelEvent]):
+        fresh = (
+            self._message is not None
+            and time.monotonic() - self._message_started < MESSAGE_LIFETIME
+            and len(self._lines.keys() | batch.keys()) <= MAX_LINES
+        )
+        if not fresh:
+            self._message = None
+            self._lines = {}
+        for key, event in batch.items():
+            self._lines.pop(key, None)
+            self._lines[key] = self.format_event(event)
+        # A batch larger than one message keeps only its newest lines.
+        while len(self._lines) > MAX_LINES:
+            del self._lines[next(iter(self._lines))]
+        embed = self._render()
+        if self._message is not None:
+            try:
+                self._message = await self._message.edit(embed=embed)
+                self.published += 1
+                return
+            except discord.NotFound:
+                self._message = None  # Deleted by someone; post a new one.
+        channel = self.bot.get_partial_messageable(self.channel_id)
+        self._message = await channel.send(embed=embed)
+        self._message_started = time.monotonic()
+        self.published += 1
+
+    def stats(self) -> dict:
+        """
+        Return the feed's counters.
+
+        Returns:
+            dict: Events received, dropped and queued, embeds published, rate limits and the current window.
+        """
+        return {
+            "events": self.events,
+            "dropped": self.dropped,
+            "queued": self.queue.qsize(),
+            "published": self.published,
+            "rate_limited": self.rate_limited,
+            "window_s": self.window,
+        }
@@ -0,0 +1,114 @@
+"""
+Logging setup for the bot.
+
+Every logger writes to one `QueueHandler` on the root logger. The calling thread (usually
+the event loop) only merges the message's %-arguments and enqueues the record; a
+`QueueListener` thread does the rendering (Rich or JSON) and the I/O.
+"""
+import copy
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+
+from datetime import datetime, timezone
+from typing import TextIO
+
+from rich.logging import RichHandler
+
+FORMATS = ("rich", "json")
+# Chatty libraries whose level is set separately from the bot's own.
+LIBRARY_LOGGERS = ("discord", "peewee")
+
+# Attributes every LogRecord has; anything else on a record came from `extra=`.
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formats each record as one JSON object per line, for log shipping.
+
+    Keys are `time` (UTC, ISO 8601), `level`, `logger` and `message`, then any fields
+    passed with `extra=`, and `exception`/`stack` when present.
+    """
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        if record.stack_info:
+            entry["stack"] = self.formatStack(record.stack_info)
+        return json.dumps(entry, default=str)
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that leaves formatting to the listener.
+
+    The stock `prepare` runs the full formatter on the calling thread and drops
+    `exc_info`. This one only merges the %-arguments, so later changes to mutable
+    arguments cannot alter the message. It keeps `exc_info` so the listener can still
+    render tracebacks.
+    """
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg, record.args = record.message, None
+        return record
+
+def build_handler(fmt: str, stream: TextIO | None = None) -> logging.Handler:
+    """
+    Build the handler that renders and writes records.
+
+    Args:
+        fmt (str): "rich" for the colored console output, "json" for JSON lines.
+        stream (TextIO | None): Where JSON lines go. Defaults to stdout.
+    Raises:
+        ValueError: If `fmt` is not one of `FORMATS`.
+    """
+    if fmt == "rich":
+        return RichHandler(rich_tracebacks=True)
+    if fmt == "json":
+        handler = logging.StreamHandler(stream if stream is not None else sys.stdout)
+        handler.setFormatter(JsonFormatter())
+        return handler
+    raise ValueError(f"Unknown log format '{fmt}', expected one of: {', '.join(FORMATS)}.")
+
+def setup_logging(level: str = "DEBUG", fmt: str = "rich", library_level: str = "INFO", handler: logging.Handler | None = None) -> logging.handlers.QueueListener:
+    """
+    Route all logging through a queue to a background listener thread.
+
+    Replaces any handlers on the root logger and the library loggers, which propagate
+    to the root instead.
+
+    Args:
+        level (str): The bot's log level.
+        fmt (str): The output format, see `build_handler`.
+        library_level (str): The level for `LIBRARY_LOGGERS` (peewee logs every query at DEBUG).
+        handler (logging.Handler | None): Use this handler instead of building one for `fmt`.
+    Returns:
+        QueueListener: The started listener. Stop it on exit to flush the queue.
+    """
+    records: queue.SimpleQueue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(records, handler if handler is not None else build_handler(fmt), respect_handler_level=True)
+    root = logging.getLogger()
+    for existing in root.handlers[:]:
+        root.removeHandler(existing)
+    root.addHandler(DeferredQueueHandler(records))
+    root.setLevel(level)
+    for name in list(logging.root.manager.loggerDict):
+        if name.startswith(LIBRARY_LOGGERS):
+            logger = logging.getLogger(name)
+            logger.handlers = []
+            logger.propagate = True
+            logger.setLevel(logging.NOTSET)
+    for name in LIBRARY_LOGGERS:
+        logging.getLogger(name).setLevel(library_level)
+    listener.start()
+    return listener
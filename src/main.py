@@ -1,37 +1,82 @@
+import time
+_process_start = time.perf_counter()
+
+import argparse
+import asyncio
+
 import bot
+import logs
 
 import logging
-from rich.logging import RichHandler
 
 from dotenv import load_dotenv
 from os import getenv
 
+_imports_done = time.perf_counter()
+
+async def profile_startup(client: bot.client, token: str | None) -> dict[str, float]:
+    """
+    Run the client's one-time setup without connecting to the gateway, then shut down.
+
+    With a token, `login()` runs `setup_hook` exactly as a real start would, including the
+    command sync. Without one, `setup_hook` is called directly and the sync is skipped.
+
+    Returns:
+        dict: The client's `startup_timings`.
+    """
+    try:
+        if token:
+            await client.login(token)
+        else:
+            await client.setup_hook()
+    finally:
+        await client.close()
+    return client.startup_timings
+
+def print_startup_report(timings: dict[str, float]):
+    total = sum(timings.values())
+    print(f"{'step':<12} {'seconds':>9} {'share':>7}")
+    for step, seconds in timings.items():
+        print(f"{step:<12} {seconds:>9.3f} {seconds / total if total else 0.0:>7.1%}")
+    print(f"{'total':<12} {total:>9.3f}")
+
 if __name__ == "__main__":
-    # Set up Rich logging as the only handler
-    root_logger = logging.getLogger()
-    for handler in root_logger.handlers[:]:
-        root_logger.removeHandler(handler)
-    rich_handler = RichHandler(rich_tracebacks=True)
-    root_logger.addHandler(rich_handler)
-    root_logger.setLevel(logging.DEBUG)
-    root_logger.propagate = False
-
-    # Remove all handlers from discord loggers and set only our handler
-    for name in logging.root.manager.loggerDict:
-        if name.startswith("discord"):
-            logger = logging.getLogger(name)
-            logger.handlers = [rich_handler]
-            logger.setLevel(logging.INFO)
-            logger.propagate = False
+    parser = argparse.ArgumentParser(description="Run the scorekeeper bot.")
+    parser.add_argument("--profile-startup", action="store_true", help="Time each cold start step, print a report and exit")
+    args = parser.parse_args()
+
+    timings = {"imports": _imports_done - _process_start}
+    step_start = time.perf_counter()
 
     load_dotenv()
 
     config = bot.Config()
-    
+
     config.load_from_file("config.json")
-    
+
+    timings["config"] = time.perf_counter() - step_start
+    step_start = time.perf_counter()
+
+    # All loggers write through a queue; rendering and I/O happen on the listener thread.
+    log_listener = logs.setup_logging(config.log.level, config.log.format, config.log.library_level)
+    root_logger = logging.getLogger()
+
+    timings["logging"] = time.perf_counter() - step_start
+
     client = bot.client(config=config)
     _secret_token = getenv("DISCORD_TOKEN")
-    if not _secret_token:
-        raise ValueError("DISCORD_TOKEN environment variable not set.")
-    client.run(_secret_token)
\ No newline at end of file
+    try:
+        if args.profile_startup:
+            timings.update(asyncio.run(profile_startup(client, _secret_token)))
+            if "sync" not in timings:
+                root_logger.warning("DISCORD_TOKEN not set; command sync was not profiled.")
+        else:
+            if not _secret_token:
+                raise ValueError("DISCORD_TOKEN environment variable not set.")
+            # log_handler=None keeps discord.py from adding its own handler next to the queue.
+            client.run(_secret_token, log_handler=None)
+    finally:
+        # Write out everything still queued before exiting.
+        log_listener.stop()
+    if args.profile_startup:
+        print_startup_report(timings)
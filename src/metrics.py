@@ -0,0 +1,201 @@
+import bisect
+import threading
+
+from typing import Iterable
+
+# Upper bounds in seconds, from tens-of-microseconds SQLite reads to slow Discord round trips.
+DEFAULT_BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+class Histogram:
+    """
+    Fixed-bucket latency histogram, in the style of a Prometheus histogram.
+
+    `observe()` is one bisect and three increments under a lock, so it is cheap enough to
+    call on every command and every query, from any thread.
+    """
+    def __init__(self, buckets: Iterable[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)  # The last slot is +Inf.
+        self.count = 0
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float):
+        """Record one duration."""
+        i = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            self.counts[i] += 1
+            self.count += 1
+            self.sum += seconds
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimate a quantile by linear interpolation inside its bucket.
+
+        Returns:
+            float: The estimate in seconds, or 0.0 if nothing was observed.
+        """
+        with self._lock:
+            counts, count = list(self.counts), self.count
+        if not count:
+            return 0.0
+        rank = q * count
+        seen = 0
+        for i, bucket_count in enumerate(counts):
+            if seen + bucket_count >= rank and bucket_count:
+                low = self.buckets[i - 1] if i > 0 else 0.0
+                high = self.buckets[i] if i < len(self.buckets) else low
+                return low + (high - low) * (rank - seen) / bucket_count
+            seen += bucket_count
+        return self.buckets[-1]
+
+    def snapshot(self) -> dict:
+        """
+        Return the cumulative bucket counts, count and sum.
+
+        Returns:
+            dict: "buckets" (list of (upper bound, cumulative count), ending with +Inf), "count" and "sum".
+        """
+        with self._lock:
+            counts, count, total = list(self.counts), self.count, self.sum
+        cumulative = []
+        running = 0
+        for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+            running += bucket_count
+            cumulative.append((bound, running))
+        return {"buckets": cumulative, "count": count, "sum": total}
+
+class MetricsRegistry:
+    """
+    Named histogram families keyed by a tuple of label values.
+
+    Attributes:
+        enabled (bool): Whether `observe()` records anything.
+        families (dict): Metric name -> (label names, help text, {label values: Histogram}).
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.enabled = True
+        self.families: dict[str, tuple[tuple[str, ...], str, dict[tuple, Histogram]]] = {}
+
+    def histogram(self, name: str, labels: tuple[str, ...], help: str = "") -> dict[tuple, Histogram]:
+        """
+        Declare a histogram family, or return it if it already exists.
+
+        Returns:
+            dict: Label values to Histogram, filled on first observation.
+        """
+        with self._lock:
+            if name not in self.families:
+                self.families[name] = (labels, help, {})
+            return self.families[name][2]
+
+    def observe(self, name: str, values: tuple, seconds: float):
+        """Record a duration for the series `values` of the family `name`."""
+        if not self.enabled:
+            return
+        series = self.families[name][2]
+        histogram = series.get(values)
+        if histogram is None:
+            with self._lock:
+                histogram = series.setdefault(values, Histogram())
+        histogram.observe(seconds)
+
+    def reset(self):
+        """Drop every recorded series, keeping the family declarations."""
+        with self._lock:
+            for _, _, series in self.families.values():
+                series.clear()
+
+    def summary(self, name: str) -> list[dict]:
+        """
+        Summarize every series of a family, busiest first.
+
+        Returns:
+            list: Dicts with "labels", "count", "total_s", "avg_ms", "p50_ms" and "p99_ms".
+        """
+        label_names, _, series = self.families.get(name, ((), "", {}))
+        rows = []
+        for values, histogram in list(series.items()):
+            if not histogram.count:
+                continue
+            rows.append({
+                "labels": dict(zip(label_names, values)),
+                "count": histogram.count,
+                "total_s": histogram.sum,
+                "avg_ms": histogram.sum / histogram.count * 1000,
+                "p50_ms": histogram.quantile(0.50) * 1000,
+                "p99_ms": histogram.quantile(0.99) * 1000,
+            })
+        rows.sort(key=lambda row: row["count"], reverse=True)
+        return rows
+
+    def render_prometheus(self) -> str:
+        """
+        Render every family in the Prometheus text exposition format.
+
+        Returns:
+            str: The exposition text.
+        """
+        lines = []
+        for name, (label_names, help, series) in list(self.families.items()):
+            if help:
+                lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} histogram")
+            for values, histogram in list(series.items()):
+                labels = ",".join(f'{label}="{_escape(value)}"' for label, value in zip(label_names, values))
+                snapshot = histogram.snapshot()
+                for bound, count in snapshot["buckets"]:
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f'{name}_bucket{{{labels}{"," if labels else ""}le="{le}"}} {count}')
+                lines.append(f"{name}_sum{{{labels}}} {snapshot['sum']}")
+                lines.append(f"{name}_count{{{labels}}} {snapshot['count']}")
+        return "\n".join(lines) + "\n"
+
+def _escape(value: object) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+registry = MetricsRegistry()
+COMMAND_SECONDS = "scorekeeper_command_seconds"
+QUERY_SECONDS = "scorekeeper_query_seconds"
+registry.histogram(COMMAND_SECONDS, ("command", "status"), "Application command latency, from interaction check to completion.")
+registry.histogram(QUERY_SECONDS, ("statement",), "SQLite statement execution time, by statement type.")
+
+def statement_type(sql: str) -> str:
+    """The leading SQL keyword of a statement, e.g. "SELECT"."""
+    head = sql.lstrip()[:8].split(None, 1)
+    return head[0].upper() if head else "UNKNOWN"
+
+class MetricsServer:
+    """
+    Optional local HTTP endpoint that serves `registry` at /metrics for Prometheus to scrape.
+
+    Uses aiohttp, which discord.py already depends on. Bind it to localhost unless the
+    scraper runs on another host.
+    """
+    def __init__(self, metrics: MetricsRegistry, host: str = "127.0.0.1", port: int = 9464):
+        self.metrics = metrics
+        self.host = host
+        self.port = port
+        self._runner = None
+
+    async def start(self):
+        """Start serving. Does nothing if already started."""
+        if self._runner is not None:
+            return
+        from aiohttp import web
+        app = web.Application()
+        app.router.add_get("/metrics", self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+
+    async def stop(self):
+        """Stop serving. Does nothing if not started."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _handle(self, request):
+        from aiohttp import web
+        return web.Response(body=self.metrics.render_prometheus().encode(), headers={"Content-Type": "text/plain; version=0.0.4; charset=utf-8"})